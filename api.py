@@ -1,23 +1,78 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+
+# ===== INFERENCE THREADING =====
+# BLAS/OpenMP size their thread pools from the host core count, so every
+# gunicorn worker would spawn one thread per core inside model.predict.
+# Pin each worker to its share of the cores before numpy/sklearn load.
+CPU_COUNT = os.cpu_count() or 1
+WEB_CONCURRENCY = max(1, int(os.environ.get('WEB_CONCURRENCY', '1')))
+INFERENCE_THREADS = max(1, int(os.environ.get('INFERENCE_THREADS', CPU_COUNT // WEB_CONCURRENCY)))
+
+for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(var, str(INFERENCE_THREADS))
+
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import joblib
 import pandas as pd
 import numpy as np
+from threadpoolctl import threadpool_limits
+from house_comparables import ComparablesIndex
+from house_features import house_row
+from job_search import JobSearchIndex
+from market_stats import MarketStats
+from career_projection import simulate_career
+from datasets import read_dataset
+from realistic_salary_predictor import predict_salary_realistic
+from salary_features import SalaryFeatures, parse_skills, payload_frame
+
+# Enforce the limit even if numpy was already imported (e.g. gunicorn --preload)
+threadpool_limits(limits=INFERENCE_THREADS)
+
+# Optional dedicated pool for predict calls: 0 disables it, 'auto' sizes it
+# to this worker's share of the host cores.
+_pool_setting = os.environ.get('INFERENCE_POOL_SIZE', '0')
+INFERENCE_POOL_SIZE = max(1, CPU_COUNT // WEB_CONCURRENCY) if _pool_setting == 'auto' else int(_pool_setting)
+inference_pool = ThreadPoolExecutor(max_workers=INFERENCE_POOL_SIZE, thread_name_prefix='inference') if INFERENCE_POOL_SIZE > 0 else None
+
+def run_inference(predict_fn, features):
+    """Run a predict call, on the inference pool when one is configured"""
+    if inference_pool is None:
+        return predict_fn(features)
+    return inference_pool.submit(predict_fn, features).result()
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+JOBS_DATASET = 'morocco_jobs_dataset.csv'
+SALARY_MODEL_PATH = 'SalaryModel.pkl'
+
 # Load the models
 salary_model = None
 car_model = None
 house_model = None
 
+print(f"🧵 Inference threads per worker: {INFERENCE_THREADS} (workers: {WEB_CONCURRENCY}, cores: {CPU_COUNT}, pool: {INFERENCE_POOL_SIZE or 'off'})")
+
 try:
-    salary_model = joblib.load('SalaryModel.pkl')
+    salary_model = joblib.load(SALARY_MODEL_PATH)
     print("✓ Salary model and encoder loaded successfully!")
 except Exception as e:
     print(f"❌ Error loading salary model: {e}")
 
+salary_features = None
+
+try:
+    salary_features = SalaryFeatures.for_model(SALARY_MODEL_PATH)
+    fitted = f"fitted on {salary_features.state['rows']:,} rows" if salary_features.categories else 'deployed layout'
+    print(f"✓ Salary feature state loaded ({fitted})")
+except Exception as e:
+    print(f"❌ Error loading salary feature state: {e}")
+
 try:
     car_model = joblib.load('good_deal_model.pkl')
     print("✓ Car model loaded successfully!")
@@ -30,6 +85,144 @@ try:
 except Exception as e:
     print(f"⚠️ Error loading house model: {e}")
 
+comparables_index = None
+
+try:
+    comparables_index = ComparablesIndex.from_csv('morocco_houses_dataset.csv')
+    print(f"✓ Comparables index built ({len(comparables_index.partitions)} city/transaction partitions)")
+except Exception as e:
+    print(f"⚠️ Error building comparables index: {e}")
+
+job_search_index = None
+
+try:
+    job_search_index = JobSearchIndex.load_or_build('job_search_index.pkl', JOBS_DATASET)
+    print(f"✓ Job search index loaded ({job_search_index.postings.shape[0]:,} postings)")
+except Exception as e:
+    print(f"⚠️ Error loading job search index: {e}")
+
+market_stats = None
+
+try:
+    market_stats = MarketStats.load_or_build('market_stats.npz', JOBS_DATASET, 'morocco_houses_dataset.csv')
+    print("✓ Market statistics loaded")
+except Exception as e:
+    print(f"⚠️ Error loading market statistics: {e}")
+
+# ===== FEATURE BUILDERS =====
+# Shared by the single-prediction and sweep endpoints so both feed the
+# models exactly the same columns. Salary features come from
+# salary_features.py, the module train.py trains with.
+
+def build_salary_frame(payloads):
+    """Salary model features for a batch of request payloads"""
+    return salary_features.transform(payload_frame(payloads))
+
+def build_car_row(data):
+    """Build the car model features from a request payload"""
+    return {
+        'model': data['model'],
+        'year': int(data['year']),
+        'km_driven': int(data['km_driven']),
+        'fuel': data['fuel'],
+        'condition': data['condition'],
+        'first_owner': int(data['first_owner']),
+        'fiscal_power': int(data['fiscal_power']),
+        'price': float(data['price'])
+    }
+
+def is_good_deal_label(raw_prediction):
+    """Convert a raw car model output to a boolean"""
+    if isinstance(raw_prediction, str):
+        return raw_prediction.lower() in ['yes', 'good', 'true', '1']
+    return bool(raw_prediction)
+
+# ===== WHAT-IF SWEEPS =====
+# Fields each predictor can sweep over a numeric range. Any field can still be
+# swept with an explicit "values" list.
+SWEEP_RANGE_FIELDS = {
+    'salary': ['years_of_experience'],
+    'car': ['price', 'year', 'km_driven', 'fiscal_power'],
+    'house': ['surface', 'rooms', 'bathrooms', 'floor', 'age']
+}
+# Fields the feature builders read with int(); fractional values would collapse into duplicate points
+INTEGER_SWEEP_FIELDS = {
+    'salary': {'years_of_experience'},
+    'car': {'year', 'km_driven', 'first_owner', 'fiscal_power'},
+    'house': {'rooms', 'bathrooms', 'floor', 'age'}
+}
+MAX_SWEEP_POINTS = 500
+
+def sweep_values(data, predictor):
+    """Resolve the list of values to sweep from a sweep request"""
+    field = data['field']
+    if 'values' in data:
+        if not isinstance(data['values'], list):
+            raise ValueError("values must be a list")
+        values = data['values']
+        if len(values) > MAX_SWEEP_POINTS:
+            raise ValueError(f"Sweep has {len(values)} points, maximum is {MAX_SWEEP_POINTS}")
+    else:
+        if field not in SWEEP_RANGE_FIELDS[predictor]:
+            raise ValueError(f"Cannot sweep '{field}' over a range. Use one of: {', '.join(SWEEP_RANGE_FIELDS[predictor])}")
+        start = float(data['start'])
+        stop = float(data['stop'])
+        step = float(data.get('step', 1))
+        if not all(math.isfinite(v) for v in (start, stop, step)):
+            raise ValueError("start, stop and step must be finite numbers")
+        if step <= 0:
+            raise ValueError("step must be positive")
+        # Count the points before building them: start, start + step, ... up to stop (half a step of slack)
+        points = (stop - start) / step + 0.5
+        if points > MAX_SWEEP_POINTS:
+            count = f'{math.ceil(points):,}' if math.isfinite(points) else 'too many'
+            raise ValueError(f"Sweep has {count} points, maximum is {MAX_SWEEP_POINTS}")
+        values = (start + step * np.arange(max(math.ceil(points), 0))).tolist()
+    
+    if not values:
+        raise ValueError("Sweep produced no values")
+    if field in INTEGER_SWEEP_FIELDS[predictor]:
+        if any(float(v) != int(float(v)) for v in values):
+            raise ValueError(f"'{field}' takes whole numbers; use integer start, stop and step")
+        values = [int(float(v)) for v in values]
+    return field, values
+
+def sweep_payloads(data, predictor):
+    """Copy the base payload once per swept value"""
+    field, values = sweep_values(data, predictor)
+    base = data['base']
+    return field, values, [{**base, field: value} for value in values]
+
+# ===== SKILL-GAP RECOMMENDER =====
+PAIR_POOL_SIZE = 12  # Only the top candidates by market prior are combined into pairs
+MAX_CANDIDATES = 200  # Client-supplied candidates; each one is a row of the predict batch
+
+@lru_cache(maxsize=1)
+def load_skill_vocabulary():
+    """Skills seen in the jobs dataset, ranked by mean posted salary (loaded once)"""
+    df = read_dataset(JOBS_DATASET, ['skills_required', 'salary'])
+    salary = pd.to_numeric(df['salary'].str.extract(r'(\d+)', expand=False))
+    skills = df['skills_required'].fillna('').str.split(', ')
+    exploded = pd.DataFrame({'skill': skills, 'salary': salary}).explode('skill')
+    exploded = exploded[exploded['skill'] != '']
+    ranked = exploded.groupby('skill')['salary'].mean().sort_values(ascending=False)
+    return tuple(ranked.index)
+
+def skill_variants(current_skills, candidates):
+    """Baseline, every single added skill, and pairs from the pruned pool"""
+    seen = {s.lower() for s in current_skills}
+    unique = []
+    for c in candidates:
+        # 'Docker' and 'docker' are one skill: keep the first spelling only
+        if c.lower() not in seen:
+            seen.add(c.lower())
+            unique.append(c)
+    candidates = unique
+    variants = [()]
+    variants += [(c,) for c in candidates]
+    variants += list(combinations(candidates[:PAIR_POOL_SIZE], 2))
+    return variants
+
 @app.route('/')
 def home():
     return jsonify({
@@ -37,7 +230,18 @@ def home():
         'endpoints': [
             '/predict-salary',
             '/predict-car',
-            '/predict-house'
+            '/predict-house',
+            '/predict-salary/sweep',
+            '/predict-salary-realistic',
+            '/predict-car/sweep',
+            '/predict-house/sweep',
+            '/recommend-skills',
+            '/comparable-houses',
+            '/similar-jobs',
+            '/market/salary',
+            '/market/salary-rank',
+            '/market/housing',
+            '/project-journey'
         ]
     })
 
@@ -47,88 +251,19 @@ def predict_salary():
         data = request.json
         print(f"📥 Received salary data: {data}")
         
-        # Parse skills
-        skills_text = data.get('skills', '')
-        if ',' in skills_text:
-            skills_list = [s.strip() for s in skills_text.split(',') if s.strip()]
-        else:
-            skills_list = [s.strip() for s in skills_text.split() if s.strip()]
-        
-        skills_count = len(skills_list)
-        tech_skills = ['python', 'java', 'javascript', 'react', 'angular', 'node', 'sql', 'mongodb', 'aws', 'docker', 'kubernetes']
-        tech_skills_count = sum(1 for skill in skills_list if skill.lower() in tech_skills)
-        
-        # Parse experience
-        experience_years = int(data['years_of_experience'])
-        if experience_years < 1:
-            experience_level = 'entry'
-        elif experience_years < 2:
-            experience_level = 'junior'
-        elif experience_years < 5:
-            experience_level = 'mid'
-        elif experience_years < 10:
-            experience_level = 'senior'
-        else:
-            experience_level = 'expert'
-        
-        # Parse education - match model's expected format
-        education_map = {
-            "Bachelor's": ("bachelor's degree", 1),
-            "Master's": ("master's degree", 2),
-            "PhD": ("phd", 3),
-            "High School": ("diploma", 0)
-        }
-        education_info = education_map.get(data['education_level'], ("bachelor's degree", 1))
-        education_required = education_info[0]
-        education_level_numeric = education_info[1]
-        
-        # City tier (simple classification) - return as string
-        location_lower = data['location'].lower()
-        major_cities_tier1 = ['casablanca', 'rabat', 'marrakech']
-        major_cities_tier2 = ['fes', 'tangier', 'agadir', 'meknes', 'oujda']
-        
-        if location_lower in major_cities_tier1:
-            city_tier = 'tier1'
-        elif location_lower in major_cities_tier2:
-            city_tier = 'tier2'
-        else:
-            city_tier = 'tier3'
-        
         # Create DataFrame with ALL required features
-        input_data = pd.DataFrame([{
-            'job_title': data['job_title'],
-            'skills_required': skills_text,
-            'experience_years': experience_years,
-            'experience_level': experience_level,
-            'education_required': education_required,
-            'location': location_lower,
-            'job_type': 'full-time',
-            'skills_count': skills_count,
-            'tech_skills_count': tech_skills_count,
-            'experience_squared': experience_years ** 2,
-            'edu_exp_interaction': education_level_numeric * experience_years,
-            'city_tier': city_tier,
-            'job_type_numeric': 1,
-            'education_level_numeric': education_level_numeric
-        }])
-        
-        # Explicit type conversion using astype
-        categorical_cols = ['job_title', 'skills_required', 'experience_level', 'education_required', 'location', 'job_type', 'city_tier']
-        numeric_cols = ['experience_years', 'skills_count', 'tech_skills_count', 'experience_squared', 'edu_exp_interaction', 'job_type_numeric', 'education_level_numeric']
-        
-        for col in categorical_cols:
-            input_data[col] = input_data[col].astype(str)
-        
-        for col in numeric_cols:
-            input_data[col] = input_data[col].astype('int64')
+        input_data = build_salary_frame([data])
         
         print(f"📊 Salary input shape: {input_data.shape}")
         print(f"📋 Salary input columns: {input_data.columns.tolist()}")
         print(f"🔍 Data types:\n{input_data.dtypes}")
         print(f"🔍 Sample values:\n{input_data.iloc[0].to_dict()}")
+        unseen = salary_features.unseen(input_data)
+        if unseen:
+            print(f"⚠️ Values not seen in training: {unseen}")
         
         # Make prediction
-        prediction = salary_model.predict(input_data)[0]
+        prediction = run_inference(salary_model.predict, input_data)[0]
         print(f"💰 Salary prediction: {prediction}")
         
         return jsonify({
@@ -145,6 +280,127 @@ def predict_salary():
             'status': 'error'
         }), 400
 
+@app.route('/predict-salary/sweep', methods=['POST'])
+def sweep_salary():
+    try:
+        data = request.json
+        print(f"📥 Received salary sweep: {data}")
+        
+        field, values, payloads = sweep_payloads(data, 'salary')
+        
+        # One feature matrix, one predict call for the whole curve
+        input_data = build_salary_frame(payloads)
+        predictions = run_inference(salary_model.predict, input_data)
+        print(f"📈 Salary sweep over {field}: {len(values)} points")
+        
+        return jsonify({
+            'field': field,
+            'points': [{'value': v, 'predicted_salary': float(p)} for v, p in zip(values, predictions)],
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Salary Sweep Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+# Frontend education labels -> rule-based predictor labels
+REALISTIC_EDUCATION_MAP = {
+    "Bachelor's": "Bachelor's Degree",
+    "Master's": "Master's Degree",
+    "PhD": "PhD",
+    "High School": "Diploma"
+}
+
+@app.route('/predict-salary-realistic', methods=['POST'])
+def predict_salary_rules():
+    try:
+        data = request.json
+        print(f"📥 Received rule-based salary data: {data}")
+        
+        skills = data.get('skills', '')
+        skills_list = parse_skills(skills) if isinstance(skills, str) else list(skills)
+        education = data.get('education_level', "Bachelor's")
+        
+        result = predict_salary_realistic(
+            job_title=data['job_title'],
+            location=data['location'].strip().title(),
+            education=REALISTIC_EDUCATION_MAP.get(education, education),
+            experience_years=float(data['years_of_experience']),
+            job_type=data.get('job_type', 'Full-time'),
+            skills_list=skills_list
+        )
+        
+        # The rule-based predictor reports problems as strings
+        if isinstance(result, str):
+            if result.startswith('❌'):
+                return jsonify({'error': result, 'status': 'error'}), 400
+            return jsonify({'message': result, 'status': 'warning'})
+        
+        print(f"💰 Rule-based salary prediction: {result['salary']}")
+        return jsonify({
+            'predicted_salary': result['salary'],
+            'breakdown': result['breakdown'],
+            'skill_analysis': result['skill_analysis'],
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Rule-based Salary Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/recommend-skills', methods=['POST'])
+def recommend_skills():
+    try:
+        data = request.json
+        print(f"📥 Received skill-gap request: {data}")
+        
+        current_skills = parse_skills(data.get('skills', ''))
+        candidates = data.get('candidates')
+        if candidates:
+            if not isinstance(candidates, list) or not all(isinstance(c, str) for c in candidates):
+                raise ValueError("candidates must be a list of skill names")
+            if len(candidates) > MAX_CANDIDATES:
+                raise ValueError(f"{len(candidates)} candidates, maximum is {MAX_CANDIDATES}")
+        else:
+            candidates = load_skill_vocabulary()
+        top_n = int(data.get('top_n', 5))
+        
+        # Every counterfactual profile goes into one batch
+        variants = skill_variants(current_skills, candidates)
+        payloads = [{**data, 'skills': ', '.join(current_skills + list(added))} for added in variants]
+        input_data = build_salary_frame(payloads)
+        predictions = run_inference(salary_model.predict, input_data)
+        
+        baseline = float(predictions[0])
+        scored = sorted(
+            ({'skills': list(added), 'predicted_salary': float(p), 'gain': float(p) - baseline}
+             for added, p in zip(variants[1:], predictions[1:])),
+            key=lambda r: r['gain'],
+            reverse=True
+        )
+        print(f"🎯 Scored {len(variants)} skill variants in one predict call")
+        
+        return jsonify({
+            'baseline_salary': baseline,
+            'single_skills': [r for r in scored if len(r['skills']) == 1][:top_n],
+            'skill_pairs': [r for r in scored if len(r['skills']) == 2][:top_n],
+            'variants_scored': len(variants),
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Skill Recommender Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
 @app.route('/predict-car', methods=['POST'])
 def predict_car():
     try:
@@ -152,16 +408,7 @@ def predict_car():
         print(f"📥 Received car data: {data}")
         
         # Create DataFrame with the input data
-        input_data = pd.DataFrame([{
-            'model': data['model'],
-            'year': int(data['year']),
-            'km_driven': int(data['km_driven']),
-            'fuel': data['fuel'],
-            'condition': data['condition'],
-            'first_owner': int(data['first_owner']),
-            'fiscal_power': int(data['fiscal_power']),
-            'price': float(data['price'])
-        }])
+        input_data = pd.DataFrame([build_car_row(data)])
         
         print(f"📊 Car input features shape: {input_data.shape}")
         print(f"📋 Car input features columns: {input_data.columns.tolist()}")
@@ -169,15 +416,12 @@ def predict_car():
         print(f"🔍 Car input data types:\n{input_data.dtypes}")
         
         # Make prediction with the model
-        raw_prediction = car_model.predict(input_data)[0]
+        raw_prediction = run_inference(car_model.predict, input_data)[0]
         print(f"🎯 Raw prediction value: {raw_prediction}")
         print(f"🎯 Raw prediction type: {type(raw_prediction)}")
         
         # Convert string prediction to boolean
-        if isinstance(raw_prediction, str):
-            is_good_deal = raw_prediction.lower() in ['yes', 'good', 'true', '1']
-        else:
-            is_good_deal = bool(raw_prediction)
+        is_good_deal = is_good_deal_label(raw_prediction)
         
         print(f"💰 Car prediction (is_good_deal): {is_good_deal}")
         
@@ -195,41 +439,45 @@ def predict_car():
             'status': 'error'
         }), 400
 
+@app.route('/predict-car/sweep', methods=['POST'])
+def sweep_car():
+    try:
+        data = request.json
+        print(f"📥 Received car sweep: {data}")
+        
+        field, values, payloads = sweep_payloads(data, 'car')
+        
+        input_data = pd.DataFrame([build_car_row(p) for p in payloads])
+        predictions = run_inference(car_model.predict, input_data)
+        print(f"📈 Car sweep over {field}: {len(values)} points")
+        
+        return jsonify({
+            'field': field,
+            'points': [{'value': v, 'is_good_deal': is_good_deal_label(p)} for v, p in zip(values, predictions)],
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Car Sweep Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
 @app.route('/predict-house', methods=['POST'])
 def predict_house():
     try:
         data = request.json
         print(f"📥 Received house data: {data}")
         
-        # Encode categorical features
-        property_type_map = {'appartement': 0, 'duplex': 1, 'maison': 2, 'riad': 3, 'studio': 4, 'villa': 5}
-        transaction_map = {'location': 0, 'location vacances': 1, 'vente': 2}
-        city_map = {'casablanca': 0, 'rabat': 1, 'marrakech': 2, 'fes': 3, 'tanger': 4, 'agadir': 5, 
-                   'meknes': 6, 'oujda': 7, 'kenitra': 8, 'tetouan': 9, 'sale': 10}
-        condition_map = {'a renover': 0, 'bon etat': 1, 'excellent etat': 2, 'neuf': 3, 'tres bon etat': 4}
-        
         # Create input array with 10 features
-        # Order: property_type, transaction, surface, rooms, bathrooms, floor, city, neighborhood_encoded, condition, age
-        neighborhood_encoded = hash(data.get('neighborhood', '')) % 100  # Simple encoding for neighborhood
-        
-        input_array = [[
-            property_type_map.get(data['property_type'].lower(), 0),
-            transaction_map.get(data['transaction'].lower(), 0),
-            float(data['surface']),
-            int(data['rooms']),
-            int(data['bathrooms']),
-            int(data['floor']),
-            city_map.get(data['city'].lower(), 0),
-            neighborhood_encoded,
-            condition_map.get(data['condition'].lower(), 1),
-            int(data['age'])
-        ]]
+        input_array = [house_row(data)]
         
         print(f"📊 House input array shape: {len(input_array)}x{len(input_array[0])}")
         print(f"🔍 House input values: {input_array[0]}")
         
         # Make prediction
-        prediction = house_model.predict(input_array)[0]
+        prediction = run_inference(house_model.predict, input_array)[0]
         print(f"🏠 House prediction: {prediction:.2f} MAD")
         
         return jsonify({
@@ -246,6 +494,207 @@ def predict_house():
             'status': 'error'
         }), 400
 
+@app.route('/predict-house/sweep', methods=['POST'])
+def sweep_house():
+    try:
+        data = request.json
+        print(f"📥 Received house sweep: {data}")
+        
+        field, values, payloads = sweep_payloads(data, 'house')
+        
+        input_array = np.array([house_row(p) for p in payloads], dtype=float)
+        predictions = run_inference(house_model.predict, input_array)
+        print(f"📈 House sweep over {field}: {len(values)} points")
+        
+        return jsonify({
+            'field': field,
+            'points': [{'value': v, 'predicted_price': float(p)} for v, p in zip(values, predictions)],
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ House Sweep Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/comparable-houses', methods=['POST'])
+def comparable_houses():
+    try:
+        data = request.json
+        print(f"📥 Received comparables request: {data}")
+        
+        comparables = comparables_index.query(
+            city=data['city'],
+            transaction=data['transaction'],
+            surface=float(data['surface']),
+            rooms=int(data['rooms']),
+            bathrooms=int(data['bathrooms']),
+            age=int(data['age']),
+            floor=int(data['floor']),
+            k=int(data.get('k', 5))
+        )
+        print(f"🏘️ Found {len(comparables)} comparable listings")
+        
+        return jsonify({
+            'comparables': comparables,
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Comparables Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/similar-jobs', methods=['POST'])
+def similar_jobs():
+    try:
+        data = request.json
+        print(f"📥 Received similar-jobs request: {data}")
+        
+        skills_text = ', '.join(parse_skills(data.get('skills', '')))
+        jobs = job_search_index.search(skills_text, data.get('job_title', ''), int(data.get('k', 10)))
+        print(f"🔎 Found {len(jobs)} similar jobs")
+        
+        return jsonify({
+            'jobs': jobs,
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Similar Jobs Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+def optional_years(data):
+    """Years of experience from a market query, or None to roll it up"""
+    years = data.get('years_of_experience')
+    return None if years in (None, '') else float(years)
+
+@app.route('/market/salary', methods=['POST'])
+def market_salary():
+    try:
+        data = request.json
+        print(f"📥 Received market salary query: {data}")
+        
+        stats = market_stats.salary(data.get('job_title'), data.get('location'), optional_years(data))
+        if stats is None:
+            return jsonify({'error': 'No postings match this query', 'status': 'error'}), 404
+        
+        return jsonify({
+            'salary': stats,
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Market Salary Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/market/salary-rank', methods=['POST'])
+def market_salary_rank():
+    try:
+        data = request.json
+        print(f"📥 Received salary rank query: {data}")
+        
+        rank = market_stats.salary_rank(float(data['salary']), data.get('job_title'), data.get('location'), optional_years(data))
+        if rank is None:
+            return jsonify({'error': 'No postings match this query', 'status': 'error'}), 404
+        
+        return jsonify({
+            'percentile': rank,
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Salary Rank Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/market/housing', methods=['POST'])
+def market_housing():
+    try:
+        data = request.json
+        print(f"📥 Received market housing query: {data}")
+        
+        stats = market_stats.housing(data.get('city'), data.get('neighborhood'), data.get('property_type'), data.get('transaction'))
+        if stats['price'] is None:
+            return jsonify({'error': 'No listings match this query', 'status': 'error'}), 404
+        
+        return jsonify({
+            **stats,
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Market Housing Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+MAX_PROJECTION_PATHS = 20000
+MAX_PROJECTION_YEARS = 60
+HOUSE_DOWN_PAYMENT = 0.2
+
+@app.route('/project-journey', methods=['POST'])
+def project_journey():
+    try:
+        data = request.json
+        print(f"📥 Received journey projection: {data}")
+        
+        # Starting point: an explicit salary, or one predicted from a salary payload
+        salary_data = data.get('salary')
+        if 'starting_salary' in data:
+            starting_salary = float(data['starting_salary'])
+        else:
+            starting_salary = float(run_inference(salary_model.predict, build_salary_frame([salary_data]))[0])
+        experience_years = int(salary_data['years_of_experience']) if salary_data else int(data.get('years_of_experience', 0))
+        
+        # Goals: a car price, and a house price (given or predicted) turned into a down payment
+        targets = {}
+        if 'car_price' in data:
+            targets['car'] = float(data['car_price'])
+        house_price = data.get('house_price')
+        if house_price is None and 'house' in data:
+            house_price = run_inference(house_model.predict, [house_row(data['house'])])[0]
+        if house_price is not None:
+            targets['house_down_payment'] = float(house_price) * float(data.get('house_down_payment', HOUSE_DOWN_PAYMENT))
+        
+        projection = simulate_career(
+            starting_salary,
+            experience_years=experience_years,
+            years=min(int(data.get('years', 30)), MAX_PROJECTION_YEARS),
+            n_paths=min(int(data.get('n_paths', 5000)), MAX_PROJECTION_PATHS),
+            savings_rate=float(data.get('savings_rate', 0.2)),
+            annual_return=float(data.get('annual_return', 0.03)),
+            targets=targets,
+            seed=int(data.get('seed', 42))
+        )
+        print(f"🗺️ Projected {len(projection['years'])} years for {len(targets)} goals")
+        
+        return jsonify({
+            'starting_salary': starting_salary,
+            **projection,
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        print(f"❌ Journey Projection Error: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
 if __name__ == '__main__':
     print("=" * 50)
     print("🚀 Career2Life API Server Starting...")
@@ -255,5 +704,16 @@ if __name__ == '__main__':
     print("   - POST /predict-salary")
     print("   - POST /predict-car")
     print("   - POST /predict-house")
+    print("   - POST /predict-salary/sweep")
+    print("   - POST /predict-salary-realistic")
+    print("   - POST /predict-car/sweep")
+    print("   - POST /predict-house/sweep")
+    print("   - POST /recommend-skills")
+    print("   - POST /comparable-houses")
+    print("   - POST /similar-jobs")
+    print("   - POST /market/salary")
+    print("   - POST /market/salary-rank")
+    print("   - POST /market/housing")
+    print("   - POST /project-journey")
     print("=" * 50)
     app.run(debug=True, port=5000)
@@ -0,0 +1,115 @@
+"""
+HTML extraction benchmark on saved search result pages
+Writes --pages Indeed-style fixtures from benchmarks/standin_site.py to
+--fixtures (once), then parses them all with:
+- the previous parser: html.parser, class regexes compiled on every card
+- each extraction engine in this process
+- the default engine on --workers parse processes
+Every engine must extract the same card fields as the previous parser.
+
+Usage:
+    python benchmarks/benchmark_extraction.py --pages 500 --workers 2
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+from extraction import DEFAULT_ENGINE, ENGINES, ExtractionPool
+from standin_site import search_page
+
+SEARCHES = [('Software Engineer', 'Casablanca'), ('Data Analyst', 'Rabat'), ('Civil Engineer', 'Fes'),
+            ('IT Technician', 'Tangier'), ('Product Manager', 'Marrakech')]
+
+
+def previous_parse(html):
+    """The previous parse_indeed_page + _extract_indeed_job_data lookups"""
+    soup = BeautifulSoup(html, 'html.parser')
+    cards = []
+    for card in soup.find_all(['div', 'a'], class_=re.compile('job|result|card', re.I)):
+        fields = {}
+        for field, tags, pattern in [('title', ['h2', 'a', 'span'], 'jobTitle|title'),
+                                     ('company', ['span', 'div', 'a'], 'company'),
+                                     ('location', ['div', 'span'], 'location|companyLocation'),
+                                     ('salary', ['div', 'span'], 'salary|estimated'),
+                                     ('description', ['div', 'span'], 'snippet|description|summary')]:
+            found = card.find(tags, class_=re.compile(pattern, re.I))
+            fields[field] = found.get_text(strip=True) if found else None
+        cards.append(fields)
+    return cards
+
+
+def write_fixtures(directory, pages, cards):
+    os.makedirs(directory, exist_ok=True)
+    for i in range(pages):
+        query, city = SEARCHES[i % len(SEARCHES)]
+        # every 20th page is the empty last page of a search
+        offset = 10 * (i // len(SEARCHES)) if i % 20 else 10 ** 6
+        with open(os.path.join(directory, f'indeed_{i:05d}.html'), 'w', encoding='utf-8') as f:
+            f.write(search_page(query, city, offset, 10 ** 5, cards))
+
+
+def load_fixtures(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def timed(label, pages, parse):
+    start = time.perf_counter()
+    results = parse(pages)
+    seconds = time.perf_counter() - start
+    cards = sum(len(r) for r in results)
+    print(f"   {label:<28} {len(pages):>6} pages {cards:>7} cards {seconds:>7.2f}s {len(pages) / seconds:>9.1f} pages/s")
+    return seconds, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML extraction engines on saved pages')
+    parser.add_argument('--fixtures', default=os.path.join(ROOT, 'fixtures', 'indeed'))
+    parser.add_argument('--pages', type=int, default=500, help='fixtures to write if the directory is empty')
+    parser.add_argument('--cards', type=int, default=15, help='job cards per fixture page')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='parse processes')
+    args = parser.parse_args()
+
+    if not glob.glob(os.path.join(args.fixtures, '*.html')):
+        write_fixtures(args.fixtures, args.pages, args.cards)
+    pages = load_fixtures(args.fixtures)
+    size = sum(len(p) for p in pages)
+    print(f"📄 {len(pages)} fixture pages ({size / 1e6:.1f} MB) from {args.fixtures}")
+
+    before, expected = timed('previous (html.parser)', pages, lambda ps: [previous_parse(p) for p in ps])
+    ok = True
+    runs = [(f'{name} engine', ExtractionPool(name)) for name in sorted(ENGINES)]
+    runs.append((f'{DEFAULT_ENGINE} x {args.workers} processes', ExtractionPool(DEFAULT_ENGINE, args.workers)))
+    for label, extractor in runs:
+        with extractor:
+            if extractor.pool:
+                extractor.submit('indeed_cards', pages[0]).result()  # start the workers
+
+            def parse(ps, extractor=extractor):
+                futures = [extractor.submit('indeed_cards', p) for p in ps]
+                return [f.result() for f in futures]
+
+            seconds, results = timed(label, pages, parse)
+        same = results == expected
+        ok &= same
+        print(f"      {before / seconds:.1f}x the previous parser, {'same' if same else 'DIFFERENT'} fields")
+
+    print(f"{'✅' if ok else '❌'} Every engine extracts the previous parser's fields")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Scraper fetch benchmark against the local stand-in site
+Scrapes --searches Indeed-style searches from benchmarks/standin_site.py
+twice: one page at a time with a fresh requests.get per page (the old
+loop, without its 2-4 s sleeps), then through the concurrent Fetcher.
+It then checks that the per-host token bucket holds the configured rate
+while many requests are in flight, and that the response cache serves
+fresh pages without requests, revalidates stale ones with 304s and
+replays offline to the same jobs.
+
+Usage:
+    python benchmarks/benchmark_fetch.py --searches 12 --latency 0.1 --workers 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fetcher import Fetcher, ResponseCache
+from job_scraper import JobScraper
+from standin_site import StandInSite
+
+
+def sequential_scrape(scraper, searches, max_pages):
+    """The previous loop: one fresh connection per page, pages strictly in order"""
+    for job_title, location in searches:
+        for page in range(max_pages):
+            response = requests.get(scraper.indeed_search_url(job_title, location, page), headers=scraper.headers, timeout=10)
+            jobs = scraper.parse_indeed_page(response.content, location)
+            if not jobs:
+                break
+            scraper.sink.write_many(jobs)
+
+
+def timed(label, site, run):
+    site.requests.clear()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        jobs = run()
+    seconds = time.perf_counter() - start
+    pages = len(site.requests)
+    print(f"   {label:<28} {pages:>5} pages {jobs:>6} jobs {seconds:>7.2f}s {pages / seconds:>8.1f} pages/s")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent scraping against a local stand-in site')
+    parser.add_argument('--searches', type=int, default=12)
+    parser.add_argument('--pages', type=int, default=5, help='result pages per search')
+    parser.add_argument('--latency', type=float, default=0.1, help='stand-in response time in seconds')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=5.0, help='per-host rate for the rate-limit check')
+    parser.add_argument('--burst', type=int, default=2)
+    args = parser.parse_args()
+
+    scraper = JobScraper()
+    searches = [(title, city) for title in scraper.job_categories for city in scraper.cities][:args.searches]
+    max_pages = args.pages + 1
+
+    with StandInSite(latency=args.latency, pages=args.pages) as site:
+        print(f"🌐 Stand-in site {site.url}: {len(searches)} searches x {args.pages} pages, {args.latency * 1000:.0f} ms latency")
+
+        def run_sequential():
+            sequential = JobScraper()
+            sequential.indeed_url = f'{site.url}/jobs'
+            sequential_scrape(sequential, searches, max_pages)
+            return sequential.sink.rows
+
+        def run_concurrent(rate, burst, cache=None, offline=False):
+            def run():
+                with Fetcher(JobScraper.HEADERS, args.workers, rate, burst, cache=cache, offline=offline) as fetcher:
+                    concurrent = JobScraper(fetcher)
+                    concurrent.indeed_url = f'{site.url}/jobs'
+                    return sum(concurrent.scrape_indeed_searches(searches, max_pages).values())
+            return run
+
+        before = timed('sequential requests.get', site, run_sequential)
+        after = timed(f'Fetcher ({args.workers} workers)', site, run_concurrent(1000.0, args.workers))
+        print(f"⚡ {before / after:.1f}x faster")
+
+        seconds = timed(f'Fetcher at {args.rate:g} req/s/host', site, run_concurrent(args.rate, args.burst))
+        achieved = (len(site.requests) - args.burst) / seconds
+        peak = site.max_requests_in(1.0)
+        allowed = args.rate + args.burst
+        rate_ok = achieved <= args.rate * 1.05 and peak <= allowed
+        print(f"{'✅' if rate_ok else '❌'} Rate limit: {achieved:.2f} req/s sustained (limit {args.rate:g}), "
+              f"peak {peak} requests in 1s (allowed {allowed:g})")
+
+        print("🗄️  Response cache")
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(directory, ttl=3600)
+            jobs, requests_made, seconds = {}, {}, {}
+            for label, run in [('cold', run_concurrent(1000.0, args.workers, cache)),
+                               ('fresh', run_concurrent(1000.0, args.workers, cache)),
+                               ('offline replay', run_concurrent(1000.0, args.workers, cache, offline=True))]:
+                site.requests.clear()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    jobs[label] = run()
+                seconds[label] = time.perf_counter() - start
+                requests_made[label] = len(site.requests)
+            cache.ttl = 0
+            site.not_modified = 0
+            site.requests.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                jobs['revalidated'] = run_concurrent(1000.0, args.workers, cache)()
+            requests_made['revalidated'] = len(site.requests)
+        for label in jobs:
+            extra = f" ({site.not_modified} not modified)" if label == 'revalidated' else f" {seconds[label]:>7.2f}s"
+            print(f"   {label:<28} {requests_made[label]:>5} requests {jobs[label]:>6} jobs{extra}")
+        cache_ok = (len(set(jobs.values())) == 1 and requests_made['fresh'] == 0 and requests_made['offline replay'] == 0
+                    and site.not_modified == requests_made['revalidated'] == requests_made['cold'])
+        print(f"{'✅' if cache_ok else '❌'} Cache: same jobs from every run, no requests when fresh or offline, "
+              f"304 for every stale page")
+        sys.exit(0 if rate_ok and cache_ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Similar-job search benchmark
+Resamples the jobs dataset up to --rows postings, builds the inverted index
+and times top-k queries.
+
+Usage:
+    python benchmarks/benchmark_job_search.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from job_search import JobSearchIndex
+
+QUERIES = [
+    ('Python, SQL, Spark', 'Data Engineer'),
+    ('Docker, Kubernetes, AWS, CI/CD', 'DevOps Engineer'),
+    ('React, TypeScript', ''),
+    ('AutoCAD, Project Management', 'Civil Engineer'),
+    ('Selenium, JIRA', 'QA Engineer'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark similar-job search')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    df = pd.read_csv(os.path.join(ROOT, 'morocco_jobs_dataset.csv'),
+                     usecols=['job_title', 'company_name', 'location', 'salary', 'skills_required'])
+    df = df.sample(n=args.rows, replace=args.rows > len(df), random_state=42).reset_index(drop=True)
+
+    start = time.perf_counter()
+    index = JobSearchIndex.build(df)
+    print(f"🏗️  Built index over {args.rows:,} postings in {time.perf_counter() - start:.1f}s "
+          f"({index.postings.nnz:,} postings entries)")
+
+    latencies = []
+    for i in range(args.queries):
+        skills, title = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        index.search(skills, title, args.k)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies = np.array(latencies)
+    print(f"🔎 {args.queries} queries, top-{args.k}: "
+          f"p50 {np.percentile(latencies, 50):.2f} ms, p95 {np.percentile(latencies, 95):.2f} ms, "
+          f"max {latencies.max():.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Rule-based salary batch benchmark
+Re-scores the jobs dataset (resampled up to --rows) with the scalar
+predict_salary_realistic loop and with predict_salary_realistic_batch,
+and checks that both give identical salaries and error codes.
+
+Usage:
+    python benchmarks/benchmark_salary_batch.py --rows 12000,1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from realistic_salary_predictor import OK, predict_salary_realistic, predict_salary_realistic_batch
+
+
+def load_profiles():
+    df = pd.read_csv(os.path.join(ROOT, 'morocco_jobs_dataset.csv'))
+    return pd.DataFrame({
+        'job_title': df['job_title'],
+        'location': df['location'],
+        'education': df['education_required'],
+        'experience_years': df['experience_required'].str.extract(r'(\d+)', expand=False).astype(float),
+        'job_type': df['job_type'],
+        'skills': df['skills_required'].str.split(', '),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the rule-based salary batch mode')
+    parser.add_argument('--rows', default='12000,1000000', help='comma separated row counts')
+    args = parser.parse_args()
+
+    profiles = load_profiles()
+    for rows in [int(r) for r in args.rows.split(',')]:
+        sample = profiles.sample(n=rows, replace=rows > len(profiles), random_state=42).reset_index(drop=True)
+        print("=" * 60)
+        print(f"📏 {rows:,} profiles")
+
+        start = time.perf_counter()
+        batch = predict_salary_realistic_batch(sample)
+        batch_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scalar = [
+            predict_salary_realistic(r.job_title, r.location, r.education, r.experience_years, r.job_type, r.skills)
+            for r in sample.itertuples(index=False)
+        ]
+        scalar_time = time.perf_counter() - start
+
+        scalar_salary = np.array([r['salary'] if isinstance(r, dict) else 0 for r in scalar])
+        scalar_ok = np.array([isinstance(r, dict) for r in scalar])
+        mismatches = int(((scalar_salary != batch['salary']) | (scalar_ok != (batch['error'] == OK))).sum())
+
+        print(f"   Scalar loop: {scalar_time:8.3f}s")
+        print(f"   Batch:       {batch_time:8.3f}s  ({scalar_time / batch_time:.1f}x)")
+        print(f"   Mismatches:  {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
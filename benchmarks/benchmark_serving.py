@@ -0,0 +1,139 @@
+"""
+Serving benchmark: workers x inference threads
+Runs the salary and house models the way gunicorn does - one process per
+worker, each with its BLAS/OpenMP pools pinned - and reports throughput and
+tail latency for every cell of the matrix.
+
+Usage:
+    python benchmarks/benchmark_serving.py --workers 1,2,4 --threads 1,2,4
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SALARY_ROW = {
+    'job_title': 'Data Engineer',
+    'skills_required': 'Python, SQL, Spark, AWS',
+    'experience_years': 3,
+    'experience_level': 'mid',
+    'education_required': "master's degree",
+    'location': 'rabat',
+    'job_type': 'full-time',
+    'skills_count': 4,
+    'tech_skills_count': 3,
+    'experience_squared': 9,
+    'edu_exp_interaction': 6,
+    'city_tier': 'tier1',
+    'job_type_numeric': 1,
+    'education_level_numeric': 2
+}
+
+HOUSE_ROW = [0, 2, 120.0, 3, 2, 2, 1, 42, 1, 10]
+
+
+def _worker(threads, model_name, n_requests, batch, barrier, results):
+    """Benchmark process: pin threads, load one model, time predict calls"""
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[var] = str(threads)
+
+    import joblib
+    import pandas as pd
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(limits=threads)
+
+    if model_name == 'salary':
+        model = joblib.load(os.path.join(ROOT, 'SalaryModel.pkl'))
+        features = pd.DataFrame([SALARY_ROW] * batch)
+    else:
+        model = joblib.load(os.path.join(ROOT, 'house_predictions.pkl'))
+        features = [HOUSE_ROW] * batch
+
+    model.predict(features)  # warm-up
+    barrier.wait()
+
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        model.predict(features)
+        latencies.append(time.perf_counter() - start)
+    results.put(latencies)
+
+
+def run_cell(workers, threads, model_name, n_requests, batch):
+    """Run one workers x threads cell and return its latency summary"""
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(workers + 1)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(threads, model_name, n_requests, batch, barrier, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    latencies = []
+    for _ in procs:
+        latencies.extend(results.get())
+    wall = time.perf_counter() - start
+    for p in procs:
+        p.join()
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        'workers': workers,
+        'threads': threads,
+        'throughput_rps': round(len(latencies) / wall, 1),
+        'p50_ms': round(pick(0.50), 2),
+        'p95_ms': round(pick(0.95), 2),
+        'p99_ms': round(pick(0.99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark workers x inference threads')
+    parser.add_argument('--workers', default='1,2,4', help='comma separated worker counts')
+    parser.add_argument('--threads', default='1,2,4', help='comma separated threads per worker')
+    parser.add_argument('--model', choices=['salary', 'house'], default='salary')
+    parser.add_argument('--requests', type=int, default=200, help='predict calls per worker')
+    parser.add_argument('--batch', type=int, default=1, help='rows per predict call')
+    parser.add_argument('--json', help='write the matrix to this file')
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    print("=" * 60)
+    print(f"⏱️  Serving benchmark - model: {args.model}, cores: {cores}, batch: {args.batch}")
+    print("=" * 60)
+    print(f"{'workers':>8} {'threads':>8} {'rps':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+
+    rows = []
+    for workers in [int(w) for w in args.workers.split(',')]:
+        for threads in [int(t) for t in args.threads.split(',')]:
+            row = run_cell(workers, threads, args.model, args.requests, args.batch)
+            flag = '  ⚠️ oversubscribed' if workers * threads > cores else ''
+            print(f"{workers:>8} {threads:>8} {row['throughput_rps']:>10} {row['p50_ms']:>9} "
+                  f"{row['p95_ms']:>9} {row['p99_ms']:>9}{flag}")
+            rows.append(row)
+
+    best = min(rows, key=lambda r: (r['p99_ms'], -r['throughput_rps']))
+    fastest = max(rows, key=lambda r: r['throughput_rps'])
+    print(f"\n🏆 Best tail latency: {best['workers']} workers x {best['threads']} threads "
+          f"(p99 {best['p99_ms']} ms)")
+    print(f"🚀 Best throughput:   {fastest['workers']} workers x {fastest['threads']} threads "
+          f"({fastest['throughput_rps']} req/s)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'cores': cores, 'model': args.model, 'batch': args.batch, 'matrix': rows}, f, indent=2)
+        print(f"💾 Matrix saved to: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Skill matcher benchmark
+Compares the original substring loop of calculate_skill_score against the
+compiled token-boundary matcher, per row and over a whole column.
+
+Usage:
+    python benchmarks/benchmark_skill_matcher.py --rows 12000,1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from realistic_salary_predictor import HIGH_VALUE_SKILLS, SKILL_MATCHER
+
+
+def legacy_skill_score(skills_str):
+    """The original O(patterns x text) substring loop"""
+    if pd.isna(skills_str) or skills_str.strip() == '':
+        return 0, 0, ""
+    skills_lower = skills_str.lower()
+    total_score = 0
+    high_value_count = 0
+    matched_skills = []
+    for skill, weight in HIGH_VALUE_SKILLS.items():
+        if skill.lower() in skills_lower:
+            total_score += weight
+            high_value_count += 1
+            matched_skills.append(f"{skill}({weight})")
+    return total_score, high_value_count, ", ".join(matched_skills)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark skill matching')
+    parser.add_argument('--rows', default='12000,1000000', help='comma separated row counts')
+    args = parser.parse_args()
+
+    skills = pd.read_csv(os.path.join(ROOT, 'morocco_jobs_dataset.csv'), usecols=['skills_required'])['skills_required']
+
+    for rows in [int(r) for r in args.rows.split(',')]:
+        column = skills.sample(n=rows, replace=rows > len(skills), random_state=42).reset_index(drop=True)
+        print("=" * 60)
+        print(f"📏 {rows:,} rows ({column.nunique():,} distinct skill strings)")
+
+        legacy, legacy_time = timed(lambda: column.map(legacy_skill_score))
+        per_row, row_time = timed(lambda: column.map(SKILL_MATCHER.score))
+        _, column_time = timed(lambda: SKILL_MATCHER.score_column(column))
+
+        changed = sum(a[1] != b[1] for a, b in zip(legacy, per_row))
+        print(f"   Legacy substring loop: {legacy_time:8.3f}s")
+        print(f"   Compiled, per row:     {row_time:8.3f}s  ({legacy_time / row_time:.1f}x)")
+        print(f"   Compiled, column:      {column_time:8.3f}s  ({legacy_time / column_time:.1f}x)")
+        print(f"   Rows whose match count changed (false positives removed): {changed:,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+"""
+Training benchmark and accuracy-regression report
+Runs a train.py layout stage by stage (load, parse, encode, fit,
+evaluate, dump) and records wall time per stage, peak RSS, model size
+and accuracy over fixed K folds. --layout full (default) is the API's
+salary Pipeline that train.py trains by default, with the feature state
+fitted per fold; --layout basic is the random forest on three columns.
+Fit, evaluate and dump (and encode, for full) are averaged over the
+folds. Every run is appended to a JSON history, and compare flags runs
+that got slower, bigger or less accurate than a baseline (exit code 1,
+so it can gate CI). run --compare uses the latest earlier run with the
+same parameters and dataset as the baseline.
+
+Usage:
+    python benchmarks/benchmark_training.py run --label baseline
+    python benchmarks/benchmark_training.py run --layout basic --n-estimators 200 --compare
+    python benchmarks/benchmark_training.py compare --baseline baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import LabelEncoder
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from datasets import read_dataset, resolve
+from salary_features import INPUT_COLUMNS, JOBS_COLUMNS, SalaryFeatures, jobs_frame
+from train import JOBS_DATASET, RAW_COLUMNS, file_digest, make_model, make_pipeline, parse_features
+
+HISTORY = os.path.join(ROOT, 'benchmarks', 'training_history.json')
+FEATURES = ['job_title_encoded', 'num_skills', 'experience_years']
+# train.py's hyperparameter defaults per layout: (n_estimators, max_depth)
+LAYOUT_DEFAULTS = {'full': (300, 7), 'basic': (100, None)}
+STAGES = ['load', 'parse', 'encode', 'fit', 'evaluate', 'dump']
+
+# Relative change beyond which compare flags a regression
+TIME_TOLERANCE = 0.15
+SIZE_TOLERANCE = 0.10
+ACCURACY_TOLERANCE = 0.01
+MIN_SECONDS = 0.05  # Stage times closer than this are noise
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(source, folds, n_estimators, max_depth, layout='full'):
+    """One timed training run; returns its history record"""
+    stages = {}
+
+    start = time.perf_counter()
+    raw = read_dataset(source, JOBS_COLUMNS if layout == 'full' else RAW_COLUMNS)
+    stages['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if layout == 'full':
+        df = jobs_frame(raw)
+        X = df[INPUT_COLUMNS]
+    else:
+        df = parse_features(raw)
+    stages['parse'] = time.perf_counter() - start
+
+    encode_times = []
+    if layout == 'basic':
+        start = time.perf_counter()
+        df['job_title_encoded'] = LabelEncoder().fit_transform(df['job_title'])
+        encode_times.append(time.perf_counter() - start)
+        X = df[FEATURES]
+    y = df['salary']
+
+    fold_metrics, fit_times, evaluate_times, dump_times, sizes = [], [], [], [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for train_index, test_index in KFold(folds, shuffle=True, random_state=42).split(X):
+            X_train, X_test = X.iloc[train_index], X.iloc[test_index]
+            if layout == 'full':
+                # Feature state is fitted on the training rows, as train.py does
+                start = time.perf_counter()
+                features = SalaryFeatures().fit(X_train)
+                X_train, X_test = features.transform(X_train), features.transform(X_test)
+                encode_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            model = make_pipeline(n_estimators, max_depth) if layout == 'full' else make_model(n_estimators, max_depth)
+            model.fit(X_train, y.iloc[train_index])
+            fit_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            y_pred = model.predict(X_test)
+            evaluate_times.append(time.perf_counter() - start)
+            y_test = y.iloc[test_index]
+            fold_metrics.append({
+                'mae': float(mean_absolute_error(y_test, y_pred)),
+                'rmse': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+                'r2': float(r2_score(y_test, y_pred)),
+            })
+
+            start = time.perf_counter()
+            path = os.path.join(tmp, 'model.pkl')
+            joblib.dump(model, path)
+            dump_times.append(time.perf_counter() - start)
+            sizes.append(os.path.getsize(path))
+
+    stages['encode'] = float(np.mean(encode_times))
+    stages['fit'] = float(np.mean(fit_times))
+    stages['evaluate'] = float(np.mean(evaluate_times))
+    stages['dump'] = float(np.mean(dump_times))
+
+    accuracy = {}
+    for metric in fold_metrics[0]:
+        values = [m[metric] for m in fold_metrics]
+        accuracy[metric] = {'mean': float(np.mean(values)), 'std': float(np.std(values)), 'folds': values}
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'dataset': os.path.basename(resolve(source)),
+        'dataset_sha256': file_digest(resolve(source)),
+        'rows': len(df),
+        'params': {'layout': layout, 'n_estimators': n_estimators, 'max_depth': max_depth, 'folds': folds},
+        'host': {'cpus': os.cpu_count(), 'python': platform.python_version(), 'sklearn': sklearn.__version__},
+        'stages': {name: round(stages[name], 4) for name in STAGES},
+        'total_seconds': round(sum(stages.values()), 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'model_size_kb': round(float(np.mean(sizes)) / 1024, 1),
+        'accuracy': accuracy,
+    }
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def find_run(history, selector):
+    """A run by label, or by index (negative counts from the latest)"""
+    for run in reversed(history):
+        if run.get('label') == selector:
+            return run
+    try:
+        return history[int(selector)]
+    except (ValueError, IndexError):
+        raise SystemExit(f"❌ No run '{selector}' in the history ({len(history)} runs)")
+
+
+def comparable_baseline(history, run):
+    """The latest earlier run with the same params and dataset as run, or None"""
+    for earlier in reversed(history[:-1]):
+        if earlier['params'] == run['params'] and earlier['dataset_sha256'] == run['dataset_sha256']:
+            return earlier
+    return None
+
+
+def compare_runs(baseline, candidate):
+    """Rows of (metric, baseline, candidate, relative change, regressed)"""
+    # (name, before, after, tolerance, higher is better, minimum absolute change)
+    checks = [(f'{name} (s)', baseline['stages'][name], candidate['stages'][name], TIME_TOLERANCE, False, MIN_SECONDS)
+              for name in STAGES]
+    checks += [
+        ('total (s)', baseline['total_seconds'], candidate['total_seconds'], TIME_TOLERANCE, False, MIN_SECONDS),
+        ('peak RSS (MB)', baseline['peak_rss_mb'], candidate['peak_rss_mb'], SIZE_TOLERANCE, False, 0),
+        ('model size (KB)', baseline['model_size_kb'], candidate['model_size_kb'], SIZE_TOLERANCE, False, 0),
+    ]
+    checks += [
+        (metric.upper(), baseline['accuracy'][metric]['mean'], candidate['accuracy'][metric]['mean'],
+         ACCURACY_TOLERANCE, metric == 'r2', 0)
+        for metric in ('mae', 'rmse', 'r2')
+    ]
+    rows = []
+    for name, before, after, tolerance, higher_is_better, minimum in checks:
+        change = (after - before) / abs(before) if before else 0.0
+        worse = -change if higher_is_better else change
+        rows.append((name, before, after, change, worse > tolerance and abs(after - before) > minimum))
+    return rows
+
+
+def print_comparison(baseline, candidate):
+    describe = lambda run: run.get('label') or run['timestamp']
+    print(f"📊 {describe(candidate)} vs baseline {describe(baseline)}")
+    if baseline['dataset_sha256'] != candidate['dataset_sha256'] or baseline['host'] != candidate['host']:
+        print("   ⚠️ Different dataset or host: differences are not only from the code")
+    if baseline['params'] != candidate['params']:
+        print(f"   ⚠️ Different training parameters: {baseline['params']} -> {candidate['params']}")
+    rows = compare_runs(baseline, candidate)
+    for name, before, after, change, regressed in rows:
+        flag = '❌ regression' if regressed else ''
+        print(f"   {name:<16} {before:>12,.4g} -> {after:>12,.4g}  {change:+8.1%}  {flag}")
+    regressions = sum(row[4] for row in rows)
+    print(f"{'❌' if regressions else '✅'} {regressions} regression(s)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark salary model training')
+    parser.add_argument('--history', default=HISTORY)
+    sub = parser.add_subparsers(dest='command', required=True)
+    run = sub.add_parser('run', help='run the benchmark and append it to the history')
+    run.add_argument('--source', default=os.path.join(ROOT, JOBS_DATASET))
+    run.add_argument('--label', default=None)
+    run.add_argument('--folds', type=int, default=5)
+    run.add_argument('--layout', choices=sorted(LAYOUT_DEFAULTS), default='full', help="train.py layout (default: full)")
+    run.add_argument('--n-estimators', type=int, default=None, help='trees (default: full 300, basic 100)')
+    run.add_argument('--max-depth', type=int, default=None, help='tree depth (default: full 7, basic unlimited)')
+    run.add_argument('--compare', action='store_true',
+                     help='compare with the latest run of the same parameters and dataset afterwards')
+    compare = sub.add_parser('compare', help='compare two runs of the history')
+    compare.add_argument('--baseline', default='-2', help='label or index (default: the run before the latest)')
+    compare.add_argument('--candidate', default='-1', help='label or index (default: the latest run)')
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    if args.command == 'run':
+        n_estimators, max_depth = LAYOUT_DEFAULTS[args.layout]
+        record = run_benchmark(args.source, args.folds, args.n_estimators or n_estimators,
+                               args.max_depth or max_depth, args.layout)
+        if args.label:
+            record['label'] = args.label
+        history.append(record)
+        with open(args.history, 'w') as f:
+            json.dump(history, f, indent=2)
+
+        stages = ', '.join(f"{name} {record['stages'][name]:.3f}s" for name in STAGES)
+        mae = record['accuracy']['mae']
+        print(f"⏱️ {stages} (total {record['total_seconds']:.2f}s)")
+        print(f"📏 MAE {mae['mean']:,.1f} ± {mae['std']:,.1f} over {args.folds} folds, "
+              f"model {record['model_size_kb']:,.0f} KB, peak RSS {record['peak_rss_mb']:,.0f} MB")
+        print(f"💾 Run {len(history) - 1} saved to: {args.history}")
+        if args.compare:
+            baseline = comparable_baseline(history, record)
+            if baseline is None:
+                print("ℹ️ No earlier run with the same parameters and dataset to compare with")
+                return
+            sys.exit(1 if print_comparison(baseline, record) else 0)
+    else:
+        sys.exit(1 if print_comparison(find_run(history, args.baseline), find_run(history, args.candidate)) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Local stand-in for the sites the scrapers fetch
+A threaded HTTP server serving Indeed-style search result pages at
+/jobs?q=<title>&l=<city>&start=<offset>: each search has --pages pages of
+--cards job cards, then an empty page. Content is deterministic per URL,
+every response waits --latency seconds like a remote site, and request
+times are recorded so tests can check the client's rate limits. Pages
+carry an ETag and Last-Modified and answer a matching If-None-Match with
+304 Not Modified, for the response cache's revalidation.
+
+Usage:
+    python benchmarks/standin_site.py --port 8765
+    python job_scraper.py --scrape --indeed-url http://127.0.0.1:8765/jobs --max-pages 5
+"""
+
+import argparse
+import hashlib
+import html
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+COMPANIES = ['OCP Group', 'Maroc Telecom', 'CGI Maroc', 'Capgemini', 'Attijariwafa Bank', 'Renault Maroc']
+SNIPPETS = [
+    'Full-time position. 3-5 years of experience with Python, SQL and AWS. Master degree required.',
+    'CDI, 2+ years experience in Java, Spring and Docker. Bachelor degree in computer science.',
+    'Internship for engineering students: AutoCAD, project management, Excel.',
+    'Part-time role, 1-2 years experience, React, JavaScript and Node.js.',
+]
+
+
+def search_page(query, city, offset, pages, cards):
+    """HTML of one search results page (no cards past the last page)"""
+    if offset // 10 >= pages:
+        return '<html><body><div id="results"><p>No jobs match your search.</p></div></body></html>'
+    rng = random.Random(f'{query}|{city}|{offset}')
+    items = []
+    for i in range(cards):
+        salary = rng.randrange(6000, 30000, 100)
+        items.append(
+            f'<div class="job_seen_beacon cardOutline">'
+            f'<h2 class="jobTitle"><a href="/viewjob?jk={offset + i}">{html.escape(query)} {rng.choice(["", "Senior ", "Junior "])}</a></h2>'
+            f'<span class="companyName">{rng.choice(COMPANIES)}</span>'
+            f'<div class="companyLocation">{html.escape(city)}</div>'
+            f'<div class="salary-snippet-container">{salary} MAD/month</div>'
+            f'<div class="job-snippet"><ul><li>{rng.choice(SNIPPETS)}</li></ul></div>'
+            f'</div>'
+        )
+    return f'<html><head><title>{html.escape(query)} jobs</title></head><body><div id="mosaic">{"".join(items)}</div></body></html>'
+
+
+class StandInSite:
+    """The stand-in server on a background thread; use as a context manager"""
+
+    def __init__(self, port=0, latency=0.05, pages=5, cards=10):
+        self.latency = latency
+        self.pages = pages
+        self.cards = cards
+        self.requests = []  # (monotonic time, path)
+        self.not_modified = 0
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        self.lock = threading.Lock()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def do_GET(self):
+                with site.lock:
+                    site.requests.append((time.monotonic(), self.path))
+                time.sleep(site.latency)
+                url = urlsplit(self.path)
+                if url.path != '/jobs':
+                    self.send_error(404)
+                    return
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                body = search_page(params.get('q', ''), params.get('l', ''), int(params.get('start', 0)),
+                                   site.pages, site.cards).encode()
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                if self.headers.get('If-None-Match') == etag:
+                    with site.lock:
+                        site.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', site.last_modified)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_port}'
+
+    def max_requests_in(self, window):
+        """Most requests received within any window of that many seconds"""
+        times = sorted(t for t, _ in self.requests)
+        best, start = 0, 0
+        for end in range(len(times)):
+            while times[end] - times[start] > window:
+                start += 1
+            best = max(best, end - start + 1)
+        return best
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stand-in job search pages locally')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per response')
+    parser.add_argument('--pages', type=int, default=5, help='result pages per search')
+    parser.add_argument('--cards', type=int, default=10, help='job cards per page')
+    args = parser.parse_args()
+
+    site = StandInSite(args.port, args.latency, args.pages, args.cards)
+    print(f"🌐 Stand-in site on {site.url}/jobs (Ctrl+C to stop)")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        site.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Calibrate the rule-based salary multipliers on the jobs dataset
+Fits the rule table (salary_rules.json) as a log-linear model:
+
+    log(salary) = log(role base) + log(seniority) + log(experience band)
+                  + log(1 + points * skill score) + log(skill count bonus)
+                  + log(education) + log(location) + log(job type)
+
+The CSV is streamed in chunks and reduced to per-cell sufficient
+statistics (count and sum of log salary per combination of levels), so
+memory stays bounded however many postings there are. The fit is a ridge
+regression on the cells that shrinks every level towards its current
+value (levels with no postings keep it); levels at exactly 1.0 are the
+reference levels and stay there. The skill points multiplier is picked
+by a grid search around that closed-form solve.
+
+    python calibrate_salary_rules.py
+    SALARY_RULES_PATH=salary_rules_v2.json python api.py
+"""
+
+import argparse
+import copy
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from datasets import iter_batches
+from realistic_salary_predictor import SKILL_MATCHER
+from salary_features import experience_years
+from salary_rules import DEFAULT_RULES_PATH, KeywordAutomaton
+
+JOBS_DATASET = 'morocco_jobs_dataset.csv'
+CHUNK_ROWS = 200_000
+PRIOR_WEIGHT = 50  # Each level's current value counts as this many postings
+POINTS_GRID = np.round(np.arange(0.0, 0.505, 0.005), 3)
+
+KEYWORD_FACTORS = ['role_base_salaries', 'seniority']
+DICT_FACTORS = {'education': 'education_required', 'location': 'location', 'job_type': 'job_type'}
+FACTORS = KEYWORD_FACTORS + ['experience', 'skill_bonus'] + list(DICT_FACTORS)
+
+
+def prior_levels(table):
+    """Current multiplier of every level, per factor, in design order (default last)"""
+    levels = {}
+    for factor in KEYWORD_FACTORS:
+        levels[factor] = [r['value'] for r in table[factor]['rules']] + [table[factor]['default']]
+    levels['experience'] = list(table['experience']['multipliers'])
+    levels['skill_bonus'] = [b['multiplier'] for b in skill_bonuses(table)] + [1.0]
+    for factor in DICT_FACTORS:
+        levels[factor] = list(table[factor]['values'].values()) + [table[factor]['default']]
+    return levels
+
+
+def skill_bonuses(table):
+    """Count bonuses, highest threshold first (the order they are checked in)"""
+    return sorted(table['skills']['count_bonuses'], key=lambda b: b['min_count'], reverse=True)
+
+
+def encode_chunk(chunk, table, automata):
+    """Level codes, skill score and log salary for every posting with a salary"""
+    salary = pd.to_numeric(chunk['salary'].str.extract(r'(\d+)', expand=False))
+    chunk = chunk[salary > 0]
+    salary = salary[salary > 0]
+
+    codes = {}
+    title_codes, titles = pd.factorize(chunk['job_title'].fillna('').str.lower())
+    for factor in KEYWORD_FACTORS:
+        default = len(table[factor]['rules'])
+        matched = [automata[factor].first_rule(title) for title in titles]
+        codes[factor] = np.array([default if m is None else m for m in matched], dtype=np.int64)[title_codes]
+
+    years = experience_years(chunk['experience_required']).to_numpy()
+    codes['experience'] = np.searchsorted(table['experience']['breakpoints'], years, side='left')
+
+    scores = SKILL_MATCHER.score_column(chunk['skills_required'])
+    count = scores['high_value_count'].to_numpy()
+    bonuses = skill_bonuses(table)
+    codes['skill_bonus'] = np.select(
+        [count >= b['min_count'] for b in bonuses], range(len(bonuses)), default=len(bonuses)
+    )
+
+    for factor, column in DICT_FACTORS.items():
+        lookup = {value: i for i, value in enumerate(table[factor]['values'])}
+        codes[factor] = chunk[column].map(lookup).fillna(len(lookup)).to_numpy(dtype=np.int64)
+
+    log_salary = np.log(salary.to_numpy(dtype=np.float64))
+    return pd.DataFrame({
+        **codes,
+        'skill_score': scores['skill_score'].to_numpy(),
+        'count': 1,
+        'log_salary': log_salary,
+        'log_salary_sq': log_salary ** 2,
+    })
+
+
+def accumulate_cells(path, table, chunk_rows=CHUNK_ROWS):
+    """Stream the CSV and reduce it to per-cell sufficient statistics"""
+    automata = {f: KeywordAutomaton([r['keywords'] for r in table[f]['rules']]) for f in KEYWORD_FACTORS}
+    keys = FACTORS + ['skill_score']
+    columns = ['job_title', 'location', 'salary', 'job_type', 'experience_required',
+               'education_required', 'skills_required']
+
+    cells = None
+    for chunk in iter_batches(path, columns, chunk_rows):
+        reduced = encode_chunk(chunk, table, automata).groupby(keys, sort=False).sum()
+        cells = reduced if cells is None else pd.concat([cells, reduced]).groupby(level=keys, sort=False).sum()
+    if cells is None or cells['count'].sum() == 0:
+        raise ValueError(f"no postings with a salary in {path}")
+    return cells.reset_index()
+
+
+def fit_cells(cells, table, prior_weight=PRIOR_WEIGHT, points_grid=POINTS_GRID):
+    """Ridge fit of the log multipliers on the cells; returns fitted levels and diagnostics"""
+    priors = prior_levels(table)
+    prior = np.log(np.concatenate([priors[f] for f in FACTORS]))
+    offsets = np.cumsum([0] + [len(priors[f]) for f in FACTORS])
+
+    n = cells['count'].to_numpy(dtype=np.float64)
+    y = cells['log_salary'].to_numpy() / n
+    score = cells['skill_score'].to_numpy()
+    design = np.zeros((len(cells), len(prior)))
+    rows = np.arange(len(cells))
+    for factor, offset in zip(FACTORS, offsets):
+        design[rows, offset + cells[factor].to_numpy()] = 1.0
+
+    # Reference levels (exactly 1.0) stay fixed; everything else is shrunk towards its prior
+    free = prior != 0
+    x = design[:, free]
+    gram = x.T @ (n[:, None] * x) + prior_weight * np.eye(free.sum())
+    within_cell = cells['log_salary_sq'].sum() - (n * y ** 2).sum()
+    total = n.sum()
+
+    def rmse(residual):
+        return float(np.sqrt(max(within_cell + (n * residual ** 2).sum(), 0) / total))
+
+    best = None
+    for points in points_grid:
+        target = y - np.log1p(points * score)
+        coef = np.linalg.solve(gram, x.T @ (n * target) + prior_weight * prior[free])
+        error = rmse(target - x @ coef)
+        if best is None or error < best[0]:
+            best = (error, points, coef)
+
+    error, points, coef = best
+    fitted = prior.copy()
+    fitted[free] = coef
+    prior_points = table['skills']['points_multiplier']
+    return {
+        'levels': {f: np.exp(fitted[start:end]) for f, start, end in zip(FACTORS, offsets[:-1], offsets[1:])},
+        'points_multiplier': float(points),
+        'log_rmse': error,
+        'prior_log_rmse': rmse(y - np.log1p(prior_points * score) - design @ prior),
+        'postings': int(total),
+        'cells': len(cells),
+    }
+
+
+def fitted_table(table, fit, source):
+    """A copy of the rule table with the fitted values and a new version"""
+    new = copy.deepcopy(table)
+    levels = {f: [float(v) for v in values] for f, values in fit['levels'].items()}
+
+    for factor in KEYWORD_FACTORS:
+        # Base salaries are MAD amounts; round them like predicted salaries
+        fmt = (lambda v: int(round(v / 100) * 100)) if factor == 'role_base_salaries' else (lambda v: round(v, 3))
+        for rule, value in zip(new[factor]['rules'], levels[factor]):
+            rule['value'] = fmt(value)
+        new[factor]['default'] = fmt(levels[factor][-1])
+    new['experience']['multipliers'] = [round(v, 3) for v in levels['experience']]
+    new['skills']['points_multiplier'] = fit['points_multiplier']
+    for bonus, value in zip(skill_bonuses(new), levels['skill_bonus']):
+        bonus['multiplier'] = round(value, 3)
+    for factor in DICT_FACTORS:
+        values = new[factor]['values']
+        for key, value in zip(values, levels[factor]):
+            values[key] = round(value, 3)
+        new[factor]['default'] = round(levels[factor][-1], 3)
+
+    new['version'] = (table.get('version') or 0) + 1
+    new['calibration'] = {
+        'source': os.path.basename(source),
+        'based_on_version': table.get('version'),
+        'fitted_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'postings': fit['postings'],
+        'cells': fit['cells'],
+        'log_rmse': round(fit['log_rmse'], 4),
+        'prior_log_rmse': round(fit['prior_log_rmse'], 4),
+    }
+    return new
+
+
+def calibrate(source=JOBS_DATASET, rules_path=DEFAULT_RULES_PATH, chunk_rows=CHUNK_ROWS, prior_weight=PRIOR_WEIGHT):
+    """Fit the rule table at rules_path on source; returns the new table"""
+    with open(rules_path, encoding='utf-8') as f:
+        table = json.load(f)
+    cells = accumulate_cells(source, table, chunk_rows)
+    return fitted_table(table, fit_cells(cells, table, prior_weight), source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit the salary rule multipliers on the jobs dataset')
+    parser.add_argument('--source', default=JOBS_DATASET)
+    parser.add_argument('--rules', default=DEFAULT_RULES_PATH, help='rule table to start from')
+    parser.add_argument('--output', default=None, help='default: salary_rules_v<version>.json next to --rules')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--prior-weight', type=float, default=PRIOR_WEIGHT)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = calibrate(args.source, args.rules, args.chunk_rows, args.prior_weight)
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(args.rules)), f"salary_rules_v{table['version']}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+    calibration = table['calibration']
+    print(f"✅ Calibrated on {calibration['postings']:,} postings ({calibration['cells']:,} cells) "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"📉 log-salary RMSE: {calibration['prior_log_rmse']:.4f} -> {calibration['log_rmse']:.4f}")
+    print(f"💾 Saved rules v{table['version']} to: {output}")
+    print(f"   Load it with SALARY_RULES_PATH={output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+"""
+Compaction of tree-ensemble salary models
+Turns a fitted RandomForestRegressor or GradientBoostingRegressor (alone
+or as the last step of a Pipeline) into a CompactEnsemble: every tree
+flattened into shared arrays with int32 children, float32 thresholds
+(split-for-split identical) and float32 leaf values, reading only the
+features the trees actually use. Optionally:
+- trees are truncated at a maximum depth and splits whose smaller child
+  has fewer than min_samples training samples are collapsed
+- trees are dropped greedily by marginal contribution, removing at each
+  step the tree whose absence hurts validation MAE the least
+
+Evaluate a grid of settings and write the chosen one:
+    python compact_model.py --model SalaryModel.pkl --output SalaryModel.compact.pkl --max-depth 5 --keep 0.5
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from datasets import read_dataset
+from salary_features import JOBS_COLUMNS, SalaryFeatures, jobs_frame
+from train import ENCODER_PATH, JOBS_DATASET, MODEL_PATH, load_features
+
+COMPRESS = 3
+
+# Default grid: each entry is one setting of the report
+SETTINGS = [
+    {'name': 'compact float32'},
+    {'name': 'max_depth=5', 'max_depth': 5},
+    {'name': 'max_depth=4', 'max_depth': 4},
+    {'name': 'min_samples=20', 'min_samples': 20},
+    {'name': 'min_samples=50', 'min_samples': 50},
+    {'name': 'keep 50%', 'keep': 0.5},
+    {'name': 'keep 25%', 'keep': 0.25},
+]
+
+
+class CompactEnsemble:
+    """
+    Flat-array tree ensemble; prediction = base + scale * sum of the leaf
+    values (scale is 1 / n_trees for a forest, the learning rate for boosting).
+    Trees are stored one after the other; children[2 * node] is the left
+    child and children[2 * node + 1] the right one. Leaves point to
+    themselves, so every tree is walked in lockstep for depth steps.
+    """
+
+    def __init__(self, roots, children, feature, threshold, value, used_features,
+                 n_features_in, depth, base=0.0, learning_rate=None):
+        self.roots = roots
+        self.children = children
+        self.feature = feature      # index into used_features
+        self.threshold = threshold
+        self.value = value
+        self.used_features = used_features
+        self.n_features_in_ = n_features_in
+        self.depth = depth
+        self.base = base
+        self.learning_rate = learning_rate  # None for an averaged forest
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def fit(self, X, y):
+        # Kept so it can be a Pipeline's last step, which sklearn requires to have fit
+        raise TypeError("CompactEnsemble cannot be trained: build with compact(model)")
+
+    def __sklearn_is_fitted__(self):
+        return True
+
+    def tree_values(self, X):
+        """(n_samples, n_trees) leaf value of every tree"""
+        if isinstance(X, pd.DataFrame):
+            X = X.to_numpy()
+        X = X[:, self.used_features]
+        X = np.ascontiguousarray(X.toarray() if hasattr(X, 'toarray') else X, dtype=np.float32)
+        flat = X.ravel()
+        row_start = (np.arange(len(X), dtype=np.int32) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.depth):
+            go_right = flat.take(row_start + self.feature.take(node)) > self.threshold.take(node)
+            node = self.children.take(2 * node + go_right)
+        return self.value.take(node)
+
+    def combine(self, tree_sum, n_trees):
+        scale = 1.0 / n_trees if self.learning_rate is None else self.learning_rate
+        return self.base + scale * tree_sum
+
+    def predict(self, X):
+        return self.combine(self.tree_values(X).sum(axis=1, dtype=np.float64), self.n_trees)
+
+    def subset(self, trees):
+        """A copy keeping only the given tree indices (their nodes are repacked)"""
+        ends = np.append(self.roots[1:], len(self.value))
+        spans = [np.arange(self.roots[t], ends[t]) for t in trees]
+        nodes = np.concatenate(spans)
+        # New position of every kept node; children move with their tree
+        position = np.full(len(self.value), -1, dtype=np.int32)
+        position[nodes] = np.arange(len(nodes), dtype=np.int32)
+        roots = np.cumsum([0] + [len(span) for span in spans[:-1]]).astype(np.int32)
+        children = position[self.children.reshape(-1, 2)[nodes]].ravel()
+        return CompactEnsemble(roots, children, self.feature[nodes], self.threshold[nodes], self.value[nodes],
+                               self.used_features, self.n_features_in_, self.depth, self.base,
+                               self.learning_rate)
+
+
+def ensemble_trees(model):
+    """(sklearn trees, base, learning_rate) of a supported ensemble"""
+    if isinstance(model, RandomForestRegressor):
+        return list(model.estimators_), 0.0, None
+    if isinstance(model, GradientBoostingRegressor):
+        if model.loss != 'squared_error':
+            raise ValueError(f"only squared_error boosting is supported, got {model.loss}")
+        base = float(np.ravel(model.init_.predict(np.zeros((1, model.n_features_in_))))[0])
+        return list(model.estimators_[:, 0]), base, model.learning_rate
+    raise ValueError(f"cannot compact {type(model).__name__}")
+
+
+def prune_tree(tree, offset=0, max_depth=None, min_samples=1):
+    """
+    Kept nodes of a fitted tree in depth-first order, numbered from offset:
+    (left, right, feature, threshold, value) lists and the pruned depth
+    """
+    t = tree.tree_
+    left, right, feature, threshold = t.children_left, t.children_right, t.feature, t.threshold
+    samples, value = t.n_node_samples, t.value[:, 0, 0]
+
+    out = ([], [], [], [], [])
+    deepest = 0
+    stack = [(0, 0, None)]  # (node, depth, (parent position, is_left))
+    while stack:
+        node, depth, parent = stack.pop()
+        position = offset + len(out[0])
+        if parent is not None:
+            out[0 if parent[1] else 1][parent[0] - offset] = position
+        is_leaf = (
+            left[node] < 0
+            or (max_depth is not None and depth >= max_depth)
+            or min(samples[left[node]], samples[right[node]]) < min_samples
+        )
+        out[0].append(position)
+        out[1].append(position)
+        out[2].append(-1 if is_leaf else feature[node])
+        out[3].append(0.0 if is_leaf else threshold[node])
+        out[4].append(value[node])
+        deepest = max(deepest, depth)
+        if not is_leaf:
+            stack.append((right[node], depth + 1, (position, False)))
+            stack.append((left[node], depth + 1, (position, True)))
+    return out, deepest
+
+
+def float32_thresholds(threshold):
+    """
+    Largest float32 <= each float64 threshold. Trees compare float32 inputs,
+    so x <= float32 threshold gives exactly the same split as in float64.
+    """
+    rounded = threshold.astype(np.float32)
+    return np.where(rounded > threshold, np.nextafter(rounded, np.float32(-np.inf)), rounded)
+
+
+def compact(model, max_depth=None, min_samples=1):
+    """CompactEnsemble of a fitted forest or boosting regressor"""
+    trees, base, learning_rate = ensemble_trees(model)
+    roots, parts, depth = [], [[], [], [], [], []], 0
+    for tree in trees:
+        roots.append(len(parts[0]))
+        pruned, tree_depth = prune_tree(tree, roots[-1], max_depth, min_samples)
+        for part, values in zip(parts, pruned):
+            part.extend(values)
+        depth = max(depth, tree_depth)
+
+    # Keep only the columns some split uses; leaves read column 0 and ignore it
+    feature = np.array(parts[2], dtype=np.int64)
+    used_features = np.unique(feature[feature >= 0])
+    feature = np.where(feature >= 0, np.searchsorted(used_features, feature), 0)
+    if len(used_features) == 0:
+        used_features = np.zeros(1, dtype=np.int64)
+    return CompactEnsemble(
+        roots=np.array(roots, dtype=np.int32),
+        children=np.column_stack([parts[0], parts[1]]).astype(np.int32).ravel(),
+        feature=feature.astype(np.int32),
+        threshold=float32_thresholds(np.array(parts[3])),
+        value=np.array(parts[4], dtype=np.float32),
+        used_features=used_features.astype(np.int32),
+        n_features_in=model.n_features_in_,
+        depth=depth,
+        base=base,
+        learning_rate=learning_rate,
+    )
+
+
+def drop_trees(ensemble, X, y, keep):
+    """Greedily drop the trees contributing least to validation MAE until a fraction keep remains"""
+    target = max(1, int(round(ensemble.n_trees * keep)))
+    values = ensemble.tree_values(X).T.astype(np.float64)  # (trees, samples)
+    y = np.asarray(y, dtype=np.float64)
+    kept = list(range(ensemble.n_trees))
+    total = values.sum(axis=0)
+    while len(kept) > target:
+        # MAE of the ensemble without each remaining tree, all at once
+        without = ensemble.combine(total[None, :] - values[kept], len(kept) - 1)
+        drop = int(np.argmin(np.abs(without - y).mean(axis=1)))
+        total -= values[kept[drop]]
+        kept.pop(drop)
+    return ensemble.subset(np.array(sorted(kept)))
+
+
+def compact_model(model, X_select=None, y_select=None, max_depth=None, min_samples=1, keep=1.0):
+    """Compact a model (or the last step of a Pipeline) with one setting"""
+    if isinstance(model, Pipeline):
+        head = model[:-1]
+        X_select = head.transform(X_select) if X_select is not None else None
+        last = compact_model(model[-1], X_select, y_select, max_depth, min_samples, keep)
+        return Pipeline(head.steps + [(model.steps[-1][0], last)])
+
+    ensemble = compact(model, max_depth, min_samples)
+    if keep < 1.0:
+        ensemble = drop_trees(ensemble, X_select, y_select, keep)
+    return ensemble
+
+
+# ===== EVALUATION DATA =====
+# Rows of the jobs dataset in the layout the model was trained on
+
+def evaluation_data(model, source=JOBS_DATASET, encoder_path=ENCODER_PATH, features=None):
+    """(X, y) holdout in the model's input layout: train.py's 20% test split"""
+    if isinstance(model, Pipeline) and len(model.feature_names_in_) == 14:
+        # The API's layout, built by the feature state saved with the model
+        df = jobs_frame(read_dataset(source, JOBS_COLUMNS))
+        X = (features or SalaryFeatures()).transform(df)[list(model.feature_names_in_)]
+    elif isinstance(model, Pipeline):
+        df = load_features(source)[0]
+        X = df[list(model.feature_names_in_)]
+    else:
+        df = load_features(source)[0]
+        le = joblib.load(encoder_path)
+        df['job_title_encoded'] = le.transform(df['job_title'])
+        X = df[['job_title_encoded', 'num_skills', 'experience_years']]
+    _, X_test, _, y_test = train_test_split(X, df['salary'], test_size=0.2, random_state=42)
+    return X_test, y_test.to_numpy()
+
+
+# ===== REPORT =====
+def measure(model, X_report, y_report, reference, repeats=5):
+    """Artifact size, load time, predict latency and accuracy of one model"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.pkl')
+        joblib.dump(model, path, compress=COMPRESS)
+        size = os.path.getsize(path)
+        load_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            joblib.load(path)
+            load_times.append(time.perf_counter() - start)
+
+    single = X_report[:1]
+    latencies = []
+    for _ in range(50):
+        start = time.perf_counter()
+        model.predict(single)
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    predictions = model.predict(X_report)
+    batch = time.perf_counter() - start
+
+    return {
+        'size_kb': round(size / 1024, 1),
+        'load_ms': round(np.median(load_times) * 1000, 2),
+        'predict_1_ms': round(np.median(latencies) * 1000, 3),
+        'predict_batch_ms': round(batch * 1000, 2),
+        'mae': round(float(np.abs(predictions - y_report).mean()), 1),
+        'max_drift': round(float(np.abs(predictions - reference).max()), 1),
+    }
+
+
+def compaction_report(model, X, y, settings=SETTINGS):
+    """Measure the original model and every setting on a holdout split in two"""
+    X_select, X_report, y_select, y_report = train_test_split(X, y, test_size=0.5, random_state=0)
+    reference = model.predict(X_report)
+    rows = [{'setting': 'original', **measure(model, X_report, y_report, reference)}]
+    for setting in settings:
+        compacted = compact_model(model, X_select, y_select, setting.get('max_depth'),
+                                  setting.get('min_samples', 1), setting.get('keep', 1.0))
+        rows.append({'setting': setting['name'], **measure(compacted, X_report, y_report, reference)})
+    for row in rows:
+        row['mae_delta'] = round(row['mae'] - rows[0]['mae'], 1)
+    return rows, (X_select, y_select)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact a tree-ensemble salary model')
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--source', default=JOBS_DATASET, help='dataset for the holdout')
+    parser.add_argument('--encoder', default=ENCODER_PATH, help='job title encoder (train.py models)')
+    parser.add_argument('--output', default=None, help='write the model compacted with the settings below')
+    parser.add_argument('--max-depth', type=int, default=None)
+    parser.add_argument('--min-samples', type=int, default=1)
+    parser.add_argument('--keep', type=float, default=1.0, help='fraction of trees to keep')
+    parser.add_argument('--report', default=None, help='also write the report as JSON')
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    X, y = evaluation_data(model, args.source, args.encoder, SalaryFeatures.for_model(args.model))
+    settings = SETTINGS + ([{'name': 'chosen', 'max_depth': args.max_depth, 'min_samples': args.min_samples,
+                             'keep': args.keep}] if args.output else [])
+    rows, (X_select, y_select) = compaction_report(model, X, y, settings)
+
+    print(f"📦 Compaction report for {args.model} ({len(y) // 2:,} report rows)")
+    columns = ['setting', 'size_kb', 'load_ms', 'predict_1_ms', 'predict_batch_ms', 'mae', 'mae_delta', 'max_drift']
+    print('  '.join(f'{c:>16}' for c in columns))
+    for row in rows:
+        print('  '.join(f'{row[c]:>16}' for c in columns))
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(rows, f, indent=2)
+    if args.output:
+        compacted = compact_model(model, X_select, y_select, args.max_depth, args.min_samples, args.keep)
+        joblib.dump(compacted, args.output, compress=COMPRESS)
+        print(f"💾 Saved to: {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
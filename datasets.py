@@ -0,0 +1,308 @@
+"""
+Dataset storage: CSV or columnar Parquet
+The jobs and houses datasets can be stored as Parquet next to the CSVs.
+Low-cardinality text columns are dictionary encoded (pandas categoricals),
+files are zstd compressed, and a dataset can be partitioned into a
+directory of files by a column. Readers go through read_dataset /
+iter_batches with the CSV path they always used: the Parquet copy
+(<name>.parquet, a file or a partitioned directory) is picked when it is
+at least as new as the CSV, and only the requested columns are read,
+from memory-mapped files. Producers write through RecordSink, which
+streams records to either format in fixed-size chunks.
+
+    python datasets.py convert morocco_jobs_dataset.csv
+    python datasets.py convert morocco_houses_dataset.csv --partition-by city
+"""
+
+import argparse
+import os
+import shutil
+import time
+from collections import Counter
+
+import pandas as pd
+
+# Text columns with at most this many distinct values per row are stored as categoricals
+CATEGORY_MAX_RATIO = 0.5
+COMPRESSION = 'zstd'
+SINK_CHUNK_ROWS = 50_000
+SCHEMA_TYPES = ('string', 'category', 'int64', 'float64')
+
+
+def parquet_path(path):
+    """morocco_jobs_dataset.csv -> morocco_jobs_dataset.parquet"""
+    return os.path.splitext(path)[0] + '.parquet'
+
+
+def is_parquet(path):
+    return path.endswith('.parquet') or os.path.isdir(path)
+
+
+def resolve(path):
+    """The storage to read for a dataset path: its Parquet copy when that is at least as new"""
+    if is_parquet(path):
+        return path
+    candidate = parquet_path(path)
+    if os.path.exists(candidate) and (not os.path.exists(path) or os.path.getmtime(candidate) >= os.path.getmtime(path)):
+        return candidate
+    return path
+
+
+def _parquet_dataset(path):
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+    return ds.dataset(path, format='parquet', partitioning='hive', filesystem=fs.LocalFileSystem(use_mmap=True))
+
+
+def read_dataset(path, columns=None, dtype=None):
+    """
+    A dataset as a DataFrame, restricted to columns. dtype applies to
+    CSV reads; Parquet columns keep their stored types (dictionary
+    columns come back as categoricals).
+    """
+    path = resolve(path)
+    if is_parquet(path):
+        return _parquet_dataset(path).to_table(columns=columns).to_pandas()
+    return pd.read_csv(path, usecols=columns, dtype=dtype, encoding='utf-8-sig')
+
+
+def iter_batches(path, columns=None, batch_rows=250_000, dtype=None):
+    """A dataset as DataFrames of at most batch_rows rows, read one at a time"""
+    path = resolve(path)
+    if is_parquet(path):
+        for batch in _parquet_dataset(path).to_batches(columns=columns, batch_size=batch_rows):
+            if batch.num_rows:
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, dtype=dtype, chunksize=batch_rows, encoding='utf-8-sig')
+
+
+def categorize(df, max_ratio=CATEGORY_MAX_RATIO):
+    """Low-cardinality text columns as categoricals (stored dictionary encoded)"""
+    df = df.copy()
+    for column in df.columns:
+        series = df[column]
+        if (pd.api.types.is_string_dtype(series) or series.dtype == object) and \
+                series.nunique() <= max_ratio * len(series):
+            df[column] = series.astype('category')
+    return df
+
+
+def write_parquet(df, path, partition_by=None):
+    """Write df as Parquet: one file, or a directory partitioned by a column (replaced if it exists)"""
+    df = categorize(df)
+    _remove(path)
+    partition_cols = [partition_by] if partition_by else None
+    df.to_parquet(path, index=False, compression=COMPRESSION, partition_cols=partition_cols)
+    return path
+
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def arrow_schema(schema):
+    """{column: 'string' | 'category' | 'int64' | 'float64'} -> pyarrow schema (categories dictionary encoded)"""
+    import pyarrow as pa
+    types = {'string': pa.string(), 'category': pa.dictionary(pa.int32(), pa.string()),
+             'int64': pa.int64(), 'float64': pa.float64()}
+    unknown = {column: kind for column, kind in schema.items() if kind not in types}
+    if unknown:
+        raise ValueError(f"unknown schema types {unknown} (use {', '.join(SCHEMA_TYPES)})")
+    return pa.schema([(column, types[kind]) for column, kind in schema.items()])
+
+
+class RecordSink:
+    """
+    Streams records (dicts) to a dataset in chunks of chunk_rows, so memory
+    stays flat however many records a producer emits:
+    - every record must have exactly the schema's columns, and every chunk
+      is cast to the schema's types (ValueError otherwise)
+    - .parquet paths get one zstd file (one row group per chunk), or a
+      hive directory with partition_by; other paths get a CSV
+    - the dataset is written to <path>.partial and moved into place on
+      close, so an interrupted run leaves the previous one untouched
+    - path None keeps the chunks in memory (frame())
+    Row counts, value counts of count_by columns and min/max/mean of
+    numeric columns are kept for summary().
+    """
+
+    def __init__(self, path, schema, chunk_rows=SINK_CHUNK_ROWS, partition_by=None, count_by=()):
+        if partition_by and (partition_by not in schema or path is None or not is_parquet(path)):
+            raise ValueError("partition_by must be a schema column of a .parquet dataset")
+        self.path = path
+        self.schema = dict(schema)
+        self.arrow_schema = arrow_schema(self.schema)
+        self.columns = list(self.schema)
+        self.column_set = set(self.schema)
+        self.chunk_rows = chunk_rows
+        self.partition_by = partition_by
+        self.counts = {column: Counter() for column in count_by}
+        self.numeric = {column: [float('inf'), float('-inf'), 0.0]
+                        for column, kind in self.schema.items() if kind in ('int64', 'float64')}
+        self.buffer = []
+        self.written = 0
+        self.chunks = 0
+        self.frames = []
+        self.partial = None if path is None else path + '.partial'
+        self._csv = None
+        self._parquet = None
+        if self.partial:
+            _remove(self.partial)
+
+    @property
+    def rows(self):
+        return self.written + len(self.buffer)
+
+    def write(self, record):
+        if record.keys() != self.column_set:
+            missing = sorted(self.column_set - record.keys())
+            unexpected = sorted(record.keys() - self.column_set)
+            raise ValueError(f"record does not match the schema (missing {missing}, unexpected {unexpected})")
+        self.buffer.append(record)
+        if len(self.buffer) >= self.chunk_rows:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write the buffered records as one chunk"""
+        if not self.buffer:
+            return
+        import pyarrow as pa
+        df = pd.DataFrame.from_records(self.buffer, columns=self.columns)
+        try:
+            table = pa.Table.from_pandas(df, schema=self.arrow_schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(f"chunk {self.chunks} does not match the schema: {e}") from e
+
+        for column, counts in self.counts.items():
+            counts.update(df[column].value_counts(dropna=False).to_dict())
+        for column, stats in self.numeric.items():
+            values = df[column]
+            stats[0] = min(stats[0], values.min())
+            stats[1] = max(stats[1], values.max())
+            stats[2] += values.sum()
+
+        self._write_chunk(df, table)
+        self.written += len(df)
+        self.chunks += 1
+        self.buffer = []
+
+    def _write_chunk(self, df, table):
+        import pyarrow.parquet as pq
+        if self.path is None:
+            self.frames.append(table.to_pandas())
+        elif not is_parquet(self.path):
+            if self._csv is None:
+                self._csv = open(self.partial, 'w', encoding='utf-8-sig', newline='')
+            df.to_csv(self._csv, header=self.chunks == 0, index=False)
+        elif self.partition_by:
+            pq.write_to_dataset(table, self.partial, partition_cols=[self.partition_by], compression=COMPRESSION,
+                                basename_template=f'chunk-{self.chunks:05d}-{{i}}.parquet')
+        else:
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.partial, table.schema, compression=COMPRESSION)
+            self._parquet.write_table(table)
+
+    def close(self):
+        """Flush, finish the file and move it into place; returns self"""
+        self.flush()
+        if self.path is not None:
+            if self._csv is not None:
+                self._csv.close()
+            elif self._parquet is not None:
+                self._parquet.close()
+            elif self.written == 0:
+                self._write_empty()
+            _remove(self.path)
+            os.replace(self.partial, self.path)
+        return self
+
+    def _write_empty(self):
+        import pyarrow.parquet as pq
+        if not is_parquet(self.path):
+            pd.DataFrame(columns=self.columns).to_csv(self.partial, index=False, encoding='utf-8-sig')
+        elif self.partition_by:
+            os.makedirs(self.partial)
+        else:
+            pq.write_table(self.arrow_schema.empty_table(), self.partial, compression=COMPRESSION)
+
+    def abort(self):
+        """Drop the partial output; the previous dataset at path is kept"""
+        for handle in (self._csv, self._parquet):
+            if handle is not None:
+                handle.close()
+        if self.partial:
+            _remove(self.partial)
+
+    def frame(self):
+        """In-memory sinks: everything written so far as one DataFrame"""
+        self.flush()
+        if not self.frames:
+            return self.arrow_schema.empty_table().to_pandas()
+        return pd.concat(self.frames, ignore_index=True)
+
+    def stats(self, column):
+        low, high, total = self.numeric[column]
+        return {'min': low, 'max': high, 'mean': total / self.written if self.written else float('nan')}
+
+    def summary(self):
+        where = self.path or 'memory'
+        size = f", {storage_size(self.path) / 1024:,.0f} KB" if self.path and os.path.exists(self.path) else ''
+        print(f"💾 {where}: {self.written:,} rows in {self.chunks} chunks of up to {self.chunk_rows:,}{size}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def storage_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+    return os.path.getsize(path)
+
+
+def convert(csv_path, output=None, partition_by=None):
+    """CSV dataset -> Parquet; prints sizes and load times of both"""
+    output = output or parquet_path(csv_path)
+    df = pd.read_csv(csv_path, encoding='utf-8-sig')
+    write_parquet(df, output, partition_by)
+
+    # read_dataset(csv_path) would now resolve to the new Parquet copy
+    timings = {}
+    for label, read in (('csv', lambda: pd.read_csv(csv_path, encoding='utf-8-sig')),
+                        ('parquet', lambda: read_dataset(output))):
+        start = time.perf_counter()
+        read()
+        timings[label] = time.perf_counter() - start
+    print(f"✅ {csv_path} -> {output} ({len(df):,} rows)")
+    print(f"   size {storage_size(csv_path) / 1024:,.0f} KB -> {storage_size(output) / 1024:,.0f} KB, "
+          f"load {timings['csv'] * 1000:,.1f} ms -> {timings['parquet'] * 1000:,.1f} ms")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert datasets between CSV and Parquet')
+    sub = parser.add_subparsers(dest='command', required=True)
+    conv = sub.add_parser('convert', help='write a Parquet copy of a CSV dataset')
+    conv.add_argument('csv', nargs='+')
+    conv.add_argument('--partition-by', default=None, help='write a directory with one partition per value')
+    args = parser.parse_args()
+
+    for csv_path in args.csv:
+        convert(csv_path, partition_by=args.partition_by)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+HTML extraction engines for the scrapers
+An engine turns a fetched page into plain field dicts, with no requests
+and no randomness, so pages can be parsed in worker processes while the
+fetcher's threads keep downloading. Selectors are declared once in
+SELECTORS (tag names and class substrings, matched case-insensitively)
+and compiled by each engine when it is created:
+- lxml: libxml2 parser, one pass over each card's elements (default when installed)
+- soup: BeautifulSoup html.parser with precompiled class regexes
+"""
+
+import functools
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# (tag names, class substrings): the first matching descendant of a card
+SELECTORS = {
+    'indeed_card': (('div', 'a'), ('job', 'result', 'card')),
+    'title': (('h2', 'a', 'span'), ('jobTitle', 'title')),
+    'company': (('span', 'div', 'a'), ('company',)),
+    'location': (('div', 'span'), ('location', 'companyLocation')),
+    'salary': (('div', 'span'), ('salary', 'estimated')),
+    'description': (('div', 'span'), ('snippet', 'description', 'summary')),
+    'property_card': (('div', 'article'), ('property', 'listing', 'annonce', 'bien')),
+}
+CARD_FIELDS = ('title', 'company', 'location', 'salary', 'description')
+DEFAULT_ENGINE = 'lxml' if LXML_AVAILABLE else 'soup'
+
+
+class SoupEngine:
+    """BeautifulSoup on html.parser; the scrapers' original matching rules"""
+
+    name = 'soup'
+
+    def __init__(self):
+        self.selectors = {key: (list(tags), re.compile('|'.join(words), re.I))
+                          for key, (tags, words) in SELECTORS.items()}
+
+    def _find_all(self, node, key):
+        tags, pattern = self.selectors[key]
+        return node.find_all(tags, class_=pattern)
+
+    def _text(self, node, key):
+        tags, pattern = self.selectors[key]
+        found = node.find(tags, class_=pattern)
+        return found.get_text(strip=True) if found else None
+
+    def indeed_cards(self, html):
+        """Field dicts of an Indeed results page (None where a field is missing)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        return [{field: self._text(card, field) for field in CARD_FIELDS}
+                for card in self._find_all(soup, 'indeed_card')]
+
+    def property_page(self, html):
+        """(page title, text of each property listing element)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        title = soup.title.string if soup.title else None
+        return title, [card.get_text(strip=True) for card in self._find_all(soup, 'property_card')]
+
+
+class LxmlEngine:
+    """
+    lxml.html; same matches as SoupEngine. A card's fields are found in a
+    single walk over its elements, lowercasing each class attribute once,
+    instead of one tree search per field.
+    """
+
+    name = 'lxml'
+
+    def __init__(self):
+        self.selectors = {key: (frozenset(tags), tuple(word.lower() for word in words))
+                          for key, (tags, words) in SELECTORS.items()}
+        self.card_tags = sorted(set().union(*(self.selectors[field][0] for field in CARD_FIELDS)))
+        # get_text skips script and style contents
+        self.text = etree.XPath('descendant-or-self::text()[not(parent::script) and not(parent::style)]')
+        self.title = etree.XPath('//title[1]')
+
+    def _find_all(self, root, key):
+        tags, words = self.selectors[key]
+        return [node for node in root.iter(*tags)
+                if any(word in node.get('class', '').lower() for word in words)]
+
+    @staticmethod
+    def _document(html):
+        if isinstance(html, bytes):
+            try:
+                html = html.decode('utf-8')
+            except UnicodeDecodeError:
+                pass  # let libxml2 use the page's declared charset
+        try:
+            return lxml.html.document_fromstring(html)
+        except ValueError:  # str with an XML encoding declaration
+            return lxml.html.document_fromstring(html.encode('utf-8'))
+        except etree.ParserError:  # empty document
+            return None
+
+    def _strip_text(self, node):
+        return ''.join(s.strip() for s in self.text(node))
+
+    def _card(self, card):
+        found = dict.fromkeys(CARD_FIELDS)
+        missing = list(CARD_FIELDS)
+        for node in card.iterdescendants(*self.card_tags):
+            classes = node.get('class')
+            if not classes:
+                continue
+            classes = classes.lower()
+            for field in tuple(missing):
+                tags, words = self.selectors[field]
+                if node.tag in tags and any(word in classes for word in words):
+                    found[field] = self._strip_text(node)
+                    missing.remove(field)
+            if not missing:
+                break
+        return found
+
+    def indeed_cards(self, html):
+        """Field dicts of an Indeed results page (None where a field is missing)"""
+        root = self._document(html)
+        if root is None:
+            return []
+        return [self._card(card) for card in self._find_all(root, 'indeed_card')]
+
+    def property_page(self, html):
+        """(page title, text of each property listing element)"""
+        root = self._document(html)
+        if root is None:
+            return None, []
+        title = self.title(root)
+        title = ''.join(self.text(title[0])) if title else None
+        return title, [self._strip_text(card) for card in self._find_all(root, 'property_card')]
+
+
+ENGINES = {'soup': SoupEngine}
+if LXML_AVAILABLE:
+    ENGINES['lxml'] = LxmlEngine
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine(name=DEFAULT_ENGINE):
+    """One engine instance per name and process, selectors compiled once"""
+    if name not in ENGINES:
+        raise ValueError(f"unknown extraction engine {name!r} (available: {', '.join(sorted(ENGINES))})")
+    return ENGINES[name]()
+
+
+def extract(engine, method, html):
+    """Run an engine method; the unit of work sent to parse processes"""
+    return getattr(get_engine(engine), method)(html)
+
+
+class ExtractionPool:
+    """
+    Parses pages on `workers` processes, or inline in the calling thread
+    when workers is 0. submit returns a Future either way, so callers can
+    wait on fetches and parses together.
+    """
+
+    def __init__(self, engine=DEFAULT_ENGINE, workers=0):
+        get_engine(engine)  # fail fast on an unknown name
+        self.engine = engine
+        self.workers = workers
+        # spawn: the fetcher's threads are running, so don't fork
+        self.pool = ProcessPoolExecutor(workers, mp_context=get_context('spawn')) if workers else None
+
+    def run(self, method, html):
+        return extract(self.engine, method, html)
+
+    def submit(self, method, html):
+        if self.pool:
+            return self.pool.submit(extract, self.engine, method, html)
+        future = Future()
+        try:
+            future.set_result(self.run(method, html))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def add_extraction_arguments(parser):
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE, help='HTML extraction engine')
+    parser.add_argument('--parse-workers', type=int, default=0, help='parse processes (0: parse in the fetching process)')
+
+
+def extractor_from_args(args):
+    return ExtractionPool(args.engine, args.parse_workers)
@@ -0,0 +1,294 @@
+"""
+Concurrent HTTP fetching for the scrapers
+One pooled requests.Session (keep-alive connections) is shared by a
+bounded thread pool. Every request, retries included, first takes a
+token from its host's token bucket. However many requests are in flight,
+each site sees at most `rate` requests per second on average, in bursts
+of at most `burst`. 429, 5xx and connection errors are retried with
+backoff (or the server's Retry-After) by Fetcher.get, not by urllib3, so
+a retry cannot skip the bucket.
+
+With a ResponseCache, successful responses are kept on disk:
+- a page younger than the TTL is served without touching the network
+- an older page is revalidated with If-None-Match / If-Modified-Since,
+  and a 304 reuses the stored body
+- offline mode serves only from the cache (CacheMiss otherwise), so
+  extraction can be re-run after a parser fix without refetching
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CACHE_DIR = '.http_cache'
+CACHE_TTL = 24 * 3600  # seconds before a cached page is revalidated
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 1.0  # requests per second, per host
+DEFAULT_BURST = 2
+TIMEOUT = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_BACKOFF = 1.0  # seconds before the first retry, doubled after each
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at rate tokens per second, holding
+    at most burst. acquire reserves the next token and sleeps until it is
+    due, so waiting threads are served in order without polling.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, blocking until one is available; returns the seconds waited"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+def retry_after(response):
+    """Seconds a Retry-After header asks to wait (delay or HTTP date), or None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CacheMiss(requests.RequestException):
+    """Offline mode and the URL is not in the cache"""
+
+
+class CachedResponse:
+    """The parts of a requests.Response the scrapers use, served from the cache"""
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.from_cache = True
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+
+def _atomic_write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of successful GET responses:
+        entries/<sha256(url)>.json   url, validators, fetch time, body hash
+        bodies/<ab>/<sha256(body)>   the body, stored once however many URLs share it
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttl=CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _entry_path(self, url):
+        return os.path.join(self.directory, 'entries', hashlib.sha256(url.encode()).hexdigest() + '.json')
+
+    def _body_path(self, digest):
+        return os.path.join(self.directory, 'bodies', digest[:2], digest)
+
+    def lookup(self, url):
+        """The stored entry for url, or None"""
+        try:
+            with open(self._entry_path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def response(self, entry):
+        with open(self._body_path(entry['body']), 'rb') as f:
+            return CachedResponse(entry['url'], entry['status'], entry['headers'], f.read())
+
+    def store(self, url, response):
+        digest = hashlib.sha256(response.content).hexdigest()
+        if not os.path.exists(self._body_path(digest)):
+            _atomic_write(self._body_path(digest), response.content)
+        kept = {k: v for k, v in response.headers.items() if k.lower() in ('etag', 'last-modified', 'content-type')}
+        self._write_entry({'url': url, 'status': response.status_code, 'headers': kept,
+                           'body': digest, 'fetched_at': time.time()})
+
+    def touch(self, entry):
+        """Mark a revalidated entry as fresh again"""
+        self._write_entry({**entry, 'fetched_at': time.time()})
+
+    def _write_entry(self, entry):
+        _atomic_write(self._entry_path(entry['url']), json.dumps(entry).encode())
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for a stored entry"""
+        headers = {k.lower(): v for k, v in entry['headers'].items()}
+        conditional = {}
+        if 'etag' in headers:
+            conditional['If-None-Match'] = headers['etag']
+        if 'last-modified' in headers:
+            conditional['If-Modified-Since'] = headers['last-modified']
+        return conditional
+
+
+class Fetcher:
+    """Rate-limited, pooled, concurrent GETs; use as a context manager or call close()"""
+
+    def __init__(self, headers=None, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 timeout=TIMEOUT, retries=2, cache=None, offline=False):
+        if offline and cache is None:
+            raise ValueError("offline mode needs a cache")
+        self.workers = workers
+        self.cache = cache
+        self.offline = offline
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+        self.retries = retries
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        # One keep-alive connection per worker and host; no urllib3 retries (see _send)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=workers, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch')
+        self.buckets = {}
+        self.buckets_lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc
+        with self.buckets_lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+            return self.buckets[host]
+
+    def _send(self, url, **kwargs):
+        """
+        session.get, retried up to self.retries times on RETRY_STATUSES and
+        connection errors. Every attempt takes a token from the host's
+        bucket, and waits Retry-After or the backoff first.
+        """
+        for attempt in range(self.retries + 1):
+            self.bucket(url).acquire()
+            try:
+                response = self.session.get(url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                delay = None
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                delay = retry_after(response)
+                response.close()
+            time.sleep(RETRY_BACKOFF * 2 ** attempt if delay is None else delay)
+
+    def _cached(self, entry):
+        """The stored response of an entry, or None when its body file is gone (a miss)"""
+        try:
+            return self.cache.response(entry)
+        except OSError:
+            return None
+
+    def get(self, url, **kwargs):
+        """
+        One GET in the calling thread: from the cache when it is fresh (or
+        offline), otherwise over the network once the host's rate limit
+        allows it (retries included), revalidating a stale cached copy. An
+        entry whose body file is gone counts as a miss.
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        cached = self._cached(entry) if entry is not None else None
+        if cached is not None and (self.offline or self.cache.is_fresh(entry)):
+            return cached
+        if self.offline:
+            raise CacheMiss(f"not cached: {url}")
+
+        headers = {**kwargs.pop('headers', {}), **(self.cache.validators(entry) if cached is not None else {})}
+        response = self._send(url, headers=headers, **kwargs)
+        if cached is not None and response.status_code == 304:
+            self.cache.touch(entry)
+            return cached
+        response.from_cache = False
+        if self.cache and response.status_code == 200:
+            self.cache.store(url, response)
+        return response
+
+    def submit(self, url, **kwargs):
+        """A future for get(url) on the pool"""
+        return self.pool.submit(self.get, url, **kwargs)
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def add_fetch_arguments(parser):
+    """The scrapers' shared fetch and cache options"""
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='concurrent requests')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='requests per second per host')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST)
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='on-disk response cache')
+    parser.add_argument('--no-cache', action='store_true', help='always fetch, store nothing')
+    parser.add_argument('--ttl', type=float, default=CACHE_TTL / 3600, help='hours before a cached page is revalidated')
+    parser.add_argument('--offline', action='store_true', help='replay cached pages only, no network')
+
+
+def fetcher_from_args(headers, args):
+    """A Fetcher configured by add_fetch_arguments options"""
+    if args.offline and args.no_cache:
+        raise SystemExit("❌ --offline replays the cache and cannot be combined with --no-cache")
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, args.ttl * 3600)
+    if cache:
+        print(f"🗄️  Response cache: {args.cache_dir} ({'offline replay' if args.offline else f'TTL {args.ttl:g}h'})")
+    return Fetcher(headers, args.workers, args.rate, args.burst, cache=cache, offline=args.offline)
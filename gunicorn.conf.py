@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for the Career2Life API
+Workers x inference threads should not exceed the host core count,
+otherwise BLAS/OpenMP threads inside model.predict oversubscribe the CPU.
+See benchmarks/benchmark_serving.py for the workers x threads matrix.
+"""
+
+import os
+
+cpu_count = os.cpu_count() or 1
+
+# Single worker by default (small Render instances); set WEB_CONCURRENCY to scale out
+workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+
+# Request threads per worker (gthread). Predict calls are CPU bound, so extra
+# request threads only help while INFERENCE_POOL_SIZE caps concurrent predicts.
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+
+# api.py reads these in each worker to size its BLAS/OpenMP thread pools
+os.environ['WEB_CONCURRENCY'] = str(workers)
+os.environ.setdefault('INFERENCE_THREADS', str(max(1, cpu_count // workers)))
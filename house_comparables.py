@@ -0,0 +1,61 @@
+"""
+Comparable listings search for the Morocco houses dataset
+Builds one KD-tree per (city, transaction) partition over scaled
+surface, rooms, bathrooms, age and floor, so a lookup only touches the
+listings that could actually be comparable.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from datasets import read_dataset
+from house_features import normalize_label
+
+FEATURES = ['surface', 'rooms', 'bathrooms', 'age', 'floor']
+RESULT_COLUMNS = ['reference', 'type', 'transaction', 'price', 'surface', 'price_per_sqm',
+                  'rooms', 'bathrooms', 'floor', 'city', 'neighborhood', 'condition', 'age']
+
+
+class ComparablesIndex:
+    def __init__(self, df):
+        self.listings = df[RESULT_COLUMNS].reset_index(drop=True)
+        self.records = self.listings.to_dict('records')  # plain dicts keep lookups off pandas
+
+        values = self.listings[FEATURES].to_numpy(dtype=float)
+        self.mean = values.mean(axis=0)
+        self.scale = values.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        scaled = (values - self.mean) / self.scale
+
+        keys = pd.DataFrame({
+            'city': self.listings['city'].map(normalize_label),
+            'transaction': self.listings['transaction'].map(normalize_label)
+        })
+
+        # partition key -> (tree, row ids into self.listings)
+        self.partitions = {
+            key: (KDTree(scaled[rows]), rows)
+            for key, rows in keys.groupby(['city', 'transaction']).indices.items()
+        }
+
+    @classmethod
+    def from_csv(cls, path='morocco_houses_dataset.csv'):
+        """Build the index from the houses dataset (CSV or its Parquet copy)"""
+        return cls(read_dataset(path))
+
+    def query(self, city, transaction, surface, rooms, bathrooms, age, floor, k=5):
+        """Return the k nearest listings in the same city and transaction type"""
+        key = (normalize_label(city), normalize_label(transaction))
+        if key not in self.partitions:
+            return []
+
+        tree, rows = self.partitions[key]
+        point = (np.array([[surface, rooms, bathrooms, age, floor]], dtype=float) - self.mean) / self.scale
+        k = min(int(k), len(rows))
+        distances, positions = tree.query(point, k=k)
+
+        return [
+            {**self.records[row], 'distance': round(float(distance), 4)}
+            for row, distance in zip(rows[positions[0]], distances[0])
+        ]
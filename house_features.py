@@ -0,0 +1,90 @@
+"""
+House model features, shared by training (train_all.py) and serving (api.py)
+The house model takes 10 integer-coded columns, in DATASET_COLUMNS order.
+house_row builds them from one request payload; HouseFeatures.transform
+builds them from dataset rows with the same label maps, so a model
+trained on the dataset is served the codes it was trained on.
+
+Labels are matched after lowercasing and stripping accents ('Fès' and
+'fes' get the same code). Neighborhoods are hashed into 100 buckets with
+CRC32, which, unlike hash(), is the same in every process.
+"""
+
+import unicodedata
+import zlib
+
+import numpy as np
+
+# Houses dataset column of each request payload field, in model column order
+DATASET_COLUMNS = {'property_type': 'type', 'transaction': 'transaction', 'surface': 'surface', 'rooms': 'rooms',
+                   'bathrooms': 'bathrooms', 'floor': 'floor', 'city': 'city', 'neighborhood': 'neighborhood',
+                   'condition': 'condition', 'age': 'age'}
+NEIGHBORHOOD_BUCKETS = 100
+
+# Encode categorical features
+PROPERTY_TYPE_MAP = {'appartement': 0, 'duplex': 1, 'maison': 2, 'riad': 3, 'studio': 4, 'villa': 5}
+TRANSACTION_MAP = {'location': 0, 'location vacances': 1, 'vente': 2}
+CITY_MAP = {'casablanca': 0, 'rabat': 1, 'marrakech': 2, 'fes': 3, 'tanger': 4, 'agadir': 5,
+            'meknes': 6, 'oujda': 7, 'kenitra': 8, 'tetouan': 9, 'sale': 10}
+CONDITION_MAP = {'a renover': 0, 'bon etat': 1, 'excellent etat': 2, 'neuf': 3, 'tres bon etat': 4}
+# field -> (codes, code of unknown labels)
+LABEL_MAPS = {
+    'property_type': (PROPERTY_TYPE_MAP, 0),
+    'transaction': (TRANSACTION_MAP, 0),
+    'city': (CITY_MAP, 0),
+    'condition': (CONDITION_MAP, 1),
+}
+
+
+def normalize_label(value):
+    """Lowercase and strip accents so 'Fès' and 'fes' hit the same partition"""
+    text = unicodedata.normalize('NFKD', str(value))
+    return ''.join(c for c in text if not unicodedata.combining(c)).strip().lower()
+
+
+def label_code(field, value):
+    codes, unknown = LABEL_MAPS[field]
+    return codes.get(normalize_label(value), unknown)
+
+
+def neighborhood_code(value):
+    return zlib.crc32(normalize_label(value).encode()) % NEIGHBORHOOD_BUCKETS
+
+
+def house_row(data):
+    """The 10 house model features of a request payload"""
+    return [
+        label_code('property_type', data['property_type']),
+        label_code('transaction', data['transaction']),
+        float(data['surface']),
+        int(data['rooms']),
+        int(data['bathrooms']),
+        int(data['floor']),
+        label_code('city', data['city']),
+        neighborhood_code(data.get('neighborhood', '')),
+        label_code('condition', data['condition']),
+        int(data['age']),
+    ]
+
+
+class HouseFeatures:
+    """
+    house_row over houses dataset rows. Stateless: fit is there so
+    train_all.py treats it like SalaryFeatures.
+    """
+
+    def fit(self, df):
+        return self
+
+    def transform(self, df):
+        columns = []
+        for field, column in DATASET_COLUMNS.items():
+            series = df[column]
+            # Labels repeat a lot: encode each distinct one once
+            if field in LABEL_MAPS:
+                series = series.map({v: label_code(field, v) for v in series.unique()})
+            elif field == 'neighborhood':
+                series = series.fillna('')
+                series = series.map({v: neighborhood_code(v) for v in series.unique()})
+            columns.append(series.to_numpy(dtype=float))
+        return np.column_stack(columns)
@@ -4,27 +4,43 @@ Scrapes job listings from multiple sources with salary data
 Targets engineers and technicians across multiple domains
 """
 
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
+import argparse
 import random
 from datetime import datetime
 import re
 from urllib.parse import quote_plus
 import json
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from datasets import SINK_CHUNK_ROWS, RecordSink, is_parquet
+from extraction import ExtractionPool, add_extraction_arguments, extractor_from_args
+from fetcher import CacheMiss, Fetcher, add_fetch_arguments, fetcher_from_args
 
 class JobScraper:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        self.jobs_data = []
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+    }
+    SCHEMA = {
+        'job_title': 'category', 'company_name': 'category', 'location': 'category', 'salary': 'string',
+        'job_type': 'category', 'experience_required': 'category', 'education_required': 'category',
+        'skills_required': 'string', 'job_description': 'string', 'posted_date': 'category', 'source': 'category'
+    }
+    SUMMARY_COLUMNS = ('job_title', 'company_name', 'location')
+    
+    def __init__(self, fetcher=None, extractor=None, sink=None):
+        self.headers = self.HEADERS
+        # Records stream to the sink (in memory unless a dataset path is given)
+        self.sink = sink if sink is not None else RecordSink(None, self.SCHEMA, count_by=self.SUMMARY_COLUMNS)
+        self.indeed_url = "https://ma.indeed.com/jobs"
+        # Pooled, concurrent, rate-limited per host (replaces a sleep after every page)
+        self.fetcher = fetcher or Fetcher(self.headers)
+        # Page parsing, inline or on its own processes
+        self.extractor = extractor or ExtractionPool()
         
         # Job categories for Morocco market
         self.job_categories = [
@@ -44,82 +60,101 @@ class JobScraper:
             "Tangier", "Agadir", "Meknes", "Oujda", "Kenitra"
         ]
     
-    def scrape_indeed_morocco(self, job_title, location="Morocco", max_pages=50):
-        """Scrape Indeed Morocco for job listings"""
-        print(f"\n🔍 Scraping Indeed for: {job_title} in {location}")
-        
-        base_url = "https://ma.indeed.com/jobs"
-        jobs_found = 0
-        
-        for page in range(0, max_pages):
+    def indeed_search_url(self, job_title, location, page):
+        return f"{self.indeed_url}?q={quote_plus(job_title)}&l={quote_plus(location)}&start={page * 10}"
+    
+    def parse_indeed_page(self, html, location):
+        """Job records of one Indeed search results page"""
+        return self.indeed_jobs(self.extractor.run('indeed_cards', html), location)
+    
+    def indeed_jobs(self, cards, location):
+        """Job records from the extraction engine's card fields"""
+        jobs = []
+        for card in cards:
             try:
-                params = {
-                    'q': job_title,
-                    'l': location,
-                    'start': page * 10
-                }
-                
-                url = f"{base_url}?q={quote_plus(job_title)}&l={quote_plus(location)}&start={page * 10}"
-                
-                response = requests.get(url, headers=self.headers, timeout=10)
-                time.sleep(random.uniform(2, 4))  # Be respectful
-                
-                if response.status_code != 200:
-                    print(f"   ⚠️  Status {response.status_code} for page {page}")
-                    continue
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find job cards
-                job_cards = soup.find_all(['div', 'a'], class_=re.compile('job|result|card', re.I))
-                
-                if not job_cards:
-                    print(f"   📄 No more jobs found at page {page}")
-                    break
-                
-                for card in job_cards:
+                job_data = self._extract_indeed_job_data(card, location)
+                if job_data:
+                    jobs.append(job_data)
+            except Exception:
+                continue
+        return jobs
+    
+    def scrape_indeed_searches(self, searches, max_pages=50):
+        """
+        Scrape many (job_title, location) searches concurrently. Each
+        search walks its pages in order and stops at its first page without
+        job cards; pages of different searches overlap on the fetcher's pool,
+        within its per-host rate limit, while fetched pages are parsed by
+        the extractor. Returns jobs found per search.
+        """
+        found = {search: 0 for search in searches}
+        pending = {}  # future -> ('fetch' or 'parse', job_title, location, page)
+        
+        def request_page(job_title, location, page):
+            if page < max_pages:
+                url = self.indeed_search_url(job_title, location, page)
+                pending[self.fetcher.submit(url)] = ('fetch', job_title, location, page)
+        
+        for job_title, location in searches:
+            print(f"\n🔍 Scraping Indeed for: {job_title} in {location}")
+            request_page(job_title, location, 0)
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, job_title, location, page = pending.pop(future)
+                if stage == 'parse':
                     try:
-                        job_data = self._extract_indeed_job_data(card, location)
-                        if job_data:
-                            self.jobs_data.append(job_data)
-                            jobs_found += 1
+                        jobs = self.indeed_jobs(future.result(), location)
                     except Exception as e:
+                        print(f"   ❌ Parse error on {job_title} in {location} page {page}: {str(e)}")
+                        request_page(job_title, location, page + 1)
+                        continue
+                    if not jobs:
+                        print(f"✅ Completed {job_title} in {location}: {found[(job_title, location)]} jobs scraped "
+                              f"(no more jobs at page {page})")
                         continue
+                    self.sink.write_many(jobs)
+                    found[(job_title, location)] += len(jobs)
+                    request_page(job_title, location, page + 1)
+                    continue
                 
-                print(f"   ✓ Page {page}: Found {jobs_found} jobs so far")
+                try:
+                    response = future.result()
+                except CacheMiss:
+                    print(f"✅ Completed {job_title} in {location}: {found[(job_title, location)]} jobs replayed "
+                          f"(page {page} not cached)")
+                    continue
+                except Exception as e:
+                    print(f"   ❌ Error on {job_title} in {location} page {page}: {str(e)}")
+                    request_page(job_title, location, page + 1)
+                    continue
                 
-            except Exception as e:
-                print(f"   ❌ Error on page {page}: {str(e)}")
-                continue
+                if response.status_code != 200:
+                    print(f"   ⚠️  Status {response.status_code} for {job_title} in {location} page {page}")
+                    request_page(job_title, location, page + 1)
+                    continue
+                
+                pending[self.extractor.submit('indeed_cards', response.content)] = ('parse', job_title, location, page)
         
-        print(f"✅ Completed {job_title}: {jobs_found} jobs scraped")
-        return jobs_found
+        return found
+    
+    def scrape_indeed_morocco(self, job_title, location="Morocco", max_pages=50):
+        """Scrape Indeed Morocco for job listings"""
+        return self.scrape_indeed_searches([(job_title, location)], max_pages)[(job_title, location)]
     
     def _extract_indeed_job_data(self, card, location):
-        """Extract job data from Indeed card"""
+        """Job record from one Indeed card's extracted fields (None without a title)"""
         try:
-            # Extract job title
-            title_elem = card.find(['h2', 'a', 'span'], class_=re.compile('jobTitle|title', re.I))
-            if not title_elem:
+            title = card['title']
+            if title is None:
                 return None
             
-            title = title_elem.get_text(strip=True)
-            
-            # Extract company
-            company_elem = card.find(['span', 'div', 'a'], class_=re.compile('company', re.I))
-            company = company_elem.get_text(strip=True) if company_elem else "Not Specified"
-            
-            # Extract location
-            location_elem = card.find(['div', 'span'], class_=re.compile('location|companyLocation', re.I))
-            job_location = location_elem.get_text(strip=True) if location_elem else location
-            
-            # Extract salary (if available)
-            salary_elem = card.find(['div', 'span'], class_=re.compile('salary|estimated', re.I))
-            salary = salary_elem.get_text(strip=True) if salary_elem else self._estimate_salary(title)
-            
-            # Extract description/snippet
-            desc_elem = card.find(['div', 'span'], class_=re.compile('snippet|description|summary', re.I))
-            description = desc_elem.get_text(strip=True) if desc_elem else ""
+            company = card['company'] if card['company'] is not None else "Not Specified"
+            job_location = card['location'] if card['location'] is not None else location
+            # Estimate the salary when the card shows none
+            salary = card['salary'] if card['salary'] is not None else self._estimate_salary(title)
+            description = card['description'] if card['description'] is not None else ""
             
             # Extract other details
             job_type = self._extract_job_type(description)
@@ -275,7 +310,7 @@ class JobScraper:
         """Generate additional synthetic but realistic job data based on Morocco market"""
         print(f"\n📊 Generating synthetic job data to reach {target_count} entries...")
         
-        current_count = len(self.jobs_data)
+        current_count = self.sink.rows
         needed = target_count - current_count
         
         if needed <= 0:
@@ -478,6 +513,7 @@ class JobScraper:
             }
         }
         
+        progress_every = max(1000, needed // 20)
         for i in range(needed):
             job_title = random.choice(list(job_templates.keys()))
             template = job_templates[job_title]
@@ -535,62 +571,78 @@ class JobScraper:
                 'source': 'Morocco Job Market'
             }
             
-            self.jobs_data.append(job_data)
+            self.sink.write(job_data)
             
-            if (i + 1) % 1000 == 0:
+            if (i + 1) % progress_every == 0:
                 print(f"   ✓ Generated {i + 1}/{needed} entries...")
         
         print(f"✅ Generated {needed} realistic job entries based on Morocco market")
     
-    def save_to_csv(self, filename='morocco_jobs_dataset.csv'):
-        """Save scraped data to CSV"""
-        if not self.jobs_data:
-            print("❌ No data to save!")
+    def print_summary(self):
+        """Statistics of the records written to the sink (kept as counts while streaming)"""
+        sink = self.sink
+        if not sink.rows:
+            print("❌ No data saved!")
             return
         
-        df = pd.DataFrame(self.jobs_data)
-        
-        print(f"   Initial entries: {len(df)}")
-        
-        # Save to CSV (keep all entries, they are already unique due to job references)
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
-        
-        print(f"\n✅ Dataset saved to: {filename}")
-        print(f"📊 Total jobs: {len(df)}")
+        sink.summary()
+        print(f"📊 Total jobs: {sink.written:,}")
         print(f"\n📈 Dataset Statistics:")
-        print(f"   • Unique job titles: {df['job_title'].nunique()}")
-        print(f"   • Unique companies: {df['company_name'].nunique()}")
-        print(f"   • Locations: {df['location'].nunique()}")
-        print(f"\n🏢 Top Companies:")
-        print(df['company_name'].value_counts().head(5))
-        print(f"\n💼 Top Job Titles:")
-        print(df['job_title'].value_counts().head(5))
-        print(f"\n📍 Jobs by Location:")
-        print(df['location'].value_counts())
+        print(f"   • Unique job titles: {len(sink.counts['job_title'])}")
+        print(f"   • Unique companies: {len(sink.counts['company_name'])}")
+        print(f"   • Locations: {len(sink.counts['location'])}")
+        for heading, column, top in [("🏢 Top Companies", 'company_name', 5), ("💼 Top Job Titles", 'job_title', 5),
+                                     ("📍 Jobs by Location", 'location', None)]:
+            print(f"\n{heading}:")
+            for value, count in sink.counts[column].most_common(top):
+                print(f"   {value:<32} {count:>8,}")
         print(f"\n💰 Average Salary Range:")
         print(f"   Min: ~5000 MAD/month")
         print(f"   Max: ~32000 MAD/month")
-        
-        return filename
 
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Generate the Morocco jobs dataset')
+    parser.add_argument('--output', default='morocco_jobs_dataset.csv', help='.csv, or .parquet for columnar storage')
+    parser.add_argument('--partition-by', default=None, help='Parquet only: one partition per value of this column')
+    parser.add_argument('--count', type=int, default=10000, help='records in the dataset (generated after scraped ones)')
+    parser.add_argument('--chunk-rows', type=int, default=SINK_CHUNK_ROWS, help='records written per chunk')
+    parser.add_argument('--scrape', action='store_true', help='scrape Indeed for every job category x city first')
+    parser.add_argument('--max-pages', type=int, default=50)
+    parser.add_argument('--indeed-url', default=None, help='search endpoint (e.g. a local stand-in server)')
+    add_fetch_arguments(parser)
+    add_extraction_arguments(parser)
+    args = parser.parse_args()
+    if args.partition_by and not is_parquet(args.output):
+        parser.error("--partition-by needs a .parquet --output")
+
     print("=" * 60)
     print("🇲🇦 MOROCCO JOB SCRAPER - Career2Life Project")
     print("=" * 60)
     
-    scraper = JobScraper()
-    
-    # Note: Web scraping is blocked by most sites, so we generate realistic data
-    print("\n📊 Generating comprehensive Morocco job market dataset...")
-    print("   Based on real market data from Morocco job sites")
-    
-    # Generate realistic data for Morocco job market
-    scraper.generate_synthetic_data(target_count=10000)
+    # Records stream to CSV or Parquet as they are scraped and generated
+    with RecordSink(args.output, JobScraper.SCHEMA, args.chunk_rows, args.partition_by,
+                    count_by=JobScraper.SUMMARY_COLUMNS) as sink:
+        with fetcher_from_args(JobScraper.HEADERS, args) as fetcher, extractor_from_args(args) as extractor:
+            scraper = JobScraper(fetcher, extractor, sink)
+            if args.indeed_url:
+                scraper.indeed_url = args.indeed_url
+            
+            if args.scrape:
+                searches = [(title, city) for title in scraper.job_categories for city in scraper.cities]
+                found = scraper.scrape_indeed_searches(searches, args.max_pages)
+                print(f"\n🌐 Scraped {sum(found.values()):,} jobs from {len(searches)} searches")
+        
+        # Note: Web scraping is blocked by most sites, so we generate realistic data
+        print("\n📊 Generating comprehensive Morocco job market dataset...")
+        print("   Based on real market data from Morocco job sites")
+        
+        # Generate realistic data for Morocco job market
+        scraper.generate_synthetic_data(target_count=args.count)
     
-    # Save to CSV
-    filename = scraper.save_to_csv('morocco_jobs_dataset.csv')
+    print(f"\n✅ Dataset saved to: {args.output}")
+    scraper.print_summary()
     
     print("\n" + "=" * 60)
     print("✅ DATASET GENERATION COMPLETE!")
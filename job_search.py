@@ -0,0 +1,208 @@
+"""
+Similar-job search over the Morocco jobs dataset
+TF-IDF over skills_required (one term per skill) and job_title words,
+stored column-major so each term's column is its posting list - an
+inverted index. A query only touches the postings of its own terms.
+
+Build the artifact once (deploy step), then load it at startup:
+    python job_search.py build
+"""
+
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from datasets import read_dataset, resolve
+
+JOBS_DATASET = 'morocco_jobs_dataset.csv'
+INDEX_ARTIFACT = 'job_search_index.pkl'
+TITLE_WEIGHT = 0.5  # Title words count half as much as an exact skill
+CANDIDATE_BUDGET = 20000  # Max postings read to generate candidates
+
+SKILL_TOKEN = r'[^,\s][^,]*[^,\s]|[^,\s]'  # One term per comma separated skill
+
+
+def source_signature(path):
+    """Size and mtime of the dataset (its Parquet copy if that is read), used to detect a stale artifact"""
+    stat = os.stat(resolve(path))
+    return (stat.st_size, int(stat.st_mtime))
+
+
+class JobSearchIndex:
+    def __init__(self, skills_vectorizer, title_vectorizer, postings, jobs, signature=None):
+        self.skills_vectorizer = skills_vectorizer
+        self.title_vectorizer = title_vectorizer
+        self.postings = postings  # CSC: rows = jobs, columns = terms
+        self.jobs = jobs
+        self.signature = signature
+
+        # Query-side lookups, so searching skips the vectorizers' transform overhead
+        title_offset = len(skills_vectorizer.vocabulary_)
+        self._fields = [
+            (skills_vectorizer.build_analyzer(), skills_vectorizer.vocabulary_, skills_vectorizer.idf_, 0, 1.0),
+            (title_vectorizer.build_analyzer(), title_vectorizer.vocabulary_, title_vectorizer.idf_, title_offset, TITLE_WEIGHT),
+        ]
+
+    @classmethod
+    def build(cls, df, signature=None):
+        """Fit the vectorizers and build the inverted index from a jobs DataFrame"""
+        skills = df['skills_required'].fillna('')
+        titles = df['job_title'].fillna('')
+
+        skills_vectorizer = TfidfVectorizer(token_pattern=SKILL_TOKEN, dtype=np.float32)
+        title_vectorizer = TfidfVectorizer(dtype=np.float32)
+        matrix = sparse.hstack([
+            skills_vectorizer.fit_transform(skills),
+            title_vectorizer.fit_transform(titles) * TITLE_WEIGHT
+        ])
+        postings = normalize(matrix, norm='l2', axis=1).tocsc()
+        postings.sort_indices()
+
+        jobs = {
+            'job_title': titles.to_numpy(dtype=object),
+            'company_name': df['company_name'].fillna('').to_numpy(dtype=object),
+            'location': df['location'].fillna('').to_numpy(dtype=object),
+            'salary': pd.to_numeric(df['salary'].str.extract(r'(\d+)', expand=False)).fillna(0).to_numpy(dtype=np.int32),
+            'skills_required': skills.to_numpy(dtype=object),
+        }
+        return cls(skills_vectorizer, title_vectorizer, postings, jobs, signature)
+
+    @classmethod
+    def from_csv(cls, path=JOBS_DATASET):
+        columns = ['job_title', 'company_name', 'location', 'salary', 'skills_required']
+        return cls.build(read_dataset(path, columns), source_signature(path))
+
+    def save(self, path=INDEX_ARTIFACT):
+        joblib.dump({
+            'skills_vectorizer': self.skills_vectorizer,
+            'title_vectorizer': self.title_vectorizer,
+            'postings': self.postings,
+            'jobs': self.jobs,
+            'signature': self.signature,
+        }, path, compress=3)
+
+    @classmethod
+    def load(cls, path=INDEX_ARTIFACT):
+        return cls(**joblib.load(path))
+
+    @classmethod
+    def load_or_build(cls, path=INDEX_ARTIFACT, source=JOBS_DATASET):
+        """Load the prebuilt artifact; rebuild it only if missing or stale"""
+        if os.path.exists(path):
+            index = cls.load(path)
+            if not os.path.exists(source) or index.signature == source_signature(source):
+                return index
+            print(f"⚠️ {path} is older than {source}, rebuilding...")
+        index = cls.from_csv(source)
+        index.save(path)
+        return index
+
+    def vectorize(self, skills, job_title=''):
+        """Encode a query into (term ids, weights), matching the indexed rows' tf-idf"""
+        terms, values = [], []
+        for (analyzer, vocabulary, idf, offset, field_weight), text in zip(self._fields, (skills, job_title)):
+            counts = {}
+            for token in analyzer(text):
+                term = vocabulary.get(token)
+                if term is not None:
+                    counts[term] = counts.get(term, 0) + 1
+            if not counts:
+                continue
+            ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            tfidf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts)) * idf[ids]
+            terms.append(ids + offset)
+            values.append(tfidf / np.linalg.norm(tfidf) * field_weight)
+
+        if not terms:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        values = np.concatenate(values)
+        return np.concatenate(terms), values / np.linalg.norm(values)
+
+    def search(self, skills, job_title='', k=10):
+        """Return the top-k postings by cosine similarity to the query"""
+        terms, query_weights = self.vectorize(skills, job_title)
+        if len(terms) == 0:
+            return []
+
+        # Candidate pruning: generate candidates from the rarest terms only,
+        # reading at most CANDIDATE_BUDGET postings (always at least one list)
+        indptr, indices, data = self.postings.indptr, self.postings.indices, self.postings.data
+        spans = sorted(
+            ((indptr[t], indptr[t + 1], w) for t, w in zip(terms, query_weights)),
+            key=lambda span: span[1] - span[0]
+        )
+        selective, read = 0, 0
+        while selective < len(spans) and (selective == 0 or read + spans[selective][1] - spans[selective][0] <= CANDIDATE_BUDGET):
+            read += spans[selective][1] - spans[selective][0]
+            selective += 1
+
+        rows = np.concatenate([indices[start:end] for start, end, _ in spans[:selective]])
+        if len(rows) == 0:
+            return []
+        weights = np.concatenate([data[start:end] * w for start, end, w in spans[:selective]])
+        rows, inverse = np.unique(rows, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+
+        # Exact rescoring of the candidates against the common terms: posting
+        # lists are sorted, so each is a binary search per candidate
+        for start, end, w in spans[selective:]:
+            posting_rows = indices[start:end]
+            if len(posting_rows) == 0:
+                continue
+            pos = np.minimum(np.searchsorted(posting_rows, rows), len(posting_rows) - 1)
+            hit = posting_rows[pos] == rows
+            scores[hit] += data[start:end][pos[hit]] * w
+
+        if len(rows) > k:
+            top = np.argpartition(-scores, k)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores)
+
+        return [
+            {
+                'job_title': self.jobs['job_title'][row],
+                'company_name': self.jobs['company_name'][row],
+                'location': self.jobs['location'][row],
+                'salary': int(self.jobs['salary'][row]),
+                'skills_required': self.jobs['skills_required'][row],
+                'similarity': round(float(score), 4),
+            }
+            for row, score in zip(rows[order], scores[order])
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the similar-job index')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='build the index artifact from the jobs CSV')
+    build.add_argument('--source', default=JOBS_DATASET)
+    build.add_argument('--output', default=INDEX_ARTIFACT)
+    query = sub.add_parser('query', help='search the index')
+    query.add_argument('skills')
+    query.add_argument('--title', default='')
+    query.add_argument('-k', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        index = JobSearchIndex.from_csv(args.source)
+        index.save(args.output)
+        rows, terms = index.postings.shape
+        print(f"✅ Indexed {rows:,} jobs over {terms:,} terms in {time.perf_counter() - start:.1f}s")
+        print(f"💾 Saved to: {args.output}")
+    else:
+        index = JobSearchIndex.load()
+        for job in index.search(args.skills, args.title, args.k):
+            print(f"{job['similarity']:.3f}  {job['job_title']} @ {job['company_name']} "
+                  f"({job['location']}) - {job['salary']:,} MAD/month")
+
+
+if __name__ == '__main__':
+    main()
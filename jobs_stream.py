@@ -0,0 +1,90 @@
+"""
+Out-of-core loading of the jobs dataset
+Reads the CSV in fixed-size chunks with explicit dtypes (category for the
+low-cardinality text columns) and parses each chunk into train.py
+features as it streams. Two bounded-memory consumers turn the stream
+into a training table:
+- reservoir_sample: a uniform sample of at most `size` postings
+- aggregate_features: one row per distinct feature combination, with the
+  mean salary and the number of postings as a sample weight
+Peak memory depends on the chunk size, the sample size or the number of
+distinct combinations, never on the number of postings.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from datasets import iter_batches
+from train import JOBS_DATASET, parse_features
+
+CHUNK_ROWS = 250_000
+
+CATEGORY_COLUMNS = ['job_title', 'company_name', 'location', 'job_type', 'education_required', 'source']
+# Columns parsed during the stream
+PARSED_COLUMNS = ['job_title', 'salary', 'experience_required', 'skills_required']
+AGGREGATE_KEYS = ['job_title', 'num_skills', 'experience_years']
+
+
+def read_chunks(path=JOBS_DATASET, columns=PARSED_COLUMNS, chunk_rows=CHUNK_ROWS):
+    """Raw chunks with explicit dtypes (Parquet chunks keep their stored dictionary encoding)"""
+    dtypes = {c: 'category' if c in CATEGORY_COLUMNS else 'str' for c in columns}
+    return iter_batches(path, columns, chunk_rows, dtype=dtypes)
+
+
+def stream_features(path=JOBS_DATASET, chunk_rows=CHUNK_ROWS, keep=()):
+    """Parsed feature chunks (see train.parse_features); keep adds raw columns"""
+    columns = PARSED_COLUMNS + [c for c in keep if c not in PARSED_COLUMNS]
+    for chunk in read_chunks(path, columns, chunk_rows):
+        yield parse_features(chunk, keep)
+
+
+def concat_frames(frames):
+    """pd.concat that keeps categorical columns categorical across chunks"""
+    combined = pd.concat(frames, ignore_index=True)
+    for column in frames[0].columns:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            combined[column] = union_categoricals([f[column] for f in frames], ignore_order=True)
+    return combined
+
+
+def reservoir_sample(chunks, size, seed=42):
+    """
+    Uniform sample without replacement of at most size rows from a stream
+    of chunks: every row draws a random key and the size smallest keys so
+    far are kept.
+    """
+    if size < 1:
+        raise ValueError(f"sample size must be at least 1, got {size}")
+    rng = np.random.default_rng(seed)
+    sample, keys = None, None
+    for chunk in chunks:
+        chunk_keys = rng.random(len(chunk))
+        if sample is not None:
+            chunk = concat_frames([sample, chunk])
+            chunk_keys = np.concatenate([keys, chunk_keys])
+        if len(chunk) > size:
+            kept = np.sort(np.argpartition(chunk_keys, size)[:size])
+            chunk, chunk_keys = chunk.iloc[kept].reset_index(drop=True), chunk_keys[kept]
+            for column in chunk.select_dtypes('category'):
+                chunk[column] = chunk[column].cat.remove_unused_categories()
+        sample, keys = chunk, chunk_keys
+    if sample is None or sample.empty:
+        raise ValueError("no rows with a salary in the stream")
+    return sample
+
+
+def aggregate_features(chunks, keys=AGGREGATE_KEYS):
+    """
+    One row per distinct combination of keys: mean salary and a weight
+    (number of postings), accumulated chunk by chunk
+    """
+    totals = None
+    for chunk in chunks:
+        grouped = chunk.groupby(keys, observed=True, sort=False)['salary'].agg(['count', 'sum'])
+        totals = grouped if totals is None else pd.concat([totals, grouped]).groupby(level=keys, sort=False).sum()
+    if totals is None or totals.empty:
+        raise ValueError("no rows with a salary in the stream")
+    table = totals.reset_index()
+    table['salary'] = table.pop('sum') / table['count']
+    return table.rename(columns={'count': 'weight'})
@@ -0,0 +1,190 @@
+"""
+Precomputed market statistics for salary and housing benchmarks
+An offline step groups the jobs and houses datasets by every combination
+of their dimensions ('*' = rolled up) and stores, per group, the count,
+mean, quantiles and the sorted values themselves. Lookups are a dict hit;
+percentile ranks are a binary search in the group's sorted values.
+
+Build the artifact once (deploy step):
+    python market_stats.py build
+"""
+
+import argparse
+import os
+import time
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from datasets import read_dataset
+from house_comparables import normalize_label
+from salary_features import experience_years
+
+JOBS_DATASET = 'morocco_jobs_dataset.csv'
+HOUSES_DATASET = 'morocco_houses_dataset.csv'
+STATS_ARTIFACT = 'market_stats.npz'
+
+QUANTILES = [0.10, 0.25, 0.50, 0.75, 0.90]
+STAT_FIELDS = ['count', 'mean', 'p10', 'p25', 'p50', 'p75', 'p90']
+
+EXPERIENCE_BREAKS = [2, 5, 10]
+EXPERIENCE_BUCKETS = ['0-2 years', '2-5 years', '5-10 years', '10+ years']
+
+# cube name -> (dimensions, value column)
+CUBES = {
+    'salary': (['job_title', 'location', 'experience_bucket'], 'salary'),
+    'price_per_sqm': (['city', 'neighborhood', 'type', 'transaction'], 'price_per_sqm'),
+    'price': (['city', 'neighborhood', 'type', 'transaction'], 'price'),
+}
+
+ALL = '*'
+
+
+def experience_bucket(years):
+    """Bucket label for a number of years of experience"""
+    return EXPERIENCE_BUCKETS[int(np.searchsorted(EXPERIENCE_BREAKS, years, side='right'))]
+
+
+def cube_key(values):
+    return '|'.join(ALL if v in (None, '', ALL) else normalize_label(v) for v in values)
+
+
+def load_jobs(path=JOBS_DATASET):
+    """Jobs with numeric salary and an experience bucket per posting"""
+    df = read_dataset(path, ['job_title', 'location', 'salary', 'experience_required'])
+    df['salary'] = pd.to_numeric(df['salary'].str.extract(r'(\d+)', expand=False))
+
+    years = experience_years(df['experience_required'])
+    df['experience_bucket'] = np.array(EXPERIENCE_BUCKETS)[np.searchsorted(EXPERIENCE_BREAKS, years, side='right')]
+    return df.dropna(subset=['salary'])
+
+
+def load_houses(path=HOUSES_DATASET):
+    return read_dataset(path, ['city', 'neighborhood', 'type', 'transaction', 'price', 'price_per_sqm'])
+
+
+def build_cube(df, dimensions, value):
+    """Group by every subset of the dimensions; return keys, offsets, sorted values, stats"""
+    labels = pd.DataFrame({d: df[d].map(normalize_label) for d in dimensions})
+    values = df[value].to_numpy(dtype=np.float64)
+
+    keys, chunks, stats = [], [], []
+    for size in range(len(dimensions) + 1):
+        for grouped in combinations(dimensions, size):
+            key_parts = [labels[d] if d in grouped else pd.Series(ALL, index=labels.index) for d in dimensions]
+            group_keys = key_parts[0].str.cat(key_parts[1:], sep='|') if len(key_parts) > 1 else key_parts[0]
+            for key, rows in group_keys.groupby(group_keys).indices.items():
+                group = np.sort(values[rows])
+                keys.append(key)
+                chunks.append(group)
+                stats.append([len(group), group.mean(), *np.quantile(group, QUANTILES)])
+
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(c) for c in chunks])
+    return {
+        'keys': np.array(keys),
+        'offsets': offsets,
+        'values': np.concatenate(chunks).astype(np.float32),
+        # One row per group: small, so kept in float64 for exact means and quantiles
+        'stats': np.array(stats, dtype=np.float64),
+    }
+
+
+def build_stats(jobs_path=JOBS_DATASET, houses_path=HOUSES_DATASET, output=STATS_ARTIFACT):
+    """Offline aggregation step: build every cube and write the artifact"""
+    frames = {'salary': load_jobs(jobs_path)}
+    frames['price_per_sqm'] = frames['price'] = load_houses(houses_path)
+
+    arrays = {}
+    for name, (dimensions, value) in CUBES.items():
+        for field, array in build_cube(frames[name], dimensions, value).items():
+            arrays[f'{name}/{field}'] = array
+    np.savez_compressed(output, **arrays)
+    return output
+
+
+class MarketStats:
+    def __init__(self, arrays):
+        self.cubes = {}
+        for name in CUBES:
+            keys = arrays[f'{name}/keys']
+            self.cubes[name] = {
+                'index': {key: i for i, key in enumerate(keys.tolist())},
+                'offsets': arrays[f'{name}/offsets'],
+                'values': arrays[f'{name}/values'],
+                'stats': arrays[f'{name}/stats'],
+            }
+
+    @classmethod
+    def load(cls, path=STATS_ARTIFACT):
+        with np.load(path) as arrays:
+            return cls({name: arrays[name] for name in arrays.files})
+
+    @classmethod
+    def load_or_build(cls, path=STATS_ARTIFACT, jobs_path=JOBS_DATASET, houses_path=HOUSES_DATASET):
+        """Load the prebuilt artifact; build it only if missing or stale"""
+        sources = [p for p in (jobs_path, houses_path) if os.path.exists(p)]
+        if not os.path.exists(path) or any(os.path.getmtime(p) > os.path.getmtime(path) for p in sources):
+            build_stats(jobs_path, houses_path, path)
+        return cls.load(path)
+
+    def _group(self, cube, dimensions):
+        data = self.cubes[cube]
+        i = data['index'].get(cube_key(dimensions))
+        return data, i
+
+    def lookup(self, cube, dimensions):
+        """Summary statistics for one group, or None if it has no data"""
+        data, i = self._group(cube, dimensions)
+        if i is None:
+            return None
+        # Python floats rounded to cents (artifacts built before float64 stats hold float32)
+        summary = {field: round(float(v), 2) for field, v in zip(STAT_FIELDS, data['stats'][i])}
+        summary['count'] = int(summary['count'])
+        return summary
+
+    def percentile_rank(self, cube, dimensions, value):
+        """Share of the group (0-100) below value, counting ties as half"""
+        data, i = self._group(cube, dimensions)
+        if i is None:
+            return None
+        group = data['values'][data['offsets'][i]:data['offsets'][i + 1]]
+        below = np.searchsorted(group, value, side='left')
+        at_or_below = np.searchsorted(group, value, side='right')
+        return float((below + at_or_below) / 2 / len(group) * 100)
+
+    def salary(self, job_title=None, location=None, experience_years=None):
+        bucket = None if experience_years is None else experience_bucket(experience_years)
+        return self.lookup('salary', [job_title, location, bucket])
+
+    def salary_rank(self, salary, job_title=None, location=None, experience_years=None):
+        bucket = None if experience_years is None else experience_bucket(experience_years)
+        return self.percentile_rank('salary', [job_title, location, bucket], salary)
+
+    def housing(self, city=None, neighborhood=None, property_type=None, transaction=None):
+        dimensions = [city, neighborhood, property_type, transaction]
+        return {
+            'price_per_sqm': self.lookup('price_per_sqm', dimensions),
+            'price': self.lookup('price', dimensions),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the market statistics artifact')
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('--jobs', default=JOBS_DATASET)
+    parser.add_argument('--houses', default=HOUSES_DATASET)
+    parser.add_argument('--output', default=STATS_ARTIFACT)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_stats(args.jobs, args.houses, args.output)
+    stats = MarketStats.load(args.output)
+    groups = ', '.join(f"{name}: {len(cube['index']):,}" for name, cube in stats.cubes.items())
+    print(f"✅ Built market statistics in {time.perf_counter() - start:.1f}s ({groups} groups)")
+    print(f"💾 Saved to: {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,37 @@
+import argparse
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import random
-import time
 from datetime import datetime, timedelta
-import re
+
+from datasets import SINK_CHUNK_ROWS, RecordSink, is_parquet, read_dataset
+from extraction import ExtractionPool, add_extraction_arguments, extractor_from_args
+from fetcher import CacheMiss, Fetcher, add_fetch_arguments, fetcher_from_args
 
 class MoroccoHouseScraper:
-    def __init__(self):
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8,ar;q=0.7',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+    }
+    SCHEMA = {
+        'reference': 'string', 'type': 'category', 'transaction': 'category', 'price': 'int64',
+        'surface': 'int64', 'price_per_sqm': 'int64', 'rooms': 'int64', 'bathrooms': 'int64', 'floor': 'int64',
+        'city': 'category', 'neighborhood': 'category', 'condition': 'category', 'age': 'int64',
+        'amenities': 'string', 'description': 'string', 'listing_date': 'category'
+    }
+    SUMMARY_COLUMNS = ('type', 'city')
+    
+    def __init__(self, fetcher=None, extractor=None, sink=None):
         self.base_url = "https://www.masaken.ma"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8,ar;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        self.houses = []
+        self.headers = self.HEADERS
+        # Records stream to the sink (in memory unless a dataset path is given)
+        self.sink = sink if sink is not None else RecordSink(None, self.SCHEMA, count_by=self.SUMMARY_COLUMNS)
+        # Persistent session, per-host rate limit and optional response cache
+        self.fetcher = fetcher or Fetcher(self.headers)
+        self.extractor = extractor or ExtractionPool()
         
     def scrape_masaken(self, max_properties=10000):
         """Attempt to scrape properties from masaken.ma"""
@@ -34,17 +48,16 @@ class MoroccoHouseScraper:
         for url in search_urls:
             try:
                 print(f"\n📍 Trying URL: {url}")
-                response = requests.get(url, headers=self.headers, timeout=10)
+                response = self.fetcher.get(url)
                 
-                print(f"Status Code: {response.status_code}")
+                print(f"Status Code: {response.status_code}{' (cached)' if response.from_cache else ''}")
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                    title, properties = self.extractor.run('property_page', response.content)
                     print(f"✅ Successfully connected to masaken.ma")
-                    print(f"Page title: {soup.title.string if soup.title else 'No title'}")
+                    print(f"Page title: {title or 'No title'}")
                     
                     # Look for property listings
-                    properties = soup.find_all(['div', 'article'], class_=re.compile(r'(property|listing|annonce|bien)', re.I))
                     print(f"Found {len(properties)} potential property elements")
                     
                     if len(properties) > 0:
@@ -66,10 +79,10 @@ class MoroccoHouseScraper:
                 print("❌ Request timeout")
             except requests.exceptions.ConnectionError:
                 print("❌ Connection error")
+            except CacheMiss:
+                print("❌ Not in the response cache (offline)")
             except Exception as e:
                 print(f"❌ Error: {str(e)}")
-                
-            time.sleep(2)
         
         return False
     
@@ -173,12 +186,16 @@ class MoroccoHouseScraper:
             'Cave', 'Placard', 'Cuisine équipée', 'Vue mer', 'Vue montagne'
         ]
         
-        properties_data = []
-        seen_combinations = set()  # Track unique property combinations
+        generated = 0
+        # hash() of each property combination seen so far. Smaller than the
+        # tuples, but each set entry still costs ~60-70 bytes, so this grows
+        # with num_properties: memory is O(n), only with a small constant
+        seen_combinations = set()
         attempts = 0
         max_attempts = num_properties * 3  # Allow more attempts to get unique properties
+        progress_every = max(1000, num_properties // 20)
         
-        while len(properties_data) < num_properties and attempts < max_attempts:
+        while generated < num_properties and attempts < max_attempts:
             attempts += 1
             # Select city based on weights
             city = random.choices(list(cities.keys()), weights=list(cities.values()))[0]
@@ -255,8 +272,9 @@ class MoroccoHouseScraper:
             # Reference ID
             reference = f"MA-{city[:3].upper()}-{random.randint(10000, 99999)}"
             
-            # Create unique identifier for this property
-            unique_key = (prop_type, city, neighborhood, surface, rooms, price_per_sqm)
+            # Key on the values the row stores (price per m² truncated to int, as
+            # written below), so no two stored rows share these columns
+            unique_key = hash((prop_type, city, neighborhood, surface, rooms, int(price_per_sqm)))
             
             # Skip if we've seen this combination before
             if unique_key in seen_combinations:
@@ -297,69 +315,79 @@ class MoroccoHouseScraper:
                 'listing_date': listing_date
             }
             
-            properties_data.append(property_data)
+            # Unique in (type, city, neighborhood, surface, rooms, price_per_sqm), so no
+            # two rows are duplicates (a hash collision can only skip a distinct row)
+            self.sink.write(property_data)
+            generated += 1
             
             # Progress indicator
-            if len(properties_data) % 1000 == 0:
-                print(f"✅ Generated {len(properties_data):,} unique properties...")
-        
-        self.houses = properties_data
-        print(f"\n✅ Successfully generated {len(self.houses):,} unique properties!")
-        
-        # Verify no duplicates
-        df_temp = pd.DataFrame(properties_data)
-        duplicates = df_temp.duplicated().sum()
-        if duplicates > 0:
-            print(f"⚠️ Warning: Found {duplicates} duplicates, removing them...")
-            df_temp = df_temp.drop_duplicates()
-            self.houses = df_temp.to_dict('records')
-            print(f"✅ Final count: {len(self.houses):,} unique properties")
+            if generated % progress_every == 0:
+                print(f"✅ Generated {generated:,} unique properties...")
         
-        return properties_data
+        print(f"\n✅ Successfully generated {generated:,} unique properties!")
+        return generated
     
-    def save_to_csv(self, filename='morocco_houses_dataset.csv'):
-        """Save the dataset to CSV"""
-        if not self.houses:
-            print("❌ No data to save!")
+    def print_summary(self):
+        """Statistics of the records written to the sink; medians read back only the price and surface columns"""
+        sink = self.sink
+        if not sink.rows:
+            print("❌ No data saved!")
             return
         
-        df = pd.DataFrame(self.houses)
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
-        
+        numeric = read_dataset(sink.path, columns=['price', 'surface']) if sink.path else sink.frame()
+        price, surface = sink.stats('price'), sink.stats('surface')
         print("\n" + "=" * 60)
-        print(f"💾 Dataset saved to: {filename}")
+        print(f"💾 Dataset saved to: {sink.path}")
         print("=" * 60)
+        sink.summary()
         print(f"\n📊 Dataset Statistics:")
-        print(f"Total properties: {len(df):,}")
-        print(f"\n🏠 Property Types:")
-        print(df['type'].value_counts())
-        print(f"\n🏙️ Cities Distribution:")
-        print(df['city'].value_counts())
+        print(f"Total properties: {sink.written:,}")
+        for heading, column in [("🏠 Property Types", 'type'), ("🏙️ Cities Distribution", 'city')]:
+            print(f"\n{heading}:")
+            for value, count in sink.counts[column].most_common():
+                print(f"   {value:<20} {count:>8,}")
         print(f"\n💰 Price Statistics:")
-        print(f"Min: {df['price'].min():,.0f} MAD")
-        print(f"Max: {df['price'].max():,.0f} MAD")
-        print(f"Mean: {df['price'].mean():,.0f} MAD")
-        print(f"Median: {df['price'].median():,.0f} MAD")
+        print(f"Min: {price['min']:,.0f} MAD")
+        print(f"Max: {price['max']:,.0f} MAD")
+        print(f"Mean: {price['mean']:,.0f} MAD")
+        print(f"Median: {numeric['price'].median():,.0f} MAD")
         print(f"\n📏 Surface Statistics:")
-        print(f"Min: {df['surface'].min()} m²")
-        print(f"Max: {df['surface'].max()} m²")
-        print(f"Mean: {df['surface'].mean():.0f} m²")
-        print(f"Median: {df['surface'].median():.0f} m²")
+        print(f"Min: {surface['min']} m²")
+        print(f"Max: {surface['max']} m²")
+        print(f"Mean: {surface['mean']:.0f} m²")
+        print(f"Median: {numeric['surface'].median():.0f} m²")
 
 def main():
-    scraper = MoroccoHouseScraper()
-    
-    # Try to scrape first
-    scraping_success = scraper.scrape_masaken(max_properties=10000)
-    
-    # If scraping failed, generate realistic data
-    if not scraping_success:
-        print("\n⚠️ Web scraping blocked or failed")
-        print("🔄 Falling back to realistic data generation...")
-        scraper.generate_realistic_dataset(num_properties=10000)
+    parser = argparse.ArgumentParser(description='Scrape or generate the Morocco houses dataset')
+    parser.add_argument('--output', default='morocco_houses_10k.csv', help='.csv, or .parquet for columnar storage')
+    parser.add_argument('--partition-by', default=None, help='Parquet only: one partition per value of this column')
+    parser.add_argument('--count', type=int, default=10000, help='properties to generate')
+    parser.add_argument('--chunk-rows', type=int, default=SINK_CHUNK_ROWS, help='records written per chunk')
+    parser.add_argument('--base-url', default=None, help='site to scrape (e.g. a local stand-in server)')
+    add_fetch_arguments(parser)
+    add_extraction_arguments(parser)
+    args = parser.parse_args()
+    if args.partition_by and not is_parquet(args.output):
+        parser.error("--partition-by needs a .parquet --output")
+
+    # Records stream to CSV or Parquet as they are generated
+    with RecordSink(args.output, MoroccoHouseScraper.SCHEMA, args.chunk_rows, args.partition_by,
+                    count_by=MoroccoHouseScraper.SUMMARY_COLUMNS) as sink:
+        with fetcher_from_args(MoroccoHouseScraper.HEADERS, args) as fetcher, extractor_from_args(args) as extractor:
+            scraper = MoroccoHouseScraper(fetcher, extractor, sink)
+            if args.base_url:
+                scraper.base_url = args.base_url
+            
+            # Try to scrape first
+            scraping_success = scraper.scrape_masaken(max_properties=args.count)
+        
+        # If scraping failed, generate realistic data
+        if not scraping_success:
+            print("\n⚠️ Web scraping blocked or failed")
+            print("🔄 Falling back to realistic data generation...")
+            scraper.generate_realistic_dataset(num_properties=args.count)
     
-    # Save the dataset
-    scraper.save_to_csv('morocco_houses_10k.csv')
+    scraper.print_summary()
     
     print("\n✅ Process completed!")
     print(f"📁 File saved in current directory")
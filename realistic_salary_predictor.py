@@ -4,21 +4,39 @@ This model properly values:
 1. High-value skills (AI/ML/Cloud) over skill quantity
 2. Experience (0 years vs 10 years should have MASSIVE difference)
 3. Input validation (no negative experience)
+
+Importing this module does no I/O: dataset statistics are loaded lazily
+by load_dataset_stats() and cached. Run it as a script for the test cases.
 """
 
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
 
-# Load dataset
-df = pd.read_csv('morocco_jobs_dataset.csv')
+from datasets import iter_batches
+from salary_rules import get_rules
+from skill_matcher import SkillMatcher
 
-# Parse salary
-df['salary_numeric'] = df['salary'].str.replace(' MAD/month', '').str.replace(',', '').astype(int)
+JOBS_DATASET = 'morocco_jobs_dataset.csv'
 
-print("📊 Dataset Statistics:")
-print(f"Total jobs: {len(df):,}")
-print(f"Salary range: {df['salary_numeric'].min():,} - {df['salary_numeric'].max():,} MAD/month")
-print(f"Average: {df['salary_numeric'].mean():,.0f} MAD/month\n")
+@lru_cache(maxsize=None)
+def load_dataset_stats(path=JOBS_DATASET, chunk_rows=250_000):
+    """Salary statistics of the jobs dataset (streamed once, then cached)"""
+    total, salary_sum = 0, 0
+    salary_min, salary_max = None, None
+    for chunk in iter_batches(path, ['salary'], chunk_rows, dtype={'salary': 'str'}):
+        salary_numeric = chunk['salary'].str.replace(' MAD/month', '').str.replace(',', '').astype(np.int64)
+        total += len(salary_numeric)
+        salary_sum += int(salary_numeric.sum())
+        salary_min = int(salary_numeric.min()) if salary_min is None else min(salary_min, int(salary_numeric.min()))
+        salary_max = int(salary_numeric.max()) if salary_max is None else max(salary_max, int(salary_numeric.max()))
+    return {
+        'total_jobs': total,
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'salary_mean': salary_sum / total
+    }
 
 # Define high-value skills with weights
 HIGH_VALUE_SKILLS = {
@@ -82,6 +100,9 @@ HIGH_VALUE_SKILLS = {
     'Penetration Testing': 0.8,
 }
 
+# Compiled once: one token-boundary pass per skills string
+SKILL_MATCHER = SkillMatcher(HIGH_VALUE_SKILLS)
+
 def calculate_skill_score(skills_str):
     """
     Calculate weighted skill score - QUALITY matters more than quantity!
@@ -90,32 +111,18 @@ def calculate_skill_score(skills_str):
     if pd.isna(skills_str) or skills_str.strip() == '':
         return 0, 0, ""
     
-    skills_lower = skills_str.lower()
-    total_score = 0
-    high_value_count = 0
-    matched_skills = []
-    
-    for skill, weight in HIGH_VALUE_SKILLS.items():
-        if skill.lower() in skills_lower:
-            total_score += weight
-            high_value_count += 1
-            matched_skills.append(f"{skill}({weight})")
-    
-    return total_score, high_value_count, ", ".join(matched_skills)
+    return SKILL_MATCHER.score(skills_str)
+
+def calculate_skill_scores(skills_column):
+    """
+    Column version of calculate_skill_score for a pandas Series of skills strings.
+    Returns a DataFrame with skill_score, high_value_count and matched_skills.
+    """
+    return SKILL_MATCHER.score_column(skills_column)
 
 def get_seniority_multiplier(job_title):
     """Get salary multiplier based on seniority"""
-    title_lower = job_title.lower()
-    if 'principal' in title_lower or 'lead' in title_lower:
-        return 1.8
-    elif 'staff' in title_lower:
-        return 1.6
-    elif 'senior' in title_lower or 'sr' in title_lower:
-        return 1.3
-    elif 'junior' in title_lower or 'jr' in title_lower:
-        return 0.7
-    else:
-        return 1.0  # Mid-level
+    return get_rules().classify_title(job_title)[1]
 
 def predict_salary_realistic(
     job_title,
@@ -150,90 +157,23 @@ def predict_salary_realistic(
     if skill_score == 0:
         return f"⚠️ LOW VALUE SKILLS: Your skills don't include high-value technical skills. Expected salary: 5,000-8,000 MAD/month for entry-level positions."
     
-    # ===== BASE SALARY FROM JOB ROLE =====
-    job_lower = job_title.lower()
+    rules = get_rules()
     
-    # Determine base salary by role type
-    if 'ai' in job_lower or 'machine learning' in job_lower or 'ml' in job_lower:
-        base_salary = 25000  # AI/ML roles start high
-    elif 'data scientist' in job_lower:
-        base_salary = 23000
-    elif 'devops' in job_lower or 'cloud' in job_lower:
-        base_salary = 22000
-    elif 'full stack' in job_lower:
-        base_salary = 18000
-    elif 'backend' in job_lower or 'software' in job_lower:
-        base_salary = 17000
-    elif 'frontend' in job_lower or 'mobile' in job_lower:
-        base_salary = 15000
-    elif 'data' in job_lower or 'analyst' in job_lower:
-        base_salary = 14000
-    elif 'qa' in job_lower or 'test' in job_lower:
-        base_salary = 12000
-    elif 'engineer' in job_lower:
-        base_salary = 16000
-    else:
-        base_salary = 12000
-    
-    # ===== SENIORITY MULTIPLIER =====
-    seniority_mult = get_seniority_multiplier(job_title)
+    # ===== BASE SALARY FROM JOB ROLE & SENIORITY =====
+    # First matching keyword rule wins; memoized per title
+    base_salary, seniority_mult = rules.classify_title(job_title)
     
     # ===== EXPERIENCE MULTIPLIER (HUGE IMPACT!) =====
-    if experience_years == 0:
-        exp_mult = 0.6  # 40% reduction for no experience
-    elif experience_years <= 1:
-        exp_mult = 0.75
-    elif experience_years <= 2:
-        exp_mult = 0.9
-    elif experience_years <= 3:
-        exp_mult = 1.0
-    elif experience_years <= 5:
-        exp_mult = 1.2
-    elif experience_years <= 7:
-        exp_mult = 1.5
-    elif experience_years <= 10:
-        exp_mult = 1.8
-    elif experience_years <= 15:
-        exp_mult = 2.2
-    else:
-        exp_mult = 2.5  # 15+ years = 2.5x multiplier
+    exp_mult = rules.experience_multiplier(experience_years)
     
     # ===== SKILL QUALITY MULTIPLIER (QUALITY > QUANTITY!) =====
-    # This is KEY: high-value skills should multiply salary significantly
-    skill_mult = 1.0 + (skill_score * 0.15)  # Each skill point adds 15%
+    # High-value skills multiply salary, with a bonus for many of them
+    skill_mult = rules.skill_multiplier(skill_score, high_value_count)
     
-    # Bonus for many high-value skills
-    if high_value_count >= 6:
-        skill_mult *= 1.3  # 30% bonus for 6+ premium skills
-    elif high_value_count >= 4:
-        skill_mult *= 1.15  # 15% bonus for 4-5 premium skills
-    
-    # ===== EDUCATION MULTIPLIER =====
-    if education == 'PhD':
-        edu_mult = 1.35
-    elif education == "Master's Degree":
-        edu_mult = 1.20
-    elif education == "Bachelor's Degree":
-        edu_mult = 1.0
-    else:
-        edu_mult = 0.85
-    
-    # ===== LOCATION MULTIPLIER =====
-    location_mult = {
-        'Casablanca': 1.18,
-        'Rabat': 1.15,
-        'Tangier': 1.08,
-        'Marrakech': 1.08,
-        'Mohammedia': 1.10,
-    }.get(location, 1.0)
-    
-    # ===== JOB TYPE MULTIPLIER =====
-    type_mult = {
-        'Full-time': 1.0,
-        'Contract': 1.15,
-        'Part-time': 0.65,
-        'Internship': 0.50
-    }.get(job_type, 1.0)
+    # ===== EDUCATION / LOCATION / JOB TYPE MULTIPLIERS =====
+    edu_mult = rules.education.get(education, rules.education_default)
+    location_mult = rules.location.get(location, rules.location_default)
+    type_mult = rules.job_type.get(job_type, rules.job_type_default)
     
     # ===== FINAL CALCULATION =====
     predicted_salary = (
@@ -247,13 +187,13 @@ def predict_salary_realistic(
     )
     
     # Round to nearest 100
-    predicted_salary = round(predicted_salary / 100) * 100
+    predicted_salary = round(predicted_salary / rules.round_to) * rules.round_to
     
     # Apply realistic bounds
-    if predicted_salary < 4000:
-        predicted_salary = 4000
-    elif predicted_salary > 120000:
-        predicted_salary = 120000
+    if predicted_salary < rules.min_salary:
+        predicted_salary = rules.min_salary
+    elif predicted_salary > rules.max_salary:
+        predicted_salary = rules.max_salary
     
     # Return detailed result
     result = {
@@ -277,128 +217,227 @@ def predict_salary_realistic(
     return result
 
 
+# ===== BATCH MODE =====
+# Vectorized predict_salary_realistic over a DataFrame of profiles, driven by
+# the same compiled rules. Every multiplier is a NumPy lookup and the final
+# product is taken in the same order as the scalar path, so results are
+# bit-identical to it.
+
+# Per-row status codes (the scalar path returns these as strings)
+OK = 0
+ERROR_NO_SKILLS = 1
+ERROR_NEGATIVE_EXPERIENCE = 2
+WARNING_EXPERIENCE_TOO_HIGH = 3
+WARNING_LOW_VALUE_SKILLS = 4
+
+BATCH_RESULT_DTYPE = np.dtype([
+    ('salary', np.int64),
+    ('base_salary', np.float64),
+    ('seniority_mult', np.float64),
+    ('experience_mult', np.float64),
+    ('skill_mult', np.float64),
+    ('education_mult', np.float64),
+    ('location_mult', np.float64),
+    ('job_type_mult', np.float64),
+    ('skill_score', np.float64),
+    ('high_value_count', np.int64),
+    ('error', np.int8),
+])
+
+def predict_salary_realistic_batch(profiles):
+    """
+    Score a DataFrame of profiles at once.
+    Columns: job_title, location, education, experience_years, job_type and
+    skills (a list of skills or a comma separated string per row).
+    Returns a structured array (BATCH_RESULT_DTYPE) with one row per profile;
+    rows with a non-zero error code have salary 0.
+    """
+    rules = get_rules()
+    n = len(profiles)
+    skills = pd.Series([
+        ', '.join(s) if isinstance(s, (list, tuple)) else ('' if pd.isna(s) else s)
+        for s in profiles['skills']
+    ], index=profiles.index, dtype=object)
+    experience = profiles['experience_years'].to_numpy(dtype=np.float64)
+    # Titles repeat heavily: classify each distinct title once
+    title_codes, titles = pd.factorize(profiles['job_title'].astype(str))
+    classified = np.array([rules.classify_title(title) for title in titles], dtype=np.float64).reshape(-1, 2)
+
+    scores = SKILL_MATCHER.score_column(skills)
+    skill_score = scores['skill_score'].to_numpy()
+    high_value_count = scores['high_value_count'].to_numpy()
+
+    result = np.zeros(n, dtype=BATCH_RESULT_DTYPE)
+    result['error'] = np.select(
+        [skills.to_numpy() == '', experience < 0, experience > 50, skill_score == 0],
+        [ERROR_NO_SKILLS, ERROR_NEGATIVE_EXPERIENCE, WARNING_EXPERIENCE_TOO_HIGH, WARNING_LOW_VALUE_SKILLS],
+        default=OK
+    )
+
+    base_salary = classified[title_codes, 0]
+    seniority_mult = classified[title_codes, 1]
+    exp_mult = rules.experience_multipliers_for(experience)
+
+    skill_mult = 1.0 + (skill_score * rules.skill_points_multiplier)
+    skill_mult = np.select(
+        [high_value_count >= min_count for min_count, _ in rules.skill_count_bonuses],
+        [skill_mult * multiplier for _, multiplier in rules.skill_count_bonuses],
+        default=skill_mult
+    )
+
+    edu_mult = profiles['education'].map(rules.education).fillna(rules.education_default).to_numpy(dtype=np.float64)
+    location_mult = profiles['location'].map(rules.location).fillna(rules.location_default).to_numpy(dtype=np.float64)
+    type_mult = profiles['job_type'].map(rules.job_type).fillna(rules.job_type_default).to_numpy(dtype=np.float64)
+
+    # Same multiplication order as the scalar path
+    predicted = base_salary * seniority_mult * exp_mult * skill_mult * edu_mult * location_mult * type_mult
+    predicted = np.clip(np.round(predicted / rules.round_to) * rules.round_to, rules.min_salary, rules.max_salary)
+
+    result['salary'] = np.where(result['error'] == OK, predicted, 0)
+    result['base_salary'] = base_salary
+    result['seniority_mult'] = seniority_mult
+    result['experience_mult'] = exp_mult
+    result['skill_mult'] = skill_mult
+    result['education_mult'] = edu_mult
+    result['location_mult'] = location_mult
+    result['job_type_mult'] = type_mult
+    result['skill_score'] = skill_score
+    result['high_value_count'] = high_value_count
+    return result
+
+
 # ===== TEST CASES =====
-print("\n" + "="*80)
-print("🧪 TEST CASE 1: Junior AI Engineer (0 experience)")
-print("="*80)
-result1 = predict_salary_realistic(
-    job_title='AI Engineer',
-    location='Casablanca',
-    education="Master's Degree",
-    experience_years=0,
-    job_type='Full-time',
-    skills_list=['Python', 'Machine Learning']
-)
-if isinstance(result1, dict):
-    print(f"💰 Predicted Salary: {result1['salary']:,} MAD/month")
-    print(f"\n📊 Breakdown:")
-    for key, val in result1['breakdown'].items():
-        print(f"   {key}: {val}")
-    print(f"\n🎯 Skills Analysis:")
-    print(f"   Score: {result1['skill_analysis']['skill_score']}")
-    print(f"   High-value skills: {result1['skill_analysis']['high_value_count']}")
-else:
-    print(result1)
-
-print("\n" + "="*80)
-print("🧪 TEST CASE 2: Senior AI Engineer (10 years, many premium skills)")
-print("="*80)
-result2 = predict_salary_realistic(
-    job_title='Senior AI Engineer',
-    location='Casablanca',
-    education="Master's Degree",
-    experience_years=10,
-    job_type='Full-time',
-    skills_list=['Python', 'Machine Learning', 'TensorFlow', 'Deep Learning', 'AWS', 'Docker', 'Kubernetes']
-)
-if isinstance(result2, dict):
-    print(f"💰 Predicted Salary: {result2['salary']:,} MAD/month")
-    print(f"💡 That's {result2['salary'] - result1['salary']:,} MAD more than 0 experience!")
-    print(f"\n📊 Breakdown:")
-    for key, val in result2['breakdown'].items():
-        print(f"   {key}: {val}")
-    print(f"\n🎯 Skills Analysis:")
-    print(f"   Score: {result2['skill_analysis']['skill_score']}")
-    print(f"   High-value skills: {result2['skill_analysis']['high_value_count']}")
-    print(f"   Matched: {result2['skill_analysis']['matched_skills']}")
-else:
-    print(result2)
-
-print("\n" + "="*80)
-print("🧪 TEST CASE 3: Your Example (AI Engineer, 0 years, 7 high-value skills)")
-print("="*80)
-result3 = predict_salary_realistic(
-    job_title='AI Engineer',
-    location='Casablanca',
-    education="Master's Degree",
-    experience_years=0,
-    job_type='Full-time',
-    skills_list=['C', 'Linux', 'Laravel', 'Java', 'IoT', 'Machine Learning', 'React', 'Node.js', 'Python', 'Docker', 'AWS', 'PostgreSQL']
-)
-if isinstance(result3, dict):
-    print(f"💰 Predicted Salary: {result3['salary']:,} MAD/month")
-    print(f"💡 Even with 0 experience, many premium skills boost salary!")
-    print(f"\n📊 Breakdown:")
-    for key, val in result3['breakdown'].items():
-        print(f"   {key}: {val}")
-    print(f"\n🎯 Skills Analysis:")
-    print(f"   Score: {result3['skill_analysis']['skill_score']}")
-    print(f"   High-value skills: {result3['skill_analysis']['high_value_count']}")
-else:
-    print(result3)
-
-print("\n" + "="*80)
-print("🧪 TEST CASE 4: Same skills but 10 years experience")
-print("="*80)
-result4 = predict_salary_realistic(
-    job_title='Senior AI Engineer',
-    location='Casablanca',
-    education="Master's Degree",
-    experience_years=10,
-    job_type='Full-time',
-    skills_list=['C', 'Linux', 'Laravel', 'Java', 'IoT', 'Machine Learning', 'React', 'Node.js', 'Python', 'Docker', 'AWS', 'PostgreSQL']
-)
-if isinstance(result4, dict):
-    print(f"💰 Predicted Salary: {result4['salary']:,} MAD/month")
-    print(f"💡 Experience boost: +{result4['salary'] - result3['salary']:,} MAD ({((result4['salary']/result3['salary'])-1)*100:.0f}% increase!)")
-    print(f"\n📊 Breakdown:")
-    for key, val in result4['breakdown'].items():
-        print(f"   {key}: {val}")
-else:
-    print(result4)
-
-print("\n" + "="*80)
-print("🧪 TEST CASE 5: Negative experience (should fail)")
-print("="*80)
-result5 = predict_salary_realistic(
-    job_title='Software Engineer',
-    location='Rabat',
-    education="Bachelor's Degree",
-    experience_years=-2,
-    job_type='Full-time',
-    skills_list=['Python', 'Java']
-)
-print(result5)
-
-print("\n" + "="*80)
-print("🧪 TEST CASE 6: No high-value skills")
-print("="*80)
-result6 = predict_salary_realistic(
-    job_title='Web Developer',
-    location='Rabat',
-    education="Bachelor's Degree",
-    experience_years=3,
-    job_type='Full-time',
-    skills_list=['HTML', 'CSS', 'Bootstrap', 'jQuery']
-)
-print(result6)
-
-print("\n" + "="*80)
-print("✅ Model is now REALISTIC and LOGICAL!")
-print("="*80)
-print("\n🎯 Key Improvements:")
-print("1. ✅ High-value skills (AI/ML/Cloud) have MASSIVE impact")
-print("2. ✅ Experience 0→10 years = 200-300% salary increase")
-print("3. ✅ Input validation (no negative experience)")
-print("4. ✅ Skill QUALITY matters more than quantity")
-print("5. ✅ Realistic salary ranges (4k - 120k MAD)")
+def main():
+    stats = load_dataset_stats()
+    print("📊 Dataset Statistics:")
+    print(f"Total jobs: {stats['total_jobs']:,}")
+    print(f"Salary range: {stats['salary_min']:,} - {stats['salary_max']:,} MAD/month")
+    print(f"Average: {stats['salary_mean']:,.0f} MAD/month\n")
+    print("\n" + "="*80)
+    print("🧪 TEST CASE 1: Junior AI Engineer (0 experience)")
+    print("="*80)
+    result1 = predict_salary_realistic(
+        job_title='AI Engineer',
+        location='Casablanca',
+        education="Master's Degree",
+        experience_years=0,
+        job_type='Full-time',
+        skills_list=['Python', 'Machine Learning']
+    )
+    if isinstance(result1, dict):
+        print(f"💰 Predicted Salary: {result1['salary']:,} MAD/month")
+        print(f"\n📊 Breakdown:")
+        for key, val in result1['breakdown'].items():
+            print(f"   {key}: {val}")
+        print(f"\n🎯 Skills Analysis:")
+        print(f"   Score: {result1['skill_analysis']['skill_score']}")
+        print(f"   High-value skills: {result1['skill_analysis']['high_value_count']}")
+    else:
+        print(result1)
+
+    print("\n" + "="*80)
+    print("🧪 TEST CASE 2: Senior AI Engineer (10 years, many premium skills)")
+    print("="*80)
+    result2 = predict_salary_realistic(
+        job_title='Senior AI Engineer',
+        location='Casablanca',
+        education="Master's Degree",
+        experience_years=10,
+        job_type='Full-time',
+        skills_list=['Python', 'Machine Learning', 'TensorFlow', 'Deep Learning', 'AWS', 'Docker', 'Kubernetes']
+    )
+    if isinstance(result2, dict):
+        print(f"💰 Predicted Salary: {result2['salary']:,} MAD/month")
+        print(f"💡 That's {result2['salary'] - result1['salary']:,} MAD more than 0 experience!")
+        print(f"\n📊 Breakdown:")
+        for key, val in result2['breakdown'].items():
+            print(f"   {key}: {val}")
+        print(f"\n🎯 Skills Analysis:")
+        print(f"   Score: {result2['skill_analysis']['skill_score']}")
+        print(f"   High-value skills: {result2['skill_analysis']['high_value_count']}")
+        print(f"   Matched: {result2['skill_analysis']['matched_skills']}")
+    else:
+        print(result2)
+
+    print("\n" + "="*80)
+    print("🧪 TEST CASE 3: Your Example (AI Engineer, 0 years, 7 high-value skills)")
+    print("="*80)
+    result3 = predict_salary_realistic(
+        job_title='AI Engineer',
+        location='Casablanca',
+        education="Master's Degree",
+        experience_years=0,
+        job_type='Full-time',
+        skills_list=['C', 'Linux', 'Laravel', 'Java', 'IoT', 'Machine Learning', 'React', 'Node.js', 'Python', 'Docker', 'AWS', 'PostgreSQL']
+    )
+    if isinstance(result3, dict):
+        print(f"💰 Predicted Salary: {result3['salary']:,} MAD/month")
+        print(f"💡 Even with 0 experience, many premium skills boost salary!")
+        print(f"\n📊 Breakdown:")
+        for key, val in result3['breakdown'].items():
+            print(f"   {key}: {val}")
+        print(f"\n🎯 Skills Analysis:")
+        print(f"   Score: {result3['skill_analysis']['skill_score']}")
+        print(f"   High-value skills: {result3['skill_analysis']['high_value_count']}")
+    else:
+        print(result3)
+
+    print("\n" + "="*80)
+    print("🧪 TEST CASE 4: Same skills but 10 years experience")
+    print("="*80)
+    result4 = predict_salary_realistic(
+        job_title='Senior AI Engineer',
+        location='Casablanca',
+        education="Master's Degree",
+        experience_years=10,
+        job_type='Full-time',
+        skills_list=['C', 'Linux', 'Laravel', 'Java', 'IoT', 'Machine Learning', 'React', 'Node.js', 'Python', 'Docker', 'AWS', 'PostgreSQL']
+    )
+    if isinstance(result4, dict):
+        print(f"💰 Predicted Salary: {result4['salary']:,} MAD/month")
+        print(f"💡 Experience boost: +{result4['salary'] - result3['salary']:,} MAD ({((result4['salary']/result3['salary'])-1)*100:.0f}% increase!)")
+        print(f"\n📊 Breakdown:")
+        for key, val in result4['breakdown'].items():
+            print(f"   {key}: {val}")
+    else:
+        print(result4)
+
+    print("\n" + "="*80)
+    print("🧪 TEST CASE 5: Negative experience (should fail)")
+    print("="*80)
+    result5 = predict_salary_realistic(
+        job_title='Software Engineer',
+        location='Rabat',
+        education="Bachelor's Degree",
+        experience_years=-2,
+        job_type='Full-time',
+        skills_list=['Python', 'Java']
+    )
+    print(result5)
+
+    print("\n" + "="*80)
+    print("🧪 TEST CASE 6: No high-value skills")
+    print("="*80)
+    result6 = predict_salary_realistic(
+        job_title='Web Developer',
+        location='Rabat',
+        education="Bachelor's Degree",
+        experience_years=3,
+        job_type='Full-time',
+        skills_list=['HTML', 'CSS', 'Bootstrap', 'jQuery']
+    )
+    print(result6)
+
+    print("\n" + "="*80)
+    print("✅ Model is now REALISTIC and LOGICAL!")
+    print("="*80)
+    print("\n🎯 Key Improvements:")
+    print("1. ✅ High-value skills (AI/ML/Cloud) have MASSIVE impact")
+    print("2. ✅ Experience 0→10 years = 200-300% salary increase")
+    print("3. ✅ Input validation (no negative experience)")
+    print("4. ✅ Skill QUALITY matters more than quantity")
+    print("5. ✅ Realistic salary ranges (4k - 120k MAD)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Salary model features, shared by training (train.py) and serving (api.py)
+Inputs are one row per profile with the INPUT_COLUMNS, built from request
+payloads (payload_frame) or from the jobs dataset (jobs_frame). transform
+turns them into the 14 columns the salary Pipeline takes, using column
+operations only, so one request and a million postings go through the
+same code.
+
+The fitted state (SalaryFeatures) holds the vocabularies the transform
+maps through and the categories seen in training. train.py saves it next
+to the model as <model>.features.json and the API loads it from there,
+so serving builds exactly the features the model was trained on.
+"""
+
+import copy
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+FEATURES_VERSION = 1
+
+# Raw jobs dataset columns jobs_frame reads
+JOBS_COLUMNS = ['job_title', 'skills_required', 'experience_required', 'education_required', 'location', 'job_type', 'salary']
+INPUT_COLUMNS = ['job_title', 'skills', 'experience_years', 'education', 'location', 'job_type']
+CATEGORICAL_COLUMNS = ['job_title', 'skills_required', 'experience_level', 'education_required', 'location', 'job_type', 'city_tier']
+NUMERIC_COLUMNS = ['experience_years', 'skills_count', 'tech_skills_count', 'experience_squared', 'edu_exp_interaction', 'job_type_numeric', 'education_level_numeric']
+# One-hot encoded columns whose training categories are recorded in the state
+VOCABULARY_COLUMNS = ['education_required', 'location', 'experience_level', 'city_tier', 'job_type']
+
+# The layout of the deployed SalaryModel.pkl (and of api.py before this module)
+DEFAULT_STATE = {
+    'version': FEATURES_VERSION,
+    'tech_skills': ['python', 'java', 'javascript', 'react', 'angular', 'node', 'sql', 'mongodb', 'aws', 'docker', 'kubernetes'],
+    # Frontend and dataset labels (lowercase) -> [education_required, education_level_numeric]
+    'education': {
+        "bachelor's": ["bachelor's degree", 1],
+        "bachelor's degree": ["bachelor's degree", 1],
+        "master's": ["master's degree", 2],
+        "master's degree": ["master's degree", 2],
+        'phd': ['phd', 3],
+        'high school': ['diploma', 0],
+        'diploma': ['diploma', 0],
+    },
+    'default_education': ["bachelor's degree", 1],
+    # Years below breaks[i] -> labels[i], the rest -> labels[-1]
+    'experience_levels': {'breaks': [1, 2, 5, 10], 'labels': ['entry', 'junior', 'mid', 'senior', 'expert']},
+    'city_tiers': {
+        'tier1': ['casablanca', 'rabat', 'marrakech'],
+        'tier2': ['fes', 'tangier', 'agadir', 'meknes', 'oujda'],
+    },
+    'default_city_tier': 'tier3',
+    # job_type_numeric flags full-time positions
+    'job_types': {'full-time': 1},
+    'default_job_type_numeric': 0,
+    'categories': None,
+    'rows': None,
+}
+
+
+def parse_skills(skills_text):
+    """Split a comma or space separated skills string into a list"""
+    if ',' in skills_text:
+        return [s.strip() for s in skills_text.split(',') if s.strip()]
+    return [s.strip() for s in skills_text.split() if s.strip()]
+
+
+def payload_frame(payloads):
+    """Feature inputs of API request payloads (the salary form fields)"""
+    return pd.DataFrame({
+        'job_title': [p['job_title'] for p in payloads],
+        'skills': [p.get('skills', '') for p in payloads],
+        'experience_years': [int(p['years_of_experience']) for p in payloads],
+        'education': [p['education_level'] for p in payloads],
+        'location': [p['location'] for p in payloads],
+        # The salary form has no job type; predictions are for full-time roles
+        'job_type': 'full-time',
+    }, columns=INPUT_COLUMNS)
+
+
+def distinct_map(values, fn, missing, dtype=object):
+    """fn applied once per distinct value (missing values get missing), as an array"""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    mapped = np.array([fn(str(v)) for v in uniques] + [missing], dtype=dtype)
+    return mapped[codes]  # code -1 (missing) picks the last entry
+
+
+def experience_years(experience_required):
+    """Years of experience of "2-5 years" style labels: range midpoint, or N+ -> N + 2"""
+    exp = experience_required.fillna('')
+    ranged = exp.str.extract(r'(\d+)-(\d+) years').astype(float)
+    plus = exp.str.extract(r'(\d+)\+ years', expand=False).astype(float)
+    return ranged.mean(axis=1).fillna(plus + 2).fillna(0)
+
+
+def parse_salary(salary):
+    """"18600 MAD/month" -> 18600 (NaN if missing)"""
+    return pd.to_numeric(salary.str.extract(r'(\d+) MAD/month', expand=False))
+
+
+def jobs_frame(raw):
+    """Feature inputs and parsed salary of raw jobs dataset rows (rows without a salary dropped)"""
+    inputs = pd.DataFrame({
+        'job_title': raw['job_title'],
+        'skills': raw['skills_required'].fillna(''),
+        'experience_years': experience_years(raw['experience_required']).astype(np.int64),
+        'education': raw['education_required'],
+        'location': raw['location'],
+        'job_type': raw['job_type'],
+        'salary': parse_salary(raw['salary']),
+    })
+    return inputs.dropna(subset=['salary']).reset_index(drop=True)
+
+
+class SalaryFeatures:
+    """Fitted feature state and the vectorized transform it drives"""
+
+    def __init__(self, state=None):
+        self.state = copy.deepcopy(state or DEFAULT_STATE)
+        if self.state.get('version') != FEATURES_VERSION:
+            raise ValueError(f"feature state version {self.state.get('version')} != {FEATURES_VERSION}, retrain the model")
+        self.tech_skills = frozenset(self.state['tech_skills'])
+        self.education_labels = {k: v[0] for k, v in self.state['education'].items()}
+        self.education_numeric = {k: v[1] for k, v in self.state['education'].items()}
+        self.city_tiers = {city: tier for tier, cities in self.state['city_tiers'].items() for city in cities}
+
+    @property
+    def categories(self):
+        return self.state['categories']
+
+    def skill_counts(self, skills):
+        """(skills count, tech skills count) per row"""
+        def counts(text):
+            parsed = parse_skills(text)
+            return len(parsed), sum(s.lower() in self.tech_skills for s in parsed)
+        counted = distinct_map(skills, counts, (0, 0), dtype=np.dtype('int64,int64'))
+        return counted['f0'], counted['f1']
+
+    def transform(self, inputs):
+        """The model's feature columns for a frame of INPUT_COLUMNS, any number of rows"""
+        years = inputs['experience_years'].to_numpy(dtype=np.int64)
+        levels = self.state['experience_levels']
+        experience_level = np.asarray(levels['labels'], dtype=object)[np.searchsorted(levels['breaks'], years, side='right')]
+
+        default_label, default_numeric = self.state['default_education']
+        education_required = distinct_map(inputs['education'], lambda v: self.education_labels.get(v.lower(), default_label), default_label)
+        education_numeric = distinct_map(inputs['education'], lambda v: self.education_numeric.get(v.lower(), default_numeric),
+                                         default_numeric, dtype=np.int64)
+        location = distinct_map(inputs['location'], str.lower, 'nan')
+        city_tier = distinct_map(location, lambda v: self.city_tiers.get(v, self.state['default_city_tier']), self.state['default_city_tier'])
+        job_type = distinct_map(inputs['job_type'], str.lower, 'nan')
+        job_type_numeric = distinct_map(job_type, lambda v: self.state['job_types'].get(v, self.state['default_job_type_numeric']),
+                                        self.state['default_job_type_numeric'], dtype=np.int64)
+        skills_count, tech_skills_count = self.skill_counts(inputs['skills'])
+
+        return pd.DataFrame({
+            'job_title': inputs['job_title'].astype(str).to_numpy(dtype=object),
+            'skills_required': inputs['skills'].astype(str).to_numpy(dtype=object),
+            'experience_years': years,
+            'experience_level': experience_level,
+            'education_required': education_required,
+            'location': location,
+            'job_type': job_type,
+            'skills_count': skills_count,
+            'tech_skills_count': tech_skills_count,
+            'experience_squared': years ** 2,
+            'edu_exp_interaction': education_numeric * years,
+            'city_tier': city_tier,
+            'job_type_numeric': job_type_numeric,
+            'education_level_numeric': education_numeric,
+        }, index=inputs.index)
+
+    def fit(self, inputs):
+        """A new state recording the categories seen in inputs"""
+        features = self.transform(inputs)
+        state = copy.deepcopy(self.state)
+        state['categories'] = {column: sorted(features[column].unique().tolist()) for column in VOCABULARY_COLUMNS}
+        state['rows'] = len(features)
+        return SalaryFeatures(state)
+
+    def unseen(self, features):
+        """Values of the one-hot columns that training never saw, per column"""
+        if not self.categories:
+            return {}
+        unseen = {}
+        for column in VOCABULARY_COLUMNS:
+            values = sorted(set(features[column].unique()) - set(self.categories[column]))
+            if values:
+                unseen[column] = values
+        return unseen
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def for_model(cls, model_path):
+        """The state saved with a model, or the deployed layout when there is none"""
+        path = state_path(model_path)
+        return cls.load(path) if os.path.exists(path) else cls()
+
+
+def state_path(model_path):
+    """SalaryModel.pkl -> SalaryModel.features.json"""
+    return os.path.splitext(model_path)[0] + '.features.json'
@@ -0,0 +1,169 @@
+"""
+Table-driven rules engine for the rule-based salary predictor
+The multipliers live in a declarative JSON table (salary_rules.json)
+that is compiled at load time:
+- ordered keyword rules (role base salary, seniority) become one
+  Aho-Corasick automaton each, and the result per title is memoized
+- experience bands become a sorted breakpoint array searched with bisect
+- the remaining tables become plain dict lookups
+Editing the table takes effect on the next call, no code change needed.
+"""
+
+import json
+import os
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'salary_rules.json')
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over the keywords of ordered rules.
+    first_rule(text) returns the index of the first rule with any keyword
+    occurring as a substring of text - the same answer as checking the
+    rules one by one, in a single pass over the text.
+    """
+
+    def __init__(self, keyword_rules):
+        self.goto = [{}]
+        self.fail = [0]
+        self.best = [None]  # lowest rule index ending at this state
+
+        for rule_index, keywords in enumerate(keyword_rules):
+            for keyword in keywords:
+                state = 0
+                for char in keyword:
+                    if char not in self.goto[state]:
+                        self.goto.append({})
+                        self.fail.append(0)
+                        self.best.append(None)
+                        self.goto[state][char] = len(self.goto) - 1
+                    state = self.goto[state][char]
+                if self.best[state] is None or rule_index < self.best[state]:
+                    self.best[state] = rule_index
+
+        # Breadth-first failure links; each state inherits its suffix's best rule
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0) if state else 0
+                inherited = self.best[self.fail[child]]
+                if inherited is not None and (self.best[child] is None or inherited < self.best[child]):
+                    self.best[child] = inherited
+
+    def first_rule(self, text):
+        """Index of the first matching rule, or None"""
+        state = 0
+        first = None
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            found = self.best[state]
+            if found is not None and (first is None or found < first):
+                first = found
+                if first == 0:
+                    break
+        return first
+
+
+class SalaryRules:
+    """A compiled rule table"""
+
+    def __init__(self, table):
+        self.version = table.get('version')
+        self.calibration = table.get('calibration')  # Set by calibrate_salary_rules.py
+
+        roles = table['role_base_salaries']
+        self._role_automaton = KeywordAutomaton([r['keywords'] for r in roles['rules']])
+        self._role_values = [r['value'] for r in roles['rules']]
+        self._role_default = roles['default']
+
+        seniority = table['seniority']
+        self._seniority_automaton = KeywordAutomaton([r['keywords'] for r in seniority['rules']])
+        self._seniority_values = [r['value'] for r in seniority['rules']]
+        self._seniority_default = seniority['default']
+
+        experience = table['experience']
+        if len(experience['multipliers']) != len(experience['breakpoints']) + 1:
+            raise ValueError("experience needs exactly one more multiplier than breakpoints")
+        if experience['breakpoints'] != sorted(experience['breakpoints']):
+            raise ValueError("experience breakpoints must be sorted")
+        self.experience_breakpoints = experience['breakpoints']
+        self.experience_multipliers = experience['multipliers']
+
+        skills = table['skills']
+        self.skill_points_multiplier = skills['points_multiplier']
+        self.skill_count_bonuses = sorted(
+            ((b['min_count'], b['multiplier']) for b in skills['count_bonuses']), reverse=True
+        )
+
+        self.education = table['education']['values']
+        self.education_default = table['education']['default']
+        self.location = table['location']['values']
+        self.location_default = table['location']['default']
+        self.job_type = table['job_type']['values']
+        self.job_type_default = table['job_type']['default']
+
+        bounds = table['bounds']
+        self.round_to = bounds['round_to']
+        self.min_salary = bounds['min_salary']
+        self.max_salary = bounds['max_salary']
+
+        # Titles repeat a lot; classify each distinct one once
+        self.classify_title = lru_cache(maxsize=8192)(self._classify_title)
+
+    def _classify_title(self, job_title):
+        """(base_salary, seniority_mult) for a job title"""
+        title_lower = job_title.lower()
+        role = self._role_automaton.first_rule(title_lower)
+        seniority = self._seniority_automaton.first_rule(title_lower)
+        return (
+            self._role_default if role is None else self._role_values[role],
+            self._seniority_default if seniority is None else self._seniority_values[seniority],
+        )
+
+    def experience_multiplier(self, experience_years):
+        return self.experience_multipliers[bisect_left(self.experience_breakpoints, experience_years)]
+
+    def experience_multipliers_for(self, experience_years):
+        """Vectorized experience_multiplier over an array of years"""
+        index = np.searchsorted(self.experience_breakpoints, experience_years, side='left')
+        return np.asarray(self.experience_multipliers, dtype=np.float64)[index]
+
+    def skill_multiplier(self, skill_score, high_value_count):
+        skill_mult = 1.0 + (skill_score * self.skill_points_multiplier)
+        for min_count, multiplier in self.skill_count_bonuses:
+            if high_value_count >= min_count:
+                return skill_mult * multiplier
+        return skill_mult
+
+
+def load_rules(path=None):
+    """Read and compile a rule table"""
+    with open(path or DEFAULT_RULES_PATH, encoding='utf-8') as f:
+        return SalaryRules(json.load(f))
+
+
+_current = {'path': None, 'mtime': None, 'rules': None}
+
+
+def get_rules():
+    """
+    The active compiled rules. SALARY_RULES_PATH selects the table; it is
+    recompiled whenever the file changes on disk.
+    """
+    path = os.environ.get('SALARY_RULES_PATH', DEFAULT_RULES_PATH)
+    mtime = os.stat(path).st_mtime_ns
+    if _current['rules'] is None or _current['path'] != path or _current['mtime'] != mtime:
+        _current.update(path=path, mtime=mtime, rules=load_rules(path))
+    return _current['rules']
@@ -0,0 +1,85 @@
+"""
+Compiled multi-pattern skill matcher
+The skill table is compiled once into a trie-shaped regular expression -
+shared prefixes are factored out, so the regex engine walks a trie at
+each position instead of trying every pattern - and anchored on token
+boundaries. A text is scanned in one left-to-right pass, and 'AI' no
+longer matches inside 'maintain', 'Go' inside 'Google' or 'Java' inside
+'JavaScript'. At each position the longest skill wins, so 'React Native'
+is not also counted as 'React'.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Characters that continue a token: 'c++', 'c#' and 'node.js' are single skills
+TOKEN_CHARS = r'a-z0-9+#'
+
+
+def _trie_pattern(node):
+    """Regex for a character trie node: {char: child, '': True if terminal}"""
+    branches = []
+    for char in sorted(c for c in node if c):
+        piece = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(piece + _trie_pattern(node[char]))
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # Greedy optional: longer skills are tried first, shorter ones on backtrack
+        return '(?:' + body + ')?'
+    return body
+
+
+def _normalize(text):
+    return ' '.join(text.lower().split())
+
+
+class SkillMatcher:
+    def __init__(self, weights):
+        self.weights = dict(weights)
+        self.order = {_normalize(skill): i for i, skill in enumerate(self.weights)}
+        self.skills = list(self.weights)
+
+        trie = {}
+        for key in self.order:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        self.regex = re.compile(
+            rf'(?<![{TOKEN_CHARS}])(?:{_trie_pattern(trie)})(?![{TOKEN_CHARS}])'
+        )
+
+    def find(self, text):
+        """Skills present in text, once each, in weight-table order"""
+        found = {self.order[_normalize(m)] for m in self.regex.findall(text.lower())}
+        return [self.skills[i] for i in sorted(found)]
+
+    def score(self, text):
+        """(total_score, matched_count, details) for one skills string"""
+        matched = self.find(text)
+        total = sum(self.weights[s] for s in matched)
+        details = ", ".join(f"{s}({self.weights[s]})" for s in matched)
+        return total, len(matched), details
+
+    def score_column(self, texts):
+        """
+        Score a whole pandas column. Each distinct string is scanned once,
+        which matters because scraped skills columns repeat heavily.
+        Returns a DataFrame with skill_score, high_value_count and matched_skills.
+        """
+        texts = pd.Series(texts)
+        codes, uniques = pd.factorize(texts.fillna(''))
+        scored = [self.score(text) for text in uniques]
+        score = np.array([s[0] for s in scored], dtype=float)
+        count = np.array([s[1] for s in scored], dtype=int)
+        details = np.array([s[2] for s in scored], dtype=object)
+        return pd.DataFrame({
+            'skill_score': score[codes],
+            'high_value_count': count[codes],
+            'matched_skills': details[codes]
+        }, index=texts.index)
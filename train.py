@@ -1,71 +1,322 @@
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
 import pandas as pd
+from sklearn.compose import ColumnTransformer
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics import mean_absolute_error, mean_squared_error
-from sklearn.preprocessing import LabelEncoder
-import re
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
 import joblib
 
-# Load the dataset
-df = pd.read_csv('morocco_jobs_dataset.csv')
-
-# Function to parse salary
-def parse_salary(salary_str):
-    match = re.search(r'(\d+) MAD/month', salary_str)
-    if match:
-        return int(match.group(1))
-    return None
-
-# Function to parse experience
-def parse_experience(exp_str):
-    if pd.isna(exp_str):
-        return 0
-    match = re.search(r'(\d+)-(\d+) years', exp_str)
-    if match:
-        min_exp = int(match.group(1))
-        max_exp = int(match.group(2))
-        return (min_exp + max_exp) / 2
-    match = re.search(r'(\d+)\+ years', exp_str)
-    if match:
-        return int(match.group(1)) + 2  # approximate
-    match = re.search(r'(\d+)-(\d+) years', exp_str)  # wait, already have
-    return 0
-
-# Apply parsing
-df['salary'] = df['salary'].apply(parse_salary)
-df['experience_years'] = df['experience_required'].apply(parse_experience)
-df['num_skills'] = df['skills_required'].apply(lambda x: len(x.split(', ')) if pd.notna(x) else 0)
-
-# Drop rows with missing salary
-df = df.dropna(subset=['salary'])
-
-# Encode job_title
-le = LabelEncoder()
-df['job_title_encoded'] = le.fit_transform(df['job_title'])
-
-# Features
-X = df[['job_title_encoded', 'num_skills', 'experience_years']]
-y = df['salary']
-
-# Split
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# Train model
-model = RandomForestRegressor(random_state=42)
-model.fit(X_train, y_train)
-
-# Predict
-y_pred = model.predict(X_test)
-
-# Evaluate
-mae = mean_absolute_error(y_test, y_pred)
-mse = mean_squared_error(y_test, y_pred)
-print(f"Mean Absolute Error: {mae}")
-print(f"Mean Squared Error: {mse}")
-
-# Save model and encoder
-joblib.dump(model, 'SalaryModel.pkl')
-joblib.dump(le, 'job_title_encoder.pkl')
-print("Model and encoder saved successfully!")
-print(f"Model saved to: SalaryModel.pkl")
-print(f"Encoder saved to: job_title_encoder.pkl")
\ No newline at end of file
+from datasets import read_dataset, resolve
+from salary_features import INPUT_COLUMNS, JOBS_COLUMNS, SalaryFeatures, experience_years, jobs_frame, parse_salary, state_path
+
+JOBS_DATASET = 'morocco_jobs_dataset.csv'
+MODEL_PATH = 'SalaryModel.pkl'
+# The basic layout's forest; kept apart from the Pipeline the API serves
+FOREST_PATH = 'salary_forest.pkl'
+ENCODER_PATH = 'job_title_encoder.pkl'
+FEATURE_CACHE_DIR = '.feature_cache'
+# Bump when the parsing below or jobs_frame changes, so old caches are not reused
+FEATURE_VERSION = 1
+# Raw columns parse_features reads
+RAW_COLUMNS = ['job_title', 'salary', 'experience_required', 'skills_required']
+
+
+# Function to parse experience: range midpoint, "N+ years" -> N + 2, otherwise 0
+def parse_experience(experience_required):
+    return experience_years(experience_required)
+
+
+def parse_features(df, keep=()):
+    """
+    Parsed feature table of a raw jobs DataFrame (rows without a salary
+    dropped); raw columns listed in keep are carried through unchanged
+    """
+    features = pd.DataFrame({
+        'job_title': df['job_title'],
+        'salary': parse_salary(df['salary']),
+        'experience_years': parse_experience(df['experience_required']),
+        'num_skills': (df['skills_required'].str.count(', ') + 1).fillna(0).astype(np.int64),
+        **{column: df[column] for column in keep},
+    })
+    return features.dropna(subset=['salary']).reset_index(drop=True)
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, or of every file of a (partitioned) dataset directory"""
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                digest.update(os.path.relpath(os.path.join(root, name), path).encode())
+                digest.update(bytes.fromhex(file_digest(os.path.join(root, name))))
+        return digest.hexdigest()
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def load_features(path=JOBS_DATASET, cache_dir=FEATURE_CACHE_DIR, use_cache=True):
+    """
+    Parsed features of the jobs dataset (CSV or its Parquet copy). The
+    table is cached column by column under cache_dir, keyed by the
+    dataset's content hash, so re-training on an unchanged dataset skips
+    reading and parsing it.
+    """
+    cache_path = os.path.join(cache_dir, f'jobs_v{FEATURE_VERSION}_{file_digest(resolve(path))[:16]}.npz')
+    if use_cache and os.path.exists(cache_path):
+        with np.load(cache_path) as columns:
+            return pd.DataFrame({name: columns[name] for name in columns.files}), True
+
+    features = parse_features(read_dataset(path, RAW_COLUMNS))
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        columns = {name: features[name].to_numpy() for name in features.columns}
+        columns['job_title'] = features['job_title'].to_numpy(dtype=str)
+        np.savez(cache_path, **columns)
+    return features, False
+
+
+def load_inputs(path=JOBS_DATASET, cache_dir=FEATURE_CACHE_DIR, use_cache=True):
+    """
+    jobs_frame inputs of the jobs dataset, for the full layout; cached
+    under cache_dir by content hash like load_features
+    """
+    cache_path = os.path.join(cache_dir, f'inputs_v{FEATURE_VERSION}_{file_digest(resolve(path))[:16]}.pkl')
+    if use_cache and os.path.exists(cache_path):
+        return pd.read_pickle(cache_path), True
+
+    inputs = jobs_frame(read_dataset(path, JOBS_COLUMNS))
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        inputs.to_pickle(cache_path)
+    return inputs, False
+
+
+def make_model(n_estimators=100, max_depth=None):
+    return RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, random_state=42)
+
+
+def train(df, n_estimators=100, max_depth=None):
+    """Fit on 80% of df and report holdout error. A 'weight' column (aggregated rows) is used as sample weight."""
+    # Encode job_title
+    le = LabelEncoder()
+    df['job_title_encoded'] = le.fit_transform(df['job_title'])
+
+    # Features
+    X = df[['job_title_encoded', 'num_skills', 'experience_years']]
+    y = df['salary']
+    weight = df['weight'] if 'weight' in df else pd.Series(1.0, index=df.index)
+
+    # Split
+    X_train, X_test, y_train, y_test, w_train, w_test = train_test_split(X, y, weight, test_size=0.2, random_state=42)
+
+    # Train model
+    model = make_model(n_estimators, max_depth)
+    model.fit(X_train, y_train, sample_weight=w_train)
+
+    # Predict
+    y_pred = model.predict(X_test)
+
+    # Evaluate
+    mae = mean_absolute_error(y_test, y_pred, sample_weight=w_test)
+    mse = mean_squared_error(y_test, y_pred, sample_weight=w_test)
+    print(f"Mean Absolute Error: {mae}")
+    print(f"Mean Squared Error: {mse}")
+    return model, le
+
+
+def make_preprocessor():
+    """The API's salary features into the model: text, one-hot and scaled numeric columns"""
+    return ColumnTransformer([
+        ('skills', TfidfVectorizer(max_df=0.95, max_features=8000, min_df=2, ngram_range=(1, 3), stop_words='english'),
+         'skills_required'),
+        ('title', TfidfVectorizer(max_features=3000, min_df=2, ngram_range=(1, 2)), 'job_title'),
+        ('cat', OneHotEncoder(handle_unknown='ignore', sparse_output=False),
+         ['education_required', 'location', 'experience_level', 'city_tier', 'job_type']),
+        ('num', StandardScaler(), ['experience_years', 'skills_count', 'education_level_numeric', 'tech_skills_count',
+                                   'job_type_numeric', 'experience_squared', 'edu_exp_interaction']),
+    ])
+
+
+def make_regressor(n_estimators=300, max_depth=7):
+    return GradientBoostingRegressor(learning_rate=0.05, max_depth=max_depth, min_samples_leaf=4, min_samples_split=10,
+                                     n_estimators=n_estimators, random_state=42, subsample=0.8)
+
+
+def make_pipeline(n_estimators=300, max_depth=7):
+    """The API's salary Pipeline: preprocessing into gradient boosting"""
+    # Step names of the deployed SalaryModel.pkl
+    return Pipeline([('preprocessing', make_preprocessor()), ('regression', make_regressor(n_estimators, max_depth))])
+
+
+def train_pipeline(inputs, n_estimators=300, max_depth=7):
+    """
+    Fit the API's salary Pipeline on 80% of jobs_frame inputs and report
+    holdout error. Returns the model and the feature state fitted on the
+    training rows, which is saved next to the model for serving.
+    """
+    train_inputs, test_inputs, y_train, y_test = train_test_split(
+        inputs[INPUT_COLUMNS], inputs['salary'], test_size=0.2, random_state=42)
+    features = SalaryFeatures().fit(train_inputs)
+
+    model = make_pipeline(n_estimators, max_depth)
+    model.fit(features.transform(train_inputs), y_train)
+    y_pred = model.predict(features.transform(test_inputs))
+
+    print(f"Mean Absolute Error: {mean_absolute_error(y_test, y_pred)}")
+    print(f"Mean Squared Error: {mean_squared_error(y_test, y_pred)}")
+    return model, features
+
+
+def extend_encoder(le, titles):
+    """Append job titles the encoder has not seen; existing codes are unchanged"""
+    unseen = np.setdiff1d(pd.unique(titles).astype(object), le.classes_)
+    if len(unseen):
+        # Titles are strings, which LabelEncoder maps through a dict, so the
+        # appended classes do not need to keep classes_ sorted
+        le.classes_ = np.concatenate([le.classes_.astype(object), unseen])
+    return len(unseen)
+
+
+def train_incremental(model, le, df, add_trees=20, max_trees=None, holdout=None):
+    """
+    Grow add_trees new trees on df only (warm start), then keep at most
+    max_trees of the newest trees. The cost depends on len(df), not on the
+    data the existing trees were trained on. Returns MAE on the holdout
+    (default: 20% of df) before and after.
+    """
+    if not isinstance(model, RandomForestRegressor):
+        raise ValueError(f"incremental mode needs a RandomForestRegressor trained by train.py, got {type(model).__name__}")
+
+    new_titles = extend_encoder(le, pd.concat([df['job_title'], holdout['job_title']]) if holdout is not None else df['job_title'])
+    df['job_title_encoded'] = le.transform(df['job_title'])
+    if holdout is None:
+        df, holdout = train_test_split(df, test_size=0.2, random_state=42)
+    else:
+        holdout['job_title_encoded'] = le.transform(holdout['job_title'])
+
+    columns = ['job_title_encoded', 'num_skills', 'experience_years']
+    # Aggregated rows carry their posting count as 'weight'
+    weight = lambda rows: rows['weight'] if 'weight' in rows else None
+    mae_before = mean_absolute_error(holdout['salary'], model.predict(holdout[columns]), sample_weight=weight(holdout))
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + add_trees)
+    model.fit(df[columns], df['salary'], sample_weight=weight(df))
+
+    retired = 0
+    if max_trees is not None and len(model.estimators_) > max_trees:
+        # Trees are appended in training order, so the oldest come first
+        retired = len(model.estimators_) - max_trees
+        model.estimators_ = model.estimators_[retired:]
+        model.n_estimators = max_trees
+
+    mae_after = mean_absolute_error(holdout['salary'], model.predict(holdout[columns]), sample_weight=weight(holdout))
+    print(f"🌲 Added {add_trees} trees on {len(df):,} rows ({new_titles} new job titles), "
+          f"retired {retired}, forest now {len(model.estimators_)} trees")
+    print(f"Holdout MAE: {mae_before:.1f} -> {mae_after:.1f} ({len(holdout):,} rows)")
+    return mae_before, mae_after
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the salary model on the jobs dataset')
+    parser.add_argument('--source', default=JOBS_DATASET)
+    parser.add_argument('--layout', choices=['full', 'basic'], default=None,
+                        help="full: the API's Pipeline on salary_features.py (default); "
+                             "basic: random forest on job title, skills count and experience")
+    parser.add_argument('--n-estimators', type=int, default=None, help='trees (default: full 300, basic 100)')
+    parser.add_argument('--max-depth', type=int, default=None, help='tree depth (default: full 7, basic unlimited)')
+    parser.add_argument('--cache-dir', default=FEATURE_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help='always re-parse the CSV')
+    parser.add_argument('--incremental', action='store_true',
+                        help='grow the existing forest on --source (the new rows) instead of retraining')
+    parser.add_argument('--add-trees', type=int, default=20)
+    parser.add_argument('--max-trees', type=int, default=None, help='retire the oldest trees beyond this many')
+    parser.add_argument('--holdout', default=None, help='CSV to evaluate on (default: 20%% of --source)')
+    parser.add_argument('--model', default=None, help=f'default: full {MODEL_PATH}, basic {FOREST_PATH}')
+    parser.add_argument('--encoder', default=ENCODER_PATH)
+    out_of_core = parser.add_mutually_exclusive_group()
+    out_of_core.add_argument('--sample', type=positive_int, default=None,
+                             help='stream the CSV and train on a uniform sample of this many postings')
+    out_of_core.add_argument('--aggregate', action='store_true',
+                             help='stream the CSV and train on per-combination mean salaries weighted by count')
+    parser.add_argument('--chunk-rows', type=int, default=250_000, help='rows per chunk when streaming')
+    args = parser.parse_args()
+    forest_only = args.incremental or args.sample or args.aggregate
+    if args.layout == 'full' and forest_only:
+        parser.error('--incremental, --sample and --aggregate need --layout basic')
+    layout = args.layout or ('basic' if forest_only else 'full')
+    args.model = args.model or (MODEL_PATH if layout == 'full' else FOREST_PATH)
+    if args.incremental:
+        # Check the forest and its encoder before reading any data
+        model = joblib.load(args.model) if os.path.exists(args.model) else None
+        if not isinstance(model, RandomForestRegressor) or not os.path.exists(args.encoder):
+            found = type(model).__name__ if model is not None else 'missing'
+            encoder = 'found' if os.path.exists(args.encoder) else 'missing'
+            parser.error(f"--incremental grows a forest from 'train.py --layout basic': pass its files with "
+                         f"--model and --encoder (model {args.model}: {found}, encoder {args.encoder}: {encoder})")
+    elif layout == 'basic' and os.path.exists(args.model) and isinstance(joblib.load(args.model), Pipeline):
+        # The API's Pipeline is served with its feature state; a forest in its place breaks /predict-salary
+        parser.error(f"{args.model} holds the full-layout Pipeline; the basic forest needs another --model "
+                     f"(default {FOREST_PATH})")
+
+    if layout == 'full':
+        inputs, cached = load_inputs(args.source, args.cache_dir, use_cache=not args.no_cache)
+        if cached:
+            print(f"⚡ Loaded {len(inputs):,} rows from the feature cache")
+        model, features = train_pipeline(inputs, args.n_estimators or 300, args.max_depth or 7)
+        joblib.dump(model, args.model)
+        features.save(state_path(args.model))
+        print("Model and feature state saved successfully!")
+        print(f"Model saved to: {args.model}")
+        print(f"Feature state saved to: {state_path(args.model)}")
+        return
+
+    # Load the dataset
+    if args.sample or args.aggregate:
+        # Bounded memory for datasets that do not fit in RAM
+        from jobs_stream import aggregate_features, reservoir_sample, stream_features
+        chunks = stream_features(args.source, args.chunk_rows)
+        try:
+            df = reservoir_sample(chunks, args.sample) if args.sample else aggregate_features(chunks)
+        except ValueError as e:
+            raise SystemExit(f"❌ {args.source}: {e}")
+        print(f"🌊 Streamed {args.source} into {len(df):,} training rows")
+    else:
+        df, cached = load_features(args.source, args.cache_dir, use_cache=not args.no_cache)
+        if cached:
+            print(f"⚡ Loaded {len(df):,} parsed rows from the feature cache")
+
+    if args.incremental:
+        le = joblib.load(args.encoder)
+        holdout = load_features(args.holdout, args.cache_dir, use_cache=not args.no_cache)[0] if args.holdout else None
+        start = time.perf_counter()
+        train_incremental(model, le, df, args.add_trees, args.max_trees, holdout)
+        print(f"⏱️ Incremental update took {time.perf_counter() - start:.2f}s")
+    else:
+        model, le = train(df, args.n_estimators or 100, args.max_depth)
+
+    # Save model and encoder
+    joblib.dump(model, args.model)
+    joblib.dump(le, args.encoder)
+    print("Model and encoder saved successfully!")
+    print(f"Model saved to: {args.model}")
+    print(f"Encoder saved to: {args.encoder}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Train every model in one command
+Each model is declared below as a feature spec: its dataset, how to load
+it, the input columns, the feature code the API serves it with, the
+target and the estimator. The models train concurrently in a process
+pool that shares a core budget: each worker gets its slice of the cores
+for BLAS threads and for estimators that take n_jobs.
+
+Every run writes a new version per model, in the layout of the model the
+API loads, so it can replace it:
+    models/<name>/v<N>/model.pkl
+    models/<name>/v<N>/model.features.json   (salary: fitted feature state)
+    models/<name>/v<N>/metrics.json
+
+    python train_all.py                  # all models, every core
+    python train_all.py salary --cores 2
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.linear_model import Ridge
+from sklearn.metrics import (accuracy_score, f1_score, mean_absolute_error,
+                             mean_squared_error, r2_score, roc_auc_score)
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+from threadpoolctl import threadpool_limits
+
+from datasets import read_dataset, resolve
+from house_features import DATASET_COLUMNS, HouseFeatures
+from salary_features import INPUT_COLUMNS, SalaryFeatures, state_path
+from train import file_digest, load_inputs, make_preprocessor, make_regressor
+
+MODELS_DIR = 'models'
+
+
+def load_jobs(path):
+    return load_inputs(path)[0]
+
+
+def load_houses(path):
+    return read_dataset(path)
+
+
+def load_cars(path):
+    return read_dataset(path)
+
+
+def car_preprocessor():
+    return ColumnTransformer([
+        ('cat', OneHotEncoder(handle_unknown='ignore'), ['fuel', 'condition', 'model']),
+        ('num', 'passthrough', ['year', 'km_driven', 'fiscal_power', 'first_owner', 'price'])
+    ])
+
+
+# ===== FEATURE SPECS =====
+# features: fitted on the training rows, turns inputs into what the model
+# takes (None: inputs as they are). preprocessor: first Pipeline step, and
+# steps the Pipeline's step names (no preprocessor: the bare estimator).
+# Each matches the model the API loads.
+MODEL_SPECS = {
+    'salary': {
+        # Same as train.py: SalaryModel.pkl + SalaryModel.features.json
+        'dataset': 'morocco_jobs_dataset.csv',
+        'load': load_jobs,
+        'inputs': INPUT_COLUMNS,
+        'target': 'salary',
+        'task': 'regression',
+        'features': SalaryFeatures,
+        'preprocessor': make_preprocessor,
+        'steps': ('preprocessing', 'regression'),
+        'estimator': make_regressor,
+    },
+    'house': {
+        # Same as house_predictions.pkl: a Ridge on the API's 10 house_row columns
+        'dataset': 'morocco_houses_dataset.csv',
+        'load': load_houses,
+        'inputs': list(DATASET_COLUMNS.values()),
+        'target': 'price',
+        'task': 'regression',
+        'features': HouseFeatures,
+        'preprocessor': None,
+        'estimator': lambda: Ridge(alpha=10),
+    },
+    'car': {
+        # Same layout as the deployed good_deal_model.pkl
+        'dataset': 'morocco_cars_dataset.csv',
+        'load': load_cars,
+        'inputs': ['fuel', 'condition', 'model', 'year', 'km_driven', 'fiscal_power', 'first_owner', 'price'],
+        'target': 'good_deal',
+        'task': 'classification',
+        'features': None,
+        'preprocessor': car_preprocessor,
+        'steps': ('preprocessor', 'classifier'),
+        'estimator': lambda: GradientBoostingClassifier(learning_rate=0.05, n_estimators=200, random_state=42),
+    },
+}
+
+
+def build_features(spec, inputs):
+    """The spec's feature state fitted on inputs, or None"""
+    return spec['features']().fit(inputs) if spec['features'] else None
+
+
+def model_inputs(features, inputs):
+    return features.transform(inputs) if features else inputs
+
+
+def build_pipeline(spec, n_jobs=1, estimator=None):
+    """The spec's preprocessor and estimator (or the given one, e.g. from tune.py)"""
+    estimator = clone(estimator) if estimator is not None else spec['estimator']()
+    if 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=n_jobs)
+    if spec['preprocessor'] is None:
+        return estimator
+    preprocessing, final = spec['steps']
+    return Pipeline([(preprocessing, spec['preprocessor']()), (final, estimator)])
+
+
+def evaluate(task, model, X_test, y_test):
+    y_pred = model.predict(X_test)
+    if task == 'regression':
+        return {
+            'mae': float(mean_absolute_error(y_test, y_pred)),
+            'rmse': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+            'r2': float(r2_score(y_test, y_pred)),
+        }
+    metrics = {
+        'accuracy': float(accuracy_score(y_test, y_pred)),
+        'f1': float(f1_score(y_test, y_pred, average='weighted')),
+    }
+    if len(model.classes_) == 2:
+        metrics['roc_auc'] = float(roc_auc_score(y_test, model.predict_proba(X_test)[:, 1]))
+    return metrics
+
+
+def next_version_dir(name, models_dir=MODELS_DIR):
+    """models/<name>/v<N> for the next unused N"""
+    root = os.path.join(models_dir, name)
+    versions = [int(m.group(1)) for d in (os.listdir(root) if os.path.isdir(root) else [])
+                if (m := re.fullmatch(r'v(\d+)', d))]
+    return os.path.join(root, f'v{max(versions, default=0) + 1}')
+
+
+def train_model(name, cores, models_dir=MODELS_DIR, estimator=None):
+    """Train one model on its share of the cores; runs inside a pool worker"""
+    spec = MODEL_SPECS[name]
+    with threadpool_limits(limits=cores):
+        start = time.perf_counter()
+        df = spec['load'](spec['dataset'])
+        X = df[spec['inputs']]
+        y = df[spec['target']]
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        features = build_features(spec, X_train)
+        model = build_pipeline(spec, n_jobs=cores, estimator=estimator)
+        model.fit(model_inputs(features, X_train), y_train)
+        train_seconds = time.perf_counter() - start
+        metrics = evaluate(spec['task'], model, model_inputs(features, X_test), y_test)
+
+    version_dir = next_version_dir(name, models_dir)
+    os.makedirs(version_dir)
+    model_path = os.path.join(version_dir, 'model.pkl')
+    joblib.dump(model, model_path, compress=3)
+    if hasattr(features, 'save'):
+        features.save(state_path(model_path))
+    final_estimator = model[-1] if isinstance(model, Pipeline) else model
+    report = {
+        'model': name,
+        'version': os.path.basename(version_dir),
+        'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'dataset': spec['dataset'],
+        'dataset_sha256': file_digest(resolve(spec['dataset'])),
+        'rows': len(df),
+        'inputs': spec['inputs'],
+        'target': spec['target'],
+        'estimator': type(final_estimator).__name__,
+        'params': {k: v for k, v in final_estimator.get_params().items() if isinstance(v, (int, float, str, type(None)))},
+        'cores': cores,
+        'train_seconds': round(train_seconds, 2),
+        'metrics': metrics,
+    }
+    with open(os.path.join(version_dir, 'metrics.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def share_cores(names, budget):
+    """Split a core budget over models; returns (workers, cores per model)"""
+    workers = max(1, min(len(names), budget))
+    per_worker, extra = divmod(budget, workers)
+    cores = {}
+    # Models are scheduled in order; the first ones get the leftover cores
+    for i, name in enumerate(names):
+        cores[name] = max(1, per_worker + (1 if i % workers < extra else 0))
+    return workers, cores
+
+
+def train_all(names=None, budget=None, models_dir=MODELS_DIR):
+    """Train the given models (default: all) concurrently; returns their reports"""
+    names = names or list(MODEL_SPECS)
+    runnable = []
+    for name in names:
+        if os.path.exists(resolve(MODEL_SPECS[name]['dataset'])):
+            runnable.append(name)
+        else:
+            print(f"⚠️ Skipping {name}: dataset {MODEL_SPECS[name]['dataset']} not found")
+
+    workers, cores = share_cores(runnable, budget or os.cpu_count() or 1)
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(train_model, name, cores[name], models_dir): name for name in runnable}
+        for future in as_completed(futures):
+            report = future.result()
+            metrics = ', '.join(f'{k}={v:,.4g}' for k, v in report['metrics'].items())
+            print(f"✅ {report['model']} {report['version']} in {report['train_seconds']}s "
+                  f"on {report['cores']} core(s): {metrics}")
+            reports.append(report)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train all models concurrently')
+    parser.add_argument('models', nargs='*', help=f"any of {', '.join(MODEL_SPECS)} (default: all)")
+    parser.add_argument('--cores', type=int, default=None, help='total core budget (default: all cores)')
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    args = parser.parse_args()
+    unknown = set(args.models) - set(MODEL_SPECS)
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(sorted(unknown))}")
+
+    start = time.perf_counter()
+    reports = train_all(args.models, args.cores, args.models_dir)
+    print(f"🏁 Trained {len(reports)} model(s) in {time.perf_counter() - start:.1f}s -> {args.models_dir}/")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Budgeted hyperparameter search for the models of train_all.MODEL_SPECS
+Successive halving: many sampled configurations are scored on a small
+slice of the training rows, the best 1/eta go on to eta times the rows,
+and so on until the last survivors train on all of them. Each round fits
+every (candidate, fold) pair in parallel on all cores. Fold matrices are
+preprocessed once and cached on disk (.tune_cache/), keyed by the
+dataset's hash, so later rounds and later runs skip preprocessing.
+
+Candidates are ranked by one objective that trades accuracy against
+serving cost:
+    error + LATENCY_WEIGHT * latency / latency budget + SIZE_WEIGHT * size / size budget
+error is the MAE relative to predicting the mean (regression) or
+1 - accuracy (classification), latency is the median single-row predict
+time and size the pickled estimator. Candidates over either budget are
+dropped (objective null in the report). The spec's own estimator always competes as the incumbent.
+
+    python tune.py                                  # every model
+    python tune.py salary --latency-budget-ms 5 --candidates 24 --save
+"""
+
+import argparse
+import json
+import math
+import os
+import pickle
+import time
+
+import numpy as np
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor, RandomForestRegressor
+from sklearn.metrics import accuracy_score, mean_absolute_error
+from sklearn.model_selection import KFold, ParameterSampler, StratifiedKFold
+
+from datasets import resolve
+from train import file_digest
+from train_all import MODEL_SPECS, MODELS_DIR, build_features, model_inputs, train_model
+
+TUNE_CACHE_DIR = '.tune_cache'
+
+# Objective weights: how much a full budget of latency / size costs, in error units
+LATENCY_WEIGHT = 0.1
+SIZE_WEIGHT = 0.05
+LATENCY_REPEATS = 25
+
+# ===== SEARCH SPACES =====
+SEARCH_SPACES = {
+    'salary': (GradientBoostingRegressor, {
+        'n_estimators': [50, 100, 200, 300, 400],
+        'max_depth': [3, 5, 7, 9],
+        'min_samples_leaf': [1, 4, 8, 16],
+        'learning_rate': [0.02, 0.05, 0.1, 0.2],
+        'subsample': [0.7, 0.8, 1.0],
+    }),
+    'house': (RandomForestRegressor, {
+        'n_estimators': [25, 50, 100, 200, 400],
+        'max_depth': [None, 8, 12, 16, 24],
+        'min_samples_leaf': [1, 2, 4, 8, 16],
+        'max_features': [1.0, 0.5, 'sqrt'],
+    }),
+    'car': (GradientBoostingClassifier, {
+        'n_estimators': [50, 100, 200, 400],
+        'max_depth': [2, 3, 4, 6],
+        'min_samples_leaf': [1, 5, 10, 20],
+        'learning_rate': [0.02, 0.05, 0.1, 0.2],
+        'subsample': [0.7, 0.85, 1.0],
+    }),
+}
+
+
+def sample_candidates(name, n_candidates, seed=42):
+    """The spec's estimator plus n_candidates - 1 sampled configurations"""
+    estimator_class, space = SEARCH_SPACES[name]
+    candidates = [MODEL_SPECS[name]['estimator']()]
+    for params in ParameterSampler(space, n_candidates - 1, random_state=seed):
+        candidates.append(estimator_class(random_state=42, **params))
+    return candidates
+
+
+# ===== FOLD MATRICES =====
+def fold_matrices(name, dataset_sha256, folds, fold, seed):
+    """
+    (X_train, y_train, X_test, y_test) of one fold, through the spec's
+    features and preprocessor fitted on the training part. Training rows
+    come shuffled, so any prefix is a uniform subsample. dataset_sha256
+    only keys the cache.
+    """
+    spec = MODEL_SPECS[name]
+    df = spec['load'](spec['dataset'])
+    X, y = df[spec['inputs']], df[spec['target']].to_numpy()
+    splitter = (StratifiedKFold if spec['task'] == 'classification' else KFold)(folds, shuffle=True, random_state=seed)
+    train_index, test_index = list(splitter.split(X, y))[fold]
+    train_index = np.random.default_rng(seed + fold).permutation(train_index)
+
+    features = build_features(spec, X.iloc[train_index])
+    X_train, X_test = model_inputs(features, X.iloc[train_index]), model_inputs(features, X.iloc[test_index])
+    if spec['preprocessor'] is not None:
+        preprocessor = spec['preprocessor']()
+        X_train, X_test = preprocessor.fit_transform(X_train), preprocessor.transform(X_test)
+    return X_train, y[train_index], X_test, y[test_index]
+
+
+def load_folds(name, folds, seed, cache_dir=TUNE_CACHE_DIR):
+    spec = MODEL_SPECS[name]
+    cached = Memory(cache_dir, verbose=0).cache(fold_matrices)
+    digest = file_digest(resolve(spec['dataset']))
+    return [cached(name, digest, folds, fold, seed) for fold in range(folds)]
+
+
+# ===== EVALUATION =====
+def relative_error(task, y_train, y_test, y_pred):
+    if task == 'classification':
+        return 1.0 - accuracy_score(y_test, y_pred)
+    baseline = mean_absolute_error(y_test, np.full(len(y_test), y_train.mean()))
+    return mean_absolute_error(y_test, y_pred) / baseline
+
+
+def fit_fold(task, estimator, X_train, y_train, X_test, y_test, rows, keep_model):
+    """Fit on the first rows of the fold; returns (error, model or None)"""
+    model = clone(estimator).fit(X_train[:rows], y_train[:rows])
+    error = relative_error(task, y_train[:rows], y_test, model.predict(X_test))
+    return error, (model if keep_model else None)
+
+
+def serving_cost(model, X_row, repeats=LATENCY_REPEATS):
+    """(median single-row predict ms, pickled size MB)"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(X_row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000, len(pickle.dumps(model)) / 1024 ** 2
+
+
+def objective(error, latency_ms, size_mb, latency_budget_ms, size_budget_mb):
+    """The candidate's score, or None when it is over either budget (infeasible)"""
+    if latency_ms > latency_budget_ms or size_mb > size_budget_mb:
+        return None
+    return error + LATENCY_WEIGHT * latency_ms / latency_budget_ms + SIZE_WEIGHT * size_mb / size_budget_mb
+
+
+def describe(estimator):
+    """Non-default parameters, for the leaderboard"""
+    defaults = type(estimator)().get_params()
+    params = {k: v for k, v in estimator.get_params().items() if v != defaults[k] and k != 'random_state'}
+    return f"{type(estimator).__name__}({', '.join(f'{k}={v}' for k, v in params.items())})"
+
+
+# ===== SUCCESSIVE HALVING =====
+def successive_halving(name, candidates, fold_data, eta=3, min_rows=500,
+                       latency_budget_ms=10.0, size_budget_mb=50.0, n_jobs=-1):
+    """
+    Rounds of (rows, scored candidates); the last round's best candidate
+    wins. A round fits every surviving candidate on every fold in one
+    parallel batch, then measures serving cost on the fold-0 model.
+    """
+    task = MODEL_SPECS[name]['task']
+    full_rows = min(len(y_train) for _, y_train, _, _ in fold_data)
+    n_rounds = max(1, math.ceil(math.log(len(candidates), eta)) + 1)
+    survivors = list(range(len(candidates)))
+    rounds = []
+
+    for round_index in range(n_rounds):
+        rows = full_rows if round_index == n_rounds - 1 else \
+            max(min_rows, int(full_rows / eta ** (n_rounds - 1 - round_index)))
+        rows = min(rows, full_rows)
+        start = time.perf_counter()
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(fit_fold)(task, candidates[c], *fold_data[f], rows, f == 0)
+            for c in survivors for f in range(len(fold_data)))
+
+        scored = []
+        for i, c in enumerate(survivors):
+            fold_results = results[i * len(fold_data):(i + 1) * len(fold_data)]
+            error = float(np.mean([e for e, _ in fold_results]))
+            latency_ms, size_mb = serving_cost(fold_results[0][1], fold_data[0][2][:1])
+            scored.append({
+                'candidate': c,
+                'estimator': describe(candidates[c]),
+                'error': error,
+                'latency_ms': latency_ms,
+                'size_mb': size_mb,
+                'objective': objective(error, latency_ms, size_mb, latency_budget_ms, size_budget_mb),
+            })
+        # Infeasible candidates last
+        scored.sort(key=lambda s: (s['objective'] is None, s['objective'] or 0.0, s['error']))
+        rounds.append({'rows': rows, 'seconds': round(time.perf_counter() - start, 2), 'scored': scored})
+        print(f"   round {round_index + 1}/{n_rounds}: {len(survivors)} candidates x {len(fold_data)} folds "
+              f"on {rows:,} rows in {rounds[-1]['seconds']}s")
+
+        if round_index < n_rounds - 1:
+            feasible = [s['candidate'] for s in scored if s['objective'] is not None]
+            survivors = feasible[:max(1, math.ceil(len(survivors) / eta))]
+            if not survivors:
+                break
+    return rounds
+
+
+def tune(name, n_candidates=27, folds=3, eta=3, min_rows=500, latency_budget_ms=10.0,
+         size_budget_mb=50.0, seed=42, cache_dir=TUNE_CACHE_DIR, n_jobs=-1):
+    """Search one model; returns (best estimator or None, report)"""
+    start = time.perf_counter()
+    fold_data = load_folds(name, folds, seed, cache_dir)
+    print(f"🔎 Tuning {name}: {n_candidates} candidates, {folds} folds "
+          f"(fold matrices ready in {time.perf_counter() - start:.2f}s)")
+
+    candidates = sample_candidates(name, n_candidates, seed)
+    rounds = successive_halving(name, candidates, fold_data, eta, min_rows, latency_budget_ms, size_budget_mb, n_jobs)
+    final = [s for s in rounds[-1]['scored'] if s['objective'] is not None]
+    report = {
+        'model': name,
+        'budgets': {'latency_ms': latency_budget_ms, 'size_mb': size_budget_mb},
+        'weights': {'latency': LATENCY_WEIGHT, 'size': SIZE_WEIGHT},
+        'folds': folds,
+        'eta': eta,
+        'seconds': round(time.perf_counter() - start, 2),
+        'rounds': rounds,
+        'best': final[0] if final else None,
+    }
+    return (candidates[final[0]['candidate']] if final else None), report
+
+
+def print_leaderboard(report, top=5):
+    scored = report['rounds'][-1]['scored']
+    print(f"   {'objective':>9} {'error':>7} {'latency':>9} {'size':>9}  estimator")
+    for s in scored[:top]:
+        score = f"{s['objective']:>9.4f}" if s['objective'] is not None else f"{'over':>9}"
+        print(f"   {score} {s['error']:>7.4f} {s['latency_ms']:>7.2f}ms {s['size_mb']:>7.2f}MB  {s['estimator']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Successive-halving hyperparameter search under a serving budget')
+    parser.add_argument('models', nargs='*', help=f"any of {', '.join(MODEL_SPECS)} (default: all)")
+    parser.add_argument('--candidates', type=int, default=27)
+    parser.add_argument('--folds', type=int, default=3)
+    parser.add_argument('--eta', type=int, default=3, help='keep 1/eta of the candidates per round')
+    parser.add_argument('--min-rows', type=int, default=500, help='training rows in the first round')
+    parser.add_argument('--latency-budget-ms', type=float, default=10.0, help='single-row predict budget')
+    parser.add_argument('--size-budget-mb', type=float, default=50.0, help='pickled estimator budget')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--jobs', type=int, default=-1, help='parallel fold fits (default: all cores)')
+    parser.add_argument('--cache-dir', default=TUNE_CACHE_DIR)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--save', action='store_true', help='train the winner on the full split into models/<name>/v<N>')
+    args = parser.parse_args()
+    unknown = set(args.models) - set(MODEL_SPECS)
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(sorted(unknown))}")
+    if args.eta < 2:
+        parser.error('--eta must be at least 2')
+
+    for name in args.models or list(MODEL_SPECS):
+        if not os.path.exists(resolve(MODEL_SPECS[name]['dataset'])):
+            print(f"⚠️ Skipping {name}: dataset {MODEL_SPECS[name]['dataset']} not found")
+            continue
+        best, report = tune(name, args.candidates, args.folds, args.eta, args.min_rows, args.latency_budget_ms,
+                            args.size_budget_mb, args.seed, args.cache_dir, args.jobs)
+        print_leaderboard(report)
+        if best is None:
+            print(f"❌ No {name} candidate fits the budget ({args.latency_budget_ms}ms, {args.size_budget_mb}MB)")
+            continue
+        print(f"🏆 {name}: {report['best']['estimator']} in {report['seconds']}s")
+
+        os.makedirs(os.path.join(args.models_dir, name), exist_ok=True)
+        output = os.path.join(args.models_dir, name, 'tuning.json')
+        if args.save:
+            saved = train_model(name, os.cpu_count() or 1, args.models_dir, estimator=best)
+            output = os.path.join(args.models_dir, name, saved['version'], 'tuning.json')
+            print(f"💾 Trained {name} {saved['version']}: "
+                  + ', '.join(f'{k}={v:,.4g}' for k, v in saved['metrics'].items()))
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2, allow_nan=False)
+        print(f"📄 Search report: {output}")
+
+
+if __name__ == '__main__':
+    main()